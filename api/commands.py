@@ -1,7 +1,7 @@
 """API endpoint for slash-command style interactions."""
 
 import logging
-from fastapi import APIRouter, BackgroundTasks, HTTPException
+from fastapi import APIRouter, HTTPException
 
 from models.schemas import CommandRequest, RunRequest
 from api.runs import start_run
@@ -11,7 +11,7 @@ router = APIRouter(prefix="/v1/scout/commands", tags=["commands"])
 
 
 @router.post("")
-async def handle_command(request: CommandRequest, background_tasks: BackgroundTasks):
+async def handle_command(request: CommandRequest):
     """
     Handle slash-style commands.
     Supported: 
@@ -36,7 +36,7 @@ async def handle_command(request: CommandRequest, background_tasks: BackgroundTa
             notify_discord=True
         )
         # Reuse start_run logic
-        return await start_run(run_req, background_tasks)
+        return await start_run(run_req)
     
     # Placeholder for trends and analyze commands
     elif cmd == "trends":
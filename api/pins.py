@@ -3,7 +3,7 @@
 import logging
 from fastapi import APIRouter, HTTPException
 
-from db.queries import insert_pin, delete_pin, get_pins
+from db.async_queries import insert_pin, delete_pin, get_pins
 from models.schemas import PinRequest, PinResponse
 
 logger = logging.getLogger(__name__)
@@ -14,7 +14,7 @@ router = APIRouter(prefix="/v1/scout/pins", tags=["pins"])
 async def add_pin(request: PinRequest):
     """Pin an entity with a note."""
     try:
-        pin_id = insert_pin(request.entity_id, request.note, request.pinned_by)
+        pin_id = await insert_pin(request.entity_id, request.note, request.pinned_by)
         return PinResponse(id=pin_id, entity_id=request.entity_id)
     except Exception as e:
         logger.exception("Failed to add pin.")
@@ -25,7 +25,7 @@ async def add_pin(request: PinRequest):
 async def list_pins():
     """List all pinned entities."""
     try:
-        return get_pins()
+        return await get_pins()
     except Exception as e:
         logger.exception("Failed to list pins.")
         raise HTTPException(status_code=500, detail=str(e))
@@ -35,7 +35,7 @@ async def list_pins():
 async def remove_pin(entity_id: str):
     """Remove a pin for an entity."""
     try:
-        delete_pin(entity_id)
+        await delete_pin(entity_id)
         return {"status": "ok"}
     except Exception as e:
         logger.exception("Failed to remove pin.")
@@ -1,46 +1,151 @@
 """API endpoints for managing Scout Runs."""
 
+import asyncio
+import json
 import logging
-from fastapi import APIRouter, BackgroundTasks, HTTPException
+from typing import Any, AsyncIterator
 
-from db.queries import insert_run, update_run_status # Note: insert_run/update_run_status already exist
+from fastapi import APIRouter, HTTPException
+from fastapi.responses import StreamingResponse
+
+from config import get_settings
+from db.async_queries import enqueue_run, get_run, requeue_run
 from models.schemas import RunRequest, RunResponse, RunStatusResponse
-from worker.orchestrator import run_scout
-from db.client import get_supabase_client # To fetch status
+from worker.events import BUS
 
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/v1/scout/runs", tags=["runs"])
 
+TERMINAL_STATUSES = {"success", "failed"}
+# Comment line sent to idle event streams so proxies keep them open.
+KEEPALIVE_SECONDS = 15
+
+
+def _sse(event: str, data: dict[str, Any]) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False, default=str)}\n\n"
+
+
+def _snapshot(row: dict[str, Any]) -> dict[str, Any]:
+    return {"status": row["status"], **(row.get("progress") or {})}
+
+
+class RunPollers:
+    """One ``scout_runs`` poller per streamed run, shared by its SSE clients.
+
+    Runs executed by a queue worker publish on that process's bus, so their
+    progress reaches this process only through ``scout_runs.progress``. While
+    at least one client streams a run, a single task reads the row every poll
+    interval and publishes changes on the local ``BUS``: N viewers cost one
+    read per interval instead of N.
+    """
+
+    def __init__(self) -> None:
+        self._viewers: dict[str, int] = {}
+        self._tasks: dict[str, asyncio.Task] = {}
+
+    def acquire(self, run_id: str, row: dict[str, Any], poll_interval: float) -> None:
+        self._viewers[run_id] = self._viewers.get(run_id, 0) + 1
+        if run_id not in self._tasks:
+            self._tasks[run_id] = asyncio.create_task(self._poll(run_id, row.get("progress"), poll_interval))
+
+    def release(self, run_id: str) -> None:
+        self._viewers[run_id] -= 1
+        if not self._viewers[run_id]:
+            del self._viewers[run_id]
+            task = self._tasks.pop(run_id, None)
+            if task:
+                task.cancel()
+
+    async def _poll(self, run_id: str, last_progress: Any, poll_interval: float) -> None:
+        while True:
+            await asyncio.sleep(poll_interval)
+            try:
+                row = await get_run(run_id)
+            except Exception:
+                logger.warning("Failed to poll run_id=%s for the event stream.", run_id)
+                continue
+            if row is None:
+                continue
+            if row["status"] in TERMINAL_STATUSES:
+                BUS.publish(run_id, "summary", {"status": row["status"], "summary": row.get("summary")})
+                return
+            if row.get("progress") != last_progress:
+                last_progress = row.get("progress")
+                BUS.publish(run_id, "snapshot", _snapshot(row))
+
+
+POLLERS = RunPollers()
+
+
+async def _run_events(
+    run_id: str, row: dict[str, Any], queue: asyncio.Queue, poll_interval: float
+) -> AsyncIterator[str]:
+    """Stream bus events for the run until its summary, with keep-alives when quiet.
+
+    Progress of runs executed elsewhere arrives on the bus from the run's
+    shared poller (``POLLERS``).
+    """
+    try:
+        yield _sse("snapshot", _snapshot(row))
+        if row["status"] in TERMINAL_STATUSES:
+            yield _sse("summary", {"status": row["status"], "summary": row.get("summary")})
+            return
+
+        POLLERS.acquire(run_id, row, poll_interval)
+        try:
+            while True:
+                try:
+                    event, data = await asyncio.wait_for(queue.get(), KEEPALIVE_SECONDS)
+                except asyncio.TimeoutError:
+                    yield ": keep-alive\n\n"
+                    continue
+                yield _sse(event, data)
+                if event == "summary":
+                    return
+        finally:
+            POLLERS.release(run_id)
+    finally:
+        BUS.unsubscribe(run_id, queue)
+
 
 @router.post("", response_model=RunResponse)
-async def start_run(request: RunRequest, background_tasks: BackgroundTasks):
-    """Start a new scout run asynchronously."""
+async def start_run(request: RunRequest):
+    """Queue a new scout run; a queue worker (python -m worker.queue_worker) executes it."""
     try:
-        run_id = insert_run(request.run_type, request.config)
-        background_tasks.add_task(
-            run_scout, 
-            run_id=run_id, 
-            config=request.config, 
-            notify_discord=request.notify_discord,
+        run_id = await enqueue_run(
+            request.run_type,
+            request.config,
             analysis_mode=request.analysis_mode,
+            notify_discord=request.notify_discord,
         )
-        return RunResponse(run_id=run_id, status="running")
+        return RunResponse(run_id=run_id, status="queued")
     except Exception as e:
         logger.exception("Failed to start scout run.")
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.post("/{run_id}/resume", response_model=RunResponse)
+async def resume_run(run_id: str):
+    """Queue a failed run again; it continues after its last completed stage."""
+    try:
+        if not await requeue_run(run_id):
+            raise HTTPException(status_code=409, detail="Only failed runs can be resumed")
+        return RunResponse(run_id=run_id, status="queued")
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.exception("Failed to resume scout run.")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
 @router.get("/{run_id}", response_model=RunStatusResponse)
 async def get_run_status(run_id: str):
     """Get the status and summary of a scout run."""
     try:
-        sb = get_supabase_client()
-        response = sb.table("scout_runs").select("*").eq("id", run_id).execute()
-        
-        if not response.data:
+        row = await get_run(run_id)
+        if row is None:
             raise HTTPException(status_code=404, detail="Run not found")
-        
-        row = response.data[0]
+
         return RunStatusResponse(
             run_id=str(row["id"]),
             status=row["status"],
@@ -53,3 +158,25 @@ async def get_run_status(run_id: str):
     except Exception as e:
         logger.exception("Failed to fetch run status.")
         raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get("/{run_id}/events")
+async def stream_run_events(run_id: str):
+    """Server-sent events: snapshot, stage, progress and the final summary of a run."""
+    # Subscribe before reading the row so no event between the two is missed.
+    queue = BUS.subscribe(run_id)
+    try:
+        row = await get_run(run_id)
+    except Exception as e:
+        BUS.unsubscribe(run_id, queue)
+        logger.exception("Failed to fetch run for event stream.")
+        raise HTTPException(status_code=500, detail=str(e))
+    if row is None:
+        BUS.unsubscribe(run_id, queue)
+        raise HTTPException(status_code=404, detail="Run not found")
+
+    return StreamingResponse(
+        _run_events(run_id, row, queue, get_settings().run_events_poll_seconds),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -14,6 +14,7 @@ class Settings(BaseSettings):
 
     openai_api_key: str = Field(..., alias="OPENAI_API_KEY")
     openai_model: str = Field("gpt-4o-mini", alias="OPENAI_MODEL")
+    openai_base_url: str | None = Field(None, alias="OPENAI_BASE_URL")
 
     youtube_api_key: str = Field(..., alias="YOUTUBE_API_KEY")
     discord_webhook_url: str = Field(..., alias="DISCORD_WEBHOOK_URL")
@@ -25,13 +26,44 @@ class Settings(BaseSettings):
 
     # Phase 9: OpenAI Analysis Optimization
     analysis_mode: str = Field("aggregated", alias="ANALYSIS_MODE")
+    prompt_token_budget: int = Field(3000, alias="PROMPT_TOKEN_BUDGET")
     min_subscribers: int = Field(500, alias="MIN_SUBSCRIBERS")
     min_upload_freq_days: int = Field(30, alias="MIN_UPLOAD_FREQ_DAYS")
     re_analyze_days: int = Field(14, alias="RE_ANALYZE_DAYS")
+    batch_poll_interval_seconds: int = Field(60, alias="BATCH_POLL_INTERVAL_SECONDS")
+    llm_cache_enabled: bool = Field(True, alias="LLM_CACHE_ENABLED")
+    llm_cache_ttl_hours: int = Field(336, alias="LLM_CACHE_TTL_HOURS")
+    llm_cache_max_entries: int = Field(50000, alias="LLM_CACHE_MAX_ENTRIES")
 
     # Phase 10: Web Search Integration
     discovery_enabled: bool = Field(False, alias="DISCOVERY_ENABLED")
     openai_search_model: str = Field("gpt-4o-search-preview", alias="OPENAI_SEARCH_MODEL")
+    discovery_concurrency: int = Field(4, alias="DISCOVERY_CONCURRENCY")
+    discovery_keywords_per_request: int = Field(1, alias="DISCOVERY_KEYWORDS_PER_REQUEST")
+    discovery_cache_enabled: bool = Field(True, alias="DISCOVERY_CACHE_ENABLED")
+
+    # Collector performance
+    collector_mode: str = Field("sync", alias="COLLECTOR_MODE")
+    collector_concurrency: int = Field(8, alias="COLLECTOR_CONCURRENCY")
+
+    # YouTube Data API quota
+    youtube_daily_quota: int = Field(10000, alias="YOUTUBE_DAILY_QUOTA")
+    youtube_quota_tracked_reserve: int = Field(500, alias="YOUTUBE_QUOTA_TRACKED_RESERVE")
+    search_cache_enabled: bool = Field(True, alias="SEARCH_CACHE_ENABLED")
+    search_cache_ttl_hours: int = Field(24, alias="SEARCH_CACHE_TTL_HOURS")
+    etag_refresh_enabled: bool = Field(True, alias="ETAG_REFRESH_ENABLED")
+
+    # Recent-video stage (uploads playlist + batched videos.list)
+    video_stage_enabled: bool = Field(True, alias="VIDEO_STAGE_ENABLED")
+    recent_videos_per_channel: int = Field(10, alias="RECENT_VIDEOS_PER_CHANNEL")
+
+    # Run queue workers (python -m worker.queue_worker)
+    queue_poll_interval_seconds: float = Field(5, alias="QUEUE_POLL_INTERVAL_SECONDS")
+    queue_heartbeat_seconds: float = Field(30, alias="QUEUE_HEARTBEAT_SECONDS")
+    queue_stale_seconds: int = Field(300, alias="QUEUE_STALE_SECONDS")
+    queue_max_attempts: int = Field(3, alias="QUEUE_MAX_ATTEMPTS")
+    queue_metrics_port: int = Field(9464, alias="QUEUE_METRICS_PORT")
+    run_events_poll_seconds: float = Field(1, alias="RUN_EVENTS_POLL_SECONDS")
 
     model_config = SettingsConfigDict(env_file=".env", extra="ignore", populate_by_name=True)
 
@@ -0,0 +1,136 @@
+"""Async database queries for the API routers.
+
+Mirrors the functions of ``db.queries`` that the API uses, on the async
+Supabase client, so a slow PostgREST response does not block the event loop.
+Workers keep using the synchronous ``db.queries``.
+"""
+
+from __future__ import annotations
+
+import logging
+from typing import Any
+
+from db.client import get_async_supabase_client
+from db.queries import ALLOWED_RUN_TYPE
+
+logger = logging.getLogger(__name__)
+
+
+async def enqueue_run(
+    run_type: str, config: dict[str, Any], analysis_mode: str, notify_discord: bool
+) -> str:
+    """Insert a queued run for the queue workers and return run_id."""
+
+    try:
+        if run_type not in ALLOWED_RUN_TYPE:
+            raise ValueError(f"Invalid run_type: {run_type}")
+
+        sb = await get_async_supabase_client()
+        response = await (
+            sb.table("scout_runs")
+            .insert({
+                "run_type": run_type,
+                "status": "queued",
+                "config": config,
+                "analysis_mode": analysis_mode,
+                "notify_discord": notify_discord,
+            })
+            .execute()
+        )
+
+        data = response.data or []
+        if not data or "id" not in data[0]:
+            raise ValueError("Insert run response does not include run id.")
+
+        return str(data[0]["id"])
+    except Exception:
+        logger.exception("Failed to enqueue run. run_type=%s", run_type)
+        raise
+
+
+async def requeue_run(run_id: str) -> bool:
+    """Queue a failed run again for resuming; False if it is missing or not failed."""
+
+    try:
+        sb = await get_async_supabase_client()
+        response = await (
+            sb.table("scout_runs")
+            .update({"status": "queued", "attempts": 0, "worker_id": None, "heartbeat_at": None})
+            .eq("id", run_id)
+            .eq("status", "failed")
+            .execute()
+        )
+        return bool(response.data)
+    except Exception:
+        logger.exception("Failed to requeue run. run_id=%s", run_id)
+        raise
+
+
+async def get_run(run_id: str) -> dict[str, Any] | None:
+    """Fetch a run row, or None if it does not exist."""
+
+    try:
+        sb = await get_async_supabase_client()
+        response = await sb.table("scout_runs").select("*").eq("id", run_id).execute()
+        rows = response.data or []
+        return rows[0] if rows else None
+    except Exception:
+        logger.exception("Failed to fetch run. run_id=%s", run_id)
+        raise
+
+
+async def insert_pin(entity_id: str, note: str | None = None, pinned_by: str | None = None) -> str:
+    """Insert or update a pin for an entity."""
+
+    try:
+        sb = await get_async_supabase_client()
+        payload = {"entity_id": entity_id, "note": note, "pinned_by": pinned_by}
+        response = await sb.table("scout_pins").upsert(payload, on_conflict="entity_id").execute()
+        data = response.data or []
+        if not data or "id" not in data[0]:
+            raise ValueError("Insert pin response does not include pin id.")
+
+        return str(data[0]["id"])
+    except Exception:
+        logger.exception("Failed to insert pin. entity_id=%s", entity_id)
+        raise
+
+
+async def delete_pin(entity_id: str) -> None:
+    """Delete a pin for an entity."""
+
+    try:
+        sb = await get_async_supabase_client()
+        await sb.table("scout_pins").delete().eq("entity_id", entity_id).execute()
+    except Exception:
+        logger.exception("Failed to delete pin. entity_id=%s", entity_id)
+        raise
+
+
+async def get_pins() -> list[dict[str, Any]]:
+    """Fetch all pins with joined entity data."""
+
+    try:
+        sb = await get_async_supabase_client()
+        response = await (
+            sb.table("scout_pins")
+            .select("id, entity_id, note, pinned_by, scout_entities(channel_title)")
+            .execute()
+        )
+        rows = response.data or []
+        results = []
+        for row in rows:
+            entity = row.get("scout_entities") or {}
+            results.append(
+                {
+                    "pin_id": str(row["id"]),
+                    "entity_id": str(row["entity_id"]),
+                    "display_name": entity.get("channel_title") or "Unknown",
+                    "note": row.get("note"),
+                    "pinned_by": row.get("pinned_by"),
+                }
+            )
+        return results
+    except Exception:
+        logger.exception("Failed to fetch pins.")
+        raise
@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import asyncio
 import logging
 from typing import Any
 
@@ -10,6 +11,10 @@ from config import get_settings
 logger = logging.getLogger(__name__)
 
 _client: Any | None = None
+_async_client: Any | None = None
+# Concurrent first requests must not each create a client. Created on first
+# use so it is never bound outside the API event loop.
+_async_client_lock: asyncio.Lock | None = None
 
 
 def get_supabase_client() -> Any:
@@ -29,3 +34,28 @@ def get_supabase_client() -> Any:
     except Exception:
         logger.exception("Failed to initialize Supabase client.")
         raise
+
+
+async def get_async_supabase_client() -> Any:
+    """Return singleton async Supabase client for the API event loop."""
+
+    global _async_client, _async_client_lock
+
+    if _async_client is not None:
+        return _async_client
+
+    if _async_client_lock is None:
+        _async_client_lock = asyncio.Lock()
+    async with _async_client_lock:
+        if _async_client is not None:
+            return _async_client
+
+        try:
+            from supabase import acreate_client
+
+            settings = get_settings()
+            _async_client = await acreate_client(settings.supabase_url, settings.supabase_key)
+            return _async_client
+        except Exception:
+            logger.exception("Failed to initialize async Supabase client.")
+            raise
@@ -3,15 +3,19 @@
 from __future__ import annotations
 
 import logging
+from datetime import datetime, timezone
 from typing import Any
 
 from db.client import get_supabase_client
 
 logger = logging.getLogger(__name__)
 
-ALLOWED_RUN_STATUS = {"running", "success", "failed"}
+ALLOWED_RUN_STATUS = {"queued", "running", "success", "failed"}
 ALLOWED_RUN_TYPE = {"manual", "scheduled"}
 
+# Max rows per multi-row PostgREST request.
+BULK_CHUNK_SIZE = 500
+
 
 def insert_run(run_type: str, config: dict[str, Any]) -> str:
     """Insert a run row and return run_id (UUID string)."""
@@ -37,8 +41,14 @@ def insert_run(run_type: str, config: dict[str, Any]) -> str:
         raise
 
 
-def update_run_status(run_id: str, status: str, summary: dict[str, Any] | None = None) -> None:
-    """Update run status and optional summary."""
+def update_run_status(
+    run_id: str, status: str, summary: dict[str, Any] | None = None, worker_id: str | None = None
+) -> bool:
+    """Update run status and optional summary.
+
+    With ``worker_id``, only a running run still held by that worker is
+    updated; returns False when the run was reclaimed by another worker.
+    """
 
     try:
         if status not in ALLOWED_RUN_STATUS:
@@ -49,12 +59,133 @@ def update_run_status(run_id: str, status: str, summary: dict[str, Any] | None =
             payload["summary"] = summary
 
         sb = get_supabase_client()
-        sb.table("scout_runs").update(payload).eq("id", run_id).execute()
+        query = sb.table("scout_runs").update(payload).eq("id", run_id)
+        if worker_id is not None:
+            query = query.eq("worker_id", worker_id).eq("status", "running")
+        response = query.execute()
+        return worker_id is None or bool(response.data)
     except Exception:
         logger.exception("Failed to update run status. run_id=%s status=%s", run_id, status)
         raise
 
 
+def update_run_progress(run_id: str, progress: dict[str, Any]) -> None:
+    """Store the latest progress snapshot of a run."""
+
+    try:
+        sb = get_supabase_client()
+        sb.table("scout_runs").update({"progress": progress}).eq("id", run_id).execute()
+    except Exception:
+        logger.exception("Failed to update run progress. run_id=%s", run_id)
+        raise
+
+
+def claim_run(worker_id: str, stale_seconds: int, max_attempts: int) -> dict[str, Any] | None:
+    """Claim the next queued (or stale running) run for this worker, if any."""
+
+    try:
+        sb = get_supabase_client()
+        response = sb.rpc(
+            "claim_scout_run",
+            {"p_worker_id": worker_id, "p_stale_seconds": stale_seconds, "p_max_attempts": max_attempts},
+        ).execute()
+        rows = response.data or []
+        return rows[0] if rows else None
+    except Exception:
+        logger.exception("Failed to claim run. worker_id=%s", worker_id)
+        raise
+
+
+def heartbeat_run(run_id: str, worker_id: str) -> bool:
+    """Refresh the run's heartbeat; False when another worker has reclaimed it."""
+
+    try:
+        sb = get_supabase_client()
+        response = sb.rpc("heartbeat_scout_run", {"p_run_id": run_id, "p_worker_id": worker_id}).execute()
+        return bool(response.data)
+    except Exception:
+        logger.exception("Failed to send run heartbeat. run_id=%s", run_id)
+        raise
+
+
+def get_run_checkpoints(run_id: str) -> dict[str, dict[str, Any]]:
+    """Return completed stage outputs of a run keyed by stage."""
+
+    try:
+        sb = get_supabase_client()
+        response = (
+            sb.table("scout_run_checkpoints")
+            .select("stage, output")
+            .eq("run_id", run_id)
+            .execute()
+        )
+        return {row["stage"]: row.get("output") or {} for row in response.data or []}
+    except Exception:
+        logger.exception("Failed to fetch run checkpoints. run_id=%s", run_id)
+        raise
+
+
+def upsert_run_checkpoint(run_id: str, stage: str, output: dict[str, Any]) -> None:
+    """Record a completed stage and its output."""
+
+    try:
+        sb = get_supabase_client()
+        sb.table("scout_run_checkpoints").upsert(
+            {
+                "run_id": run_id,
+                "stage": stage,
+                "output": output,
+                "completed_at": datetime.now(timezone.utc).isoformat(),
+            },
+            on_conflict="run_id,stage",
+        ).execute()
+    except Exception:
+        logger.exception("Failed to save run checkpoint. run_id=%s stage=%s", run_id, stage)
+        raise
+
+
+def delete_run_snapshots(run_id: str) -> None:
+    """Delete snapshots written by an interrupted collection of a run."""
+
+    try:
+        sb = get_supabase_client()
+        sb.table("scout_snapshots").delete().eq("run_id", run_id).execute()
+    except Exception:
+        logger.exception("Failed to delete run snapshots. run_id=%s", run_id)
+        raise
+
+
+def _entity_payload(
+    platform: str,
+    platform_id: str,
+    channel_title: str | None = None,
+    channel_description: str | None = None,
+    country: str | None = None,
+    language: str | None = None,
+    published_at: str | None = None,
+    etag: str | None = None,
+) -> dict[str, Any]:
+    """Build an entity upsert payload, omitting empty fields so they are not overwritten."""
+
+    payload = {
+        "platform": platform,
+        "platform_id": platform_id,
+    }
+    if channel_title:
+        payload["channel_title"] = channel_title
+    if channel_description:
+        payload["channel_description"] = channel_description
+    if country:
+        payload["country"] = country
+    if language:
+        payload["language"] = language
+    if published_at:
+        payload["published_at"] = published_at
+    if etag:
+        payload["etag"] = etag
+    return payload
+
+
 def upsert_entity(
     platform: str,
     platform_id: str,
@@ -63,25 +194,22 @@ def upsert_entity(
     country: str | None = None,
     language: str | None = None,
     published_at: str | None = None,
+    etag: str | None = None,
 ) -> str:
     """Upsert entity (creator) and return its UUID."""
 
     try:
         sb = get_supabase_client()
-        payload = {
-            "platform": platform,
-            "platform_id": platform_id,
-        }
-        if channel_title:
-            payload["channel_title"] = channel_title
-        if channel_description:
-            payload["channel_description"] = channel_description
-        if country:
-            payload["country"] = country
-        if language:
-            payload["language"] = language
-        if published_at:
-            payload["published_at"] = published_at
+        payload = _entity_payload(
+            platform,
+            platform_id,
+            channel_title=channel_title,
+            channel_description=channel_description,
+            country=country,
+            language=language,
+            published_at=published_at,
+            etag=etag,
+        )
 
         # Use ON CONFLICT (platform, platform_id) DO UPDATE implicitly via upsert
         response = sb.table("scout_entities").upsert(
@@ -98,12 +226,53 @@ def upsert_entity(
         raise
 
 
+def upsert_entities_bulk(platform: str, entities: list[dict[str, Any]]) -> dict[str, str]:
+    """Upsert many entities in multi-row requests and return platform_id -> UUID.
+
+    Each item takes the keyword arguments of ``upsert_entity`` (minus ``platform``).
+    Rows are grouped by their set of non-empty columns so that a multi-row upsert
+    never overwrites stored values with nulls, then sent in chunks of
+    ``BULK_CHUNK_SIZE``.
+    """
+
+    if not entities:
+        return {}
+
+    try:
+        # Postgres rejects an upsert that touches the same row twice; last row wins.
+        payloads: dict[str, dict[str, Any]] = {}
+        for entity in entities:
+            payload = _entity_payload(platform, **entity)
+            payloads[payload["platform_id"]] = payload
+
+        groups: dict[frozenset[str], list[dict[str, Any]]] = {}
+        for payload in payloads.values():
+            groups.setdefault(frozenset(payload), []).append(payload)
+
+        sb = get_supabase_client()
+        entity_ids: dict[str, str] = {}
+        for rows in groups.values():
+            for i in range(0, len(rows), BULK_CHUNK_SIZE):
+                response = sb.table("scout_entities").upsert(
+                    rows[i:i + BULK_CHUNK_SIZE], on_conflict="platform,platform_id"
+                ).execute()
+                for row in response.data or []:
+                    entity_ids[str(row["platform_id"])] = str(row["id"])
+
+        return entity_ids
+    except Exception:
+        logger.exception("Failed to bulk upsert entities. platform=%s count=%d", platform, len(entities))
+        raise
+
+
 def insert_snapshot(
     run_id: str,
     entity_id: str,
     subscriber_count: int | None = None,
     view_count: int | None = None,
     video_count: int | None = None,
+    upload_freq_days: float | None = None,
+    recent_videos_json: list[dict[str, Any]] | None = None,
 ) -> str:
     """Insert a snapshot for an entity."""
 
@@ -115,6 +284,8 @@ def insert_snapshot(
             "subscriber_count": subscriber_count,
             "view_count": view_count,
             "video_count": video_count,
+            "upload_freq_days": upload_freq_days,
+            "recent_videos_json": recent_videos_json or [],
         }
         response = sb.table("scout_snapshots").insert(payload).execute()
 
@@ -128,6 +299,31 @@ def insert_snapshot(
         raise
 
 
+def insert_snapshots_bulk(run_id: str, snapshots: list[dict[str, Any]]) -> dict[str, str]:
+    """Insert many snapshots for a run and return entity_id -> snapshot id.
+
+    Each item takes the keyword arguments of ``insert_snapshot`` (minus ``run_id``).
+    """
+
+    if not snapshots:
+        return {}
+
+    try:
+        rows = [{"run_id": run_id, **snapshot} for snapshot in snapshots]
+
+        sb = get_supabase_client()
+        snapshot_ids: dict[str, str] = {}
+        for i in range(0, len(rows), BULK_CHUNK_SIZE):
+            response = sb.table("scout_snapshots").insert(rows[i:i + BULK_CHUNK_SIZE]).execute()
+            for row in response.data or []:
+                snapshot_ids[str(row["entity_id"])] = str(row["id"])
+
+        return snapshot_ids
+    except Exception:
+        logger.exception("Failed to bulk insert snapshots. run_id=%s count=%d", run_id, len(snapshots))
+        raise
+
+
 def get_snapshots_by_run(run_id: str) -> list[dict[str, Any]]:
     """Fetch snapshots and joined entity data for a run."""
 
@@ -136,7 +332,7 @@ def get_snapshots_by_run(run_id: str) -> list[dict[str, Any]]:
         response = (
             sb.table("scout_snapshots")
             .select(
-                "entity_id, subscriber_count, view_count, "
+                "entity_id, subscriber_count, view_count, upload_freq_days, recent_videos_json, "
                 "scout_entities!inner(channel_title)"
             )
             .eq("run_id", run_id)
@@ -154,8 +350,10 @@ def get_snapshots_by_run(run_id: str) -> list[dict[str, Any]]:
                     "category": None,
                     "subscribers": row.get("subscriber_count"),
                     "total_views": row.get("view_count"),
-                    "upload_freq_days": None,
-                    "recent_videos_json": [],
+                    "upload_freq_days": (
+                        float(row["upload_freq_days"]) if row.get("upload_freq_days") is not None else None
+                    ),
+                    "recent_videos_json": row.get("recent_videos_json") or [],
                 }
             )
 
@@ -215,24 +413,30 @@ def insert_score(
         raise
 
 
-def get_last_score(entity_id: str) -> dict[str, Any] | None:
-    """Fetch the most recent prior score for an entity."""
+def get_last_scores(
+    entity_ids: list[str], exclude_run_id: str | None = None
+) -> dict[str, dict[str, Any]]:
+    """Fetch the most recent prior score for many entities (entity_id -> score).
+
+    Scores written by ``exclude_run_id`` are ignored.
+    """
+
+    if not entity_ids:
+        return {}
 
     try:
         sb = get_supabase_client()
-        response = (
-            sb.table("scout_scores")
-            .select("id, total_score, created_at")
-            .eq("entity_id", entity_id)
-            .order("created_at", desc=True)
-            .limit(1)
-            .execute()
-        )
-
-        rows = response.data or []
-        return rows[0] if rows else None
+        results: dict[str, dict[str, Any]] = {}
+        for i in range(0, len(entity_ids), BULK_CHUNK_SIZE):
+            response = sb.rpc(
+                "get_last_scores",
+                {"p_entity_ids": entity_ids[i:i + BULK_CHUNK_SIZE], "p_exclude_run_id": exclude_run_id},
+            ).execute()
+            for row in response.data or []:
+                results[str(row["entity_id"])] = row
+        return results
     except Exception:
-        logger.exception("Failed to fetch last score. entity_id=%s", entity_id)
+        logger.exception("Failed to fetch last scores. count=%d", len(entity_ids))
         raise
 
 
@@ -273,46 +477,22 @@ def get_scores_by_run(run_id: str) -> list[dict[str, Any]]:
         raise
 
 
-def update_score_classification(score_id: str, classification: str) -> None:
-    """Update the category (classification) for a score."""
-
-    try:
-        sb = get_supabase_client()
-        sb.table("scout_scores").update({"category": classification}).eq("id", score_id).execute()
-    except Exception:
-        logger.exception(
-            "Failed to update score classification. score_id=%s classification=%s",
-            score_id,
-            classification,
-        )
-        raise
-
-
-def insert_pin(entity_id: str, note: str | None = None, pinned_by: str | None = None) -> str:
-    """Insert or update a pin for an entity."""
-
-    try:
-        sb = get_supabase_client()
-        payload = {"entity_id": entity_id, "note": note, "pinned_by": pinned_by}
-        response = sb.table("scout_pins").upsert(payload, on_conflict="entity_id").execute()
-        data = response.data or []
-        if not data or "id" not in data[0]:
-            raise ValueError("Insert pin response does not include pin id.")
-
-        return str(data[0]["id"])
-    except Exception:
-        logger.exception("Failed to insert pin. entity_id=%s", entity_id)
-        raise
-
+def update_score_classifications(classifications: dict[str, str]) -> int:
+    """Update categories for many scores (score_id -> category) in one RPC call."""
 
-def delete_pin(entity_id: str) -> None:
-    """Delete a pin for an entity."""
+    if not classifications:
+        return 0
 
     try:
         sb = get_supabase_client()
-        sb.table("scout_pins").delete().eq("entity_id", entity_id).execute()
+        updates = [
+            {"score_id": score_id, "category": category}
+            for score_id, category in classifications.items()
+        ]
+        response = sb.rpc("update_score_classifications", {"p_updates": updates}).execute()
+        return int(response.data or 0)
     except Exception:
-        logger.exception("Failed to delete pin. entity_id=%s", entity_id)
+        logger.exception("Failed to bulk update score classifications. count=%d", len(classifications))
         raise
 
 
@@ -345,57 +525,379 @@ def get_pins() -> list[dict[str, Any]]:
         raise
 
 
-def get_last_success_run_id() -> str | None:
-    """Fetch the ID of the most recent successful run."""
+def get_tracked_set() -> list[str]:
+    """Fetch the Hybrid 60 tracked set (Top10/Hot8/Watch7/Pin5) as platform IDs."""
+
+    try:
+        sb = get_supabase_client()
+        response = sb.rpc("get_tracked_set", {}).execute()
+        return [row["platform_id"] for row in response.data or []]
+    except Exception:
+        logger.exception("Failed to fetch tracked set.")
+        raise
+
+
+def refresh_tracked_set(run_id: str) -> int:
+    """Materialize the score-based tracked set from a run; return its size."""
+
+    try:
+        sb = get_supabase_client()
+        response = sb.rpc("refresh_tracked_set", {"p_run_id": run_id}).execute()
+        return int(response.data or 0)
+    except Exception:
+        logger.exception("Failed to refresh tracked set. run_id=%s", run_id)
+        raise
+
+
+def get_pinned_entity_ids() -> list[str]:
+    """Fetch all pinned entity IDs."""
+
+    try:
+        sb = get_supabase_client()
+        response = sb.table("scout_pins").select("entity_id").execute()
+        rows = response.data or []
+        return [str(row["entity_id"]) for row in rows]
+    except Exception:
+        logger.exception("Failed to fetch pinned entity_ids.")
+        raise
+
+
+def reserve_quota_usage(usage_date: str, units: int, limit: int) -> int | None:
+    """Atomically add quota units unless the day would exceed limit.
+
+    Returns the new daily total, or None when the units do not fit.
+    """
+
+    try:
+        sb = get_supabase_client()
+        response = sb.rpc(
+            "reserve_quota_usage",
+            {"p_usage_date": usage_date, "p_units": units, "p_limit": limit},
+        ).execute()
+        return None if response.data is None else int(response.data)
+    except Exception:
+        logger.exception("Failed to reserve quota usage. usage_date=%s units=%s", usage_date, units)
+        raise
+
+
+def add_quota_usage(usage_date: str, units: int) -> int:
+    """Atomically add (or, negative, release) quota units and return the new daily total."""
+
+    try:
+        sb = get_supabase_client()
+        response = sb.rpc(
+            "add_quota_usage", {"p_usage_date": usage_date, "p_units": units}
+        ).execute()
+        return int(response.data or 0)
+    except Exception:
+        logger.exception("Failed to add quota usage. usage_date=%s units=%s", usage_date, units)
+        raise
+
+
+def get_search_cache(query: str, max_results: int) -> dict[str, Any] | None:
+    """Fetch a cached search.list result (channel_ids, fetched_at) for a query."""
 
     try:
         sb = get_supabase_client()
         response = (
-            sb.table("scout_runs")
-            .select("id")
-            .eq("status", "success")
-            .order("created_at", desc=True)
+            sb.table("scout_search_cache")
+            .select("channel_ids, fetched_at")
+            .eq("query", query)
+            .eq("max_results", max_results)
             .limit(1)
             .execute()
         )
         rows = response.data or []
-        return str(rows[0]["id"]) if rows else None
+        return rows[0] if rows else None
+    except Exception:
+        logger.exception("Failed to fetch search cache. query=%s", query)
+        raise
+
+
+def upsert_search_cache(query: str, max_results: int, channel_ids: list[str], fetched_at: str) -> None:
+    """Store a search.list result in the keyword cache."""
+
+    try:
+        sb = get_supabase_client()
+        payload = {
+            "query": query,
+            "max_results": max_results,
+            "channel_ids": channel_ids,
+            "fetched_at": fetched_at,
+        }
+        sb.table("scout_search_cache").upsert(payload, on_conflict="query,max_results").execute()
     except Exception:
-        logger.exception("Failed to fetch last success run_id.")
+        logger.exception("Failed to upsert search cache. query=%s", query)
         raise
 
 
-def get_entities_by_classification(run_id: str, category: str, limit: int = 10) -> list[str]:
-    """Fetch list of entity IDs for a specific classification in a run."""
+def get_entity_etags(platform: str, platform_ids: list[str]) -> dict[str, dict[str, str | None]]:
+    """Fetch entity id and stored item etag for platform IDs (platform_id -> row)."""
+
+    if not platform_ids:
+        return {}
 
     try:
         sb = get_supabase_client()
         response = (
-            sb.table("scout_scores")
-            .select("entity_id")
-            .eq("run_id", run_id)
-            .eq("category", category)
-            .order("total_score", desc=True)
-            .limit(limit)
+            sb.table("scout_entities")
+            .select("id, platform_id, etag")
+            .eq("platform", platform)
+            .in_("platform_id", platform_ids)
             .execute()
         )
-        rows = response.data or []
-        return [str(row["entity_id"]) for row in rows]
+        return {
+            str(row["platform_id"]): {"id": str(row["id"]), "etag": row.get("etag")}
+            for row in response.data or []
+        }
     except Exception:
-        logger.exception(
-            "Failed to fetch entities by classification. run_id=%s, category=%s", run_id, category
+        logger.exception("Failed to fetch entity etags. platform=%s count=%d", platform, len(platform_ids))
+        raise
+
+
+def get_request_etags(cache_keys: list[str]) -> dict[str, dict[str, Any]]:
+    """Fetch stored response etags and items by cache key."""
+
+    if not cache_keys:
+        return {}
+
+    try:
+        sb = get_supabase_client()
+        response = (
+            sb.table("scout_request_etags")
+            .select("cache_key, etag, items")
+            .in_("cache_key", cache_keys)
+            .execute()
         )
+        return {str(row["cache_key"]): row for row in response.data or []}
+    except Exception:
+        logger.exception("Failed to fetch request etags. count=%d", len(cache_keys))
         raise
 
 
-def get_pinned_entity_ids() -> list[str]:
-    """Fetch all pinned entity IDs."""
+def upsert_request_etag(cache_key: str, etag: str, items: list[dict[str, Any]]) -> None:
+    """Store a response etag and its items for later conditional requests."""
 
     try:
         sb = get_supabase_client()
-        response = sb.table("scout_pins").select("entity_id").execute()
+        payload = {"cache_key": cache_key, "etag": etag, "items": items}
+        sb.table("scout_request_etags").upsert(payload, on_conflict="cache_key").execute()
+    except Exception:
+        logger.exception("Failed to upsert request etag. cache_key=%s", cache_key)
+        raise
+
+
+def get_channel_index(lookup_keys: list[str]) -> dict[str, str]:
+    """Fetch resolved channel IDs for handle/name lookup keys (lookup_key -> channel_id)."""
+
+    if not lookup_keys:
+        return {}
+
+    try:
+        sb = get_supabase_client()
+        response = (
+            sb.table("scout_channel_index")
+            .select("lookup_key, channel_id")
+            .in_("lookup_key", lookup_keys)
+            .execute()
+        )
+        return {str(row["lookup_key"]): str(row["channel_id"]) for row in response.data or []}
+    except Exception:
+        logger.exception("Failed to fetch channel index. count=%d", len(lookup_keys))
+        raise
+
+
+def upsert_channel_index(rows: list[dict[str, str]]) -> None:
+    """Store resolved lookup_key -> channel_id rows (with source) in one request."""
+
+    if not rows:
+        return
+
+    try:
+        sb = get_supabase_client()
+        sb.table("scout_channel_index").upsert(rows, on_conflict="lookup_key").execute()
+    except Exception:
+        logger.exception("Failed to upsert channel index. count=%d", len(rows))
+        raise
+
+
+def get_recent_entity_videos(entity_ids: list[str], limit: int) -> dict[str, list[dict[str, Any]]]:
+    """Fetch the latest stored videos per entity (entity_id -> newest-first rows)."""
+
+    if not entity_ids:
+        return {}
+
+    try:
+        sb = get_supabase_client()
+        response = sb.rpc(
+            "get_recent_entity_videos", {"p_entity_ids": entity_ids, "p_limit": limit}
+        ).execute()
+
+        results: dict[str, list[dict[str, Any]]] = {}
+        for row in response.data or []:
+            results.setdefault(str(row["entity_id"]), []).append(row)
+        return results
+    except Exception:
+        logger.exception("Failed to fetch recent entity videos. count=%d", len(entity_ids))
+        raise
+
+
+def upsert_videos_bulk(videos: list[dict[str, Any]]) -> None:
+    """Upsert scout_videos rows in multi-row requests."""
+
+    if not videos:
+        return
+
+    try:
+        sb = get_supabase_client()
+        for i in range(0, len(videos), BULK_CHUNK_SIZE):
+            sb.table("scout_videos").upsert(
+                videos[i:i + BULK_CHUNK_SIZE], on_conflict="video_id"
+            ).execute()
+    except Exception:
+        logger.exception("Failed to bulk upsert videos. count=%d", len(videos))
+        raise
+
+
+def get_discovery_cache(query_keys: list[str], discovered_on: str) -> dict[str, list[dict[str, Any]]]:
+    """Fetch cached discovery results for keyword groups on a given day."""
+
+    if not query_keys:
+        return {}
+
+    try:
+        sb = get_supabase_client()
+        response = (
+            sb.table("scout_discovery_cache")
+            .select("query_key, items")
+            .eq("discovered_on", discovered_on)
+            .in_("query_key", query_keys)
+            .execute()
+        )
+        return {row["query_key"]: row.get("items") or [] for row in response.data or []}
+    except Exception:
+        logger.exception("Failed to fetch discovery cache. count=%d", len(query_keys))
+        raise
+
+
+def upsert_discovery_cache(rows: list[dict[str, Any]]) -> None:
+    """Store discovery results (query_key, discovered_on, items, latency_ms)."""
+
+    if not rows:
+        return
+
+    try:
+        sb = get_supabase_client()
+        sb.table("scout_discovery_cache").upsert(rows, on_conflict="query_key,discovered_on").execute()
+    except Exception:
+        logger.exception("Failed to upsert discovery cache. count=%d", len(rows))
+        raise
+
+
+def insert_analysis_batch(
+    run_id: str, openai_batch_id: str, input_file_id: str, status: str, request_count: int
+) -> dict[str, Any]:
+    """Record a submitted OpenAI batch for a run."""
+
+    try:
+        sb = get_supabase_client()
+        payload = {
+            "run_id": run_id,
+            "openai_batch_id": openai_batch_id,
+            "input_file_id": input_file_id,
+            "status": status,
+            "request_count": request_count,
+        }
+        response = sb.table("scout_analysis_batches").insert(payload).execute()
+        data = response.data or []
+        if not data:
+            raise RuntimeError("No data returned from scout_analysis_batches insert")
+        return data[0]
+    except Exception:
+        logger.exception("Failed to insert analysis batch. run_id=%s", run_id)
+        raise
+
+
+def get_analysis_batch(run_id: str) -> dict[str, Any] | None:
+    """Fetch the latest OpenAI batch submitted for a run."""
+
+    try:
+        sb = get_supabase_client()
+        response = (
+            sb.table("scout_analysis_batches")
+            .select("*")
+            .eq("run_id", run_id)
+            .order("created_at", desc=True)
+            .limit(1)
+            .execute()
+        )
         rows = response.data or []
-        return [str(row["entity_id"]) for row in rows]
+        return rows[0] if rows else None
     except Exception:
-        logger.exception("Failed to fetch pinned entity_ids.")
+        logger.exception("Failed to fetch analysis batch. run_id=%s", run_id)
+        raise
+
+
+def update_analysis_batch(openai_batch_id: str, fields: dict[str, Any]) -> None:
+    """Update status / output file ids / ingested_at of a batch."""
+
+    try:
+        sb = get_supabase_client()
+        payload = {**fields, "updated_at": datetime.now(timezone.utc).isoformat()}
+        sb.table("scout_analysis_batches").update(payload).eq("openai_batch_id", openai_batch_id).execute()
+    except Exception:
+        logger.exception("Failed to update analysis batch. openai_batch_id=%s", openai_batch_id)
+        raise
+
+
+def get_llm_cache(cache_keys: list[str]) -> dict[str, dict[str, Any]]:
+    """Fetch cached score outputs (cache_key -> row) for many keys."""
+
+    if not cache_keys:
+        return {}
+
+    try:
+        sb = get_supabase_client()
+        results: dict[str, dict[str, Any]] = {}
+        for i in range(0, len(cache_keys), BULK_CHUNK_SIZE):
+            response = (
+                sb.table("scout_llm_cache")
+                .select("cache_key, output, prompt_tokens, completion_tokens, created_at")
+                .in_("cache_key", cache_keys[i:i + BULK_CHUNK_SIZE])
+                .execute()
+            )
+            for row in response.data or []:
+                results[row["cache_key"]] = row
+        return results
+    except Exception:
+        logger.exception("Failed to fetch LLM cache. count=%d", len(cache_keys))
+        raise
+
+
+def upsert_llm_cache(rows: list[dict[str, Any]]) -> None:
+    """Store validated score outputs in the LLM cache."""
+
+    if not rows:
+        return
+
+    try:
+        sb = get_supabase_client()
+        for i in range(0, len(rows), BULK_CHUNK_SIZE):
+            sb.table("scout_llm_cache").upsert(rows[i:i + BULK_CHUNK_SIZE], on_conflict="cache_key").execute()
+    except Exception:
+        logger.exception("Failed to upsert LLM cache. count=%d", len(rows))
+        raise
+
+
+def evict_llm_cache(ttl_hours: int, max_entries: int) -> int:
+    """Apply TTL and size-based eviction to the LLM cache; return rows deleted."""
+
+    try:
+        sb = get_supabase_client()
+        response = sb.rpc(
+            "evict_llm_cache", {"p_ttl_hours": ttl_hours, "p_max_entries": max_entries}
+        ).execute()
+        return int(response.data or 0)
+    except Exception:
+        logger.exception("Failed to evict LLM cache.")
         raise
@@ -18,6 +18,11 @@ class YouTubeChannel(BaseModel):
     video_count: int | None = None
     country: str | None = None
     language: str | None = None
+    etag: str | None = None
+    uploads_playlist_id: str | None = None
+    # Filled by the video stage
+    upload_freq_days: float | None = None
+    recent_videos: list[dict[str, Any]] = Field(default_factory=list)
 
 
 class YouTubeVideo(BaseModel):
@@ -26,6 +31,8 @@ class YouTubeVideo(BaseModel):
     video_id: str
     published_at: datetime
     video_type: str = "normal"  # normal, live, shorts
+    title: str | None = None
+    duration: str | None = None
 
 
 class CollectorResult(BaseModel):
@@ -35,6 +42,7 @@ class CollectorResult(BaseModel):
     entity_count: int
     snapshot_count: int
     errors: list[str] = Field(default_factory=list)
+    entity_upserts_skipped: int = 0
 
 
 class EntityRecord(BaseModel):
@@ -65,6 +73,8 @@ class SnapshotRecord(BaseModel):
     subscriber_count: int | None = None
     view_count: int | None = None
     video_count: int | None = None
+    upload_freq_days: float | None = None
+    recent_videos_json: list[dict[str, Any]] = Field(default_factory=list)
     collected_at: datetime | None = None
     created_at: datetime | None = None
 
@@ -112,7 +122,7 @@ class RunRequest(BaseModel):
     run_type: str = Field("manual", pattern="^(manual|scheduled)$")
     config: dict[str, Any] = Field(default_factory=dict)
     notify_discord: bool = True
-    analysis_mode: str = Field("aggregated", pattern="^(smart|aggregated|full)$")
+    analysis_mode: str = Field("aggregated", pattern="^(smart|aggregated|full|batch)$")
 
 
 class RunResponse(BaseModel):
@@ -0,0 +1,110 @@
+"""Latency of the pins API under concurrent load: sync vs async data access.
+
+Both variants serve GET /pins from an ``async def`` handler against a simulated
+PostgREST backend that takes ``--delay-ms`` per query. The ``sync`` variant
+calls ``db.queries.get_pins`` (blocking the event loop, the former router
+behaviour); the ``async`` variant is the real ``/v1/scout/pins`` route on
+``db.async_queries``. No network or Supabase project is needed::
+
+    python scripts/bench_api_latency.py --requests 50 --delay-ms 100
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import logging
+import statistics
+import sys
+import time
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any
+
+import httpx
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import db.client  # noqa: E402
+from api.deps import verify_api_key  # noqa: E402
+from db.queries import get_pins  # noqa: E402
+from main import app  # noqa: E402
+
+ROWS = [
+    {"id": "pin-1", "entity_id": "entity-1", "note": None, "pinned_by": "bench",
+     "scout_entities": {"channel_title": "Bench Channel"}},
+]
+
+
+class SlowQuery:
+    """Chainable stand-in for a PostgREST request builder with fixed latency."""
+
+    def __init__(self, delay: float, is_async: bool) -> None:
+        self.delay = delay
+        self.is_async = is_async
+
+    def __getattr__(self, name: str) -> Any:
+        if name == "execute":
+            return self._execute_async if self.is_async else self._execute_sync
+        return lambda *args, **kwargs: self
+
+    def _execute_sync(self) -> Any:
+        time.sleep(self.delay)
+        return SimpleNamespace(data=ROWS)
+
+    async def _execute_async(self) -> Any:
+        await asyncio.sleep(self.delay)
+        return SimpleNamespace(data=ROWS)
+
+
+@app.get("/bench/sync-pins")
+async def sync_pins():
+    return get_pins()
+
+
+async def measure(path: str, requests: int) -> dict[str, float]:
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        # All requests are sent at once, so latency counts from the common start:
+        # with a blocked event loop later requests wait for earlier ones.
+        started = time.perf_counter()
+
+        async def one() -> float:
+            response = await client.get(path)
+            response.raise_for_status()
+            return (time.perf_counter() - started) * 1000
+
+        latencies = sorted(await asyncio.gather(*(one() for _ in range(requests))))
+        wall_ms = (time.perf_counter() - started) * 1000
+
+    return {
+        "p50_ms": statistics.median(latencies),
+        "p95_ms": latencies[max(0, int(len(latencies) * 0.95) - 1)],
+        "max_ms": latencies[-1],
+        "wall_ms": wall_ms,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=50, help="Concurrent requests per variant.")
+    parser.add_argument("--delay-ms", type=float, default=100, help="Simulated PostgREST latency per query.")
+    args = parser.parse_args()
+
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    delay = args.delay_ms / 1000
+    db.client._client = SlowQuery(delay, is_async=False)
+    db.client._async_client = SlowQuery(delay, is_async=True)
+    app.dependency_overrides[verify_api_key] = lambda: "bench"
+
+    print(f"{args.requests} concurrent GET requests, {args.delay_ms:.0f} ms per query")
+    for name, path in (("sync", "/bench/sync-pins"), ("async", "/v1/scout/pins")):
+        result = asyncio.run(measure(path, args.requests))
+        print(
+            f"{name:>5}: p50 {result['p50_ms']:8.1f} ms  p95 {result['p95_ms']:8.1f} ms  "
+            f"max {result['max_ms']:8.1f} ms  wall {result['wall_ms']:8.1f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
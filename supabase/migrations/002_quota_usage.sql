@@ -0,0 +1,20 @@
+-- YouTube Data API daily quota ledger
+
+create table if not exists scout_quota_usage (
+  usage_date date primary key,
+  units_used integer not null default 0,
+  updated_at timestamptz not null default now()
+);
+
+-- Atomically add units to a day's usage and return the new total.
+create or replace function add_quota_usage(p_usage_date date, p_units integer)
+returns integer
+language sql
+as $$
+  insert into scout_quota_usage (usage_date, units_used)
+  values (p_usage_date, p_units)
+  on conflict (usage_date) do update
+    set units_used = scout_quota_usage.units_used + excluded.units_used,
+        updated_at = now()
+  returning units_used;
+$$;
@@ -0,0 +1,9 @@
+-- Keyword -> channel ID cache for YouTube search.list results
+
+create table if not exists scout_search_cache (
+  query text not null,
+  max_results integer not null,
+  channel_ids jsonb not null default '[]'::jsonb,
+  fetched_at timestamptz not null default now(),
+  primary key (query, max_results)
+);
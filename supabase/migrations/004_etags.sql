@@ -0,0 +1,12 @@
+-- ETag bookkeeping for conditional channel detail refreshes
+
+-- Last seen channels.list item etag per entity; unchanged items skip the entity upsert.
+alter table scout_entities add column if not exists etag text;
+
+-- Response-level etag and items for a (sorted) tracked-ID chunk, replayed on 304.
+create table if not exists scout_request_etags (
+  cache_key text primary key,
+  etag text not null,
+  items jsonb not null default '[]'::jsonb,
+  updated_at timestamptz not null default now()
+);
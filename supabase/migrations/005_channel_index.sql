@@ -0,0 +1,8 @@
+-- Persistent handle/name -> YouTube channel ID index for discovery resolution
+
+create table if not exists scout_channel_index (
+  lookup_key text primary key,
+  channel_id text not null,
+  source text not null check (source in ('handle', 'search')),
+  resolved_at timestamptz not null default now()
+);
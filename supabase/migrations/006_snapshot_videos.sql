@@ -0,0 +1,4 @@
+-- Recent-video activity on snapshots (filled by the collector video stage)
+
+alter table scout_snapshots add column if not exists upload_freq_days numeric(6,1);
+alter table scout_snapshots add column if not exists recent_videos_json jsonb not null default '[]'::jsonb;
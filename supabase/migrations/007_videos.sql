@@ -0,0 +1,39 @@
+-- Incremental per-channel video store
+
+create table if not exists scout_videos (
+  video_id text primary key,
+  entity_id uuid not null references scout_entities(id) on delete cascade,
+  published_at timestamptz not null,
+  video_type text not null check (video_type in ('normal', 'live', 'shorts')),
+  title text,
+  duration text,
+  created_at timestamptz not null default now()
+);
+
+-- Recent-window reads and the per-entity high-water mark (max published_at).
+create index if not exists idx_scout_videos_entity_id_published_at_desc
+  on scout_videos (entity_id, published_at desc);
+
+-- Latest p_limit videos per entity in one round trip.
+create or replace function get_recent_entity_videos(p_entity_ids uuid[], p_limit integer)
+returns table (
+  entity_id uuid,
+  video_id text,
+  published_at timestamptz,
+  video_type text,
+  title text,
+  duration text
+)
+language sql
+stable
+as $$
+  select v.entity_id, v.video_id, v.published_at, v.video_type, v.title, v.duration
+  from unnest(p_entity_ids) as e(id)
+  cross join lateral (
+    select *
+    from scout_videos sv
+    where sv.entity_id = e.id
+    order by sv.published_at desc
+    limit p_limit
+  ) v;
+$$;
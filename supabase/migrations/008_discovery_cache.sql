@@ -0,0 +1,10 @@
+-- Per-day cache of web discovery results, keyed by keyword (group)
+
+create table if not exists scout_discovery_cache (
+  query_key text not null,
+  discovered_on date not null,
+  items jsonb not null default '[]'::jsonb,
+  latency_ms integer,
+  created_at timestamptz not null default now(),
+  primary key (query_key, discovered_on)
+);
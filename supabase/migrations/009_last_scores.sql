@@ -0,0 +1,21 @@
+-- Latest score per entity in one round trip
+
+create index if not exists idx_scout_scores_entity_id_created_at_desc
+  on scout_scores (entity_id, created_at desc);
+
+create or replace function get_last_scores(p_entity_ids uuid[])
+returns table (
+  entity_id uuid,
+  id uuid,
+  total_score numeric,
+  category text,
+  created_at timestamptz
+)
+language sql
+stable
+as $$
+  select distinct on (s.entity_id) s.entity_id, s.id, s.total_score, s.category, s.created_at
+  from scout_scores s
+  where s.entity_id = any(p_entity_ids)
+  order by s.entity_id, s.created_at desc;
+$$;
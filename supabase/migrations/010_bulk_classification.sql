@@ -0,0 +1,16 @@
+-- Write back every classification of a run in one statement
+
+create or replace function update_score_classifications(p_updates jsonb)
+returns integer
+language sql
+as $$
+  with updated as (
+    update scout_scores s
+    set category = u.category,
+        updated_at = now()
+    from jsonb_to_recordset(p_updates) as u(score_id uuid, category text)
+    where s.id = u.score_id
+    returning s.id
+  )
+  select count(*)::integer from updated;
+$$;
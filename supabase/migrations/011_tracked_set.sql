@@ -0,0 +1,85 @@
+-- Hybrid 60 tracked set (Top10 / Hot8 / Watch7 / Pin5) selected server-side
+
+-- Score-based part of the tracked set, materialized at the end of each run.
+create table if not exists scout_tracked_set (
+  entity_id uuid primary key references scout_entities(id) on delete cascade,
+  source text not null check (source in ('top', 'hot', 'watch')),
+  run_id uuid not null references scout_runs(id) on delete cascade,
+  created_at timestamptz not null default now()
+);
+
+create index if not exists idx_scout_scores_run_id_category_total_score_desc
+  on scout_scores (run_id, category, total_score desc);
+
+create or replace function compute_tracked_set(p_run_id uuid)
+returns table (entity_id uuid, source text)
+language sql
+stable
+as $$
+  select ranked.entity_id, ranked.category
+  from (
+    select s.entity_id, s.category,
+           row_number() over (partition by s.category order by s.total_score desc) as rn
+    from scout_scores s
+    where s.run_id = p_run_id
+      and s.category in ('top', 'hot', 'watch')
+  ) ranked
+  where (ranked.category = 'top' and ranked.rn <= 10)
+     or (ranked.category = 'hot' and ranked.rn <= 8)
+     or (ranked.category = 'watch' and ranked.rn <= 7);
+$$;
+
+-- Replace the materialized set with the selection for p_run_id.
+create or replace function refresh_tracked_set(p_run_id uuid)
+returns integer
+language plpgsql
+as $$
+declare
+  inserted integer;
+begin
+  delete from scout_tracked_set where true;
+  insert into scout_tracked_set (entity_id, source, run_id)
+  select distinct on (t.entity_id) t.entity_id, t.source, p_run_id
+  from compute_tracked_set(p_run_id) t;
+  get diagnostics inserted = row_count;
+  return inserted;
+end;
+$$;
+
+-- Tracked platform IDs in one call: the materialized set if it belongs to the
+-- last successful run (computed on the fly otherwise) plus the first 5 pins.
+create or replace function get_tracked_set()
+returns table (platform_id text, source text)
+language sql
+stable
+as $$
+  with last_run as (
+    select id from scout_runs where status = 'success' order by created_at desc limit 1
+  ),
+  materialized as (
+    select ts.entity_id, ts.source
+    from scout_tracked_set ts
+    where ts.run_id = (select id from last_run)
+  ),
+  scored as (
+    select entity_id, source from materialized
+    union all
+    select t.entity_id, t.source
+    from last_run, compute_tracked_set(last_run.id) t
+    where not exists (select 1 from materialized)
+  ),
+  pins as (
+    select p.entity_id, 'pin'::text as source
+    from scout_pins p
+    order by p.created_at
+    limit 5
+  ),
+  tracked as (
+    select distinct on (entity_id) entity_id, source
+    from (select * from scored union all select * from pins) candidates
+    order by entity_id, (source = 'pin')
+  )
+  select e.platform_id, tracked.source
+  from tracked
+  join scout_entities e on e.id = tracked.entity_id;
+$$;
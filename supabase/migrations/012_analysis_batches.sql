@@ -0,0 +1,18 @@
+-- OpenAI Batch API submissions for analysis_mode = 'batch'
+
+create table if not exists scout_analysis_batches (
+  id uuid primary key default gen_random_uuid(),
+  run_id uuid not null references scout_runs(id) on delete cascade,
+  openai_batch_id text not null unique,
+  input_file_id text not null,
+  output_file_id text,
+  error_file_id text,
+  status text not null,
+  request_count integer not null default 0,
+  ingested_at timestamptz,
+  created_at timestamptz not null default now(),
+  updated_at timestamptz not null default now()
+);
+
+create index if not exists idx_scout_analysis_batches_run_id_created_at_desc
+  on scout_analysis_batches (run_id, created_at desc);
@@ -0,0 +1,37 @@
+-- Content-addressed cache of validated GPT score outputs
+
+create table if not exists scout_llm_cache (
+  cache_key text primary key,
+  model text not null,
+  output jsonb not null,
+  prompt_tokens integer not null default 0,
+  completion_tokens integer not null default 0,
+  created_at timestamptz not null default now()
+);
+
+create index if not exists idx_scout_llm_cache_created_at on scout_llm_cache (created_at);
+
+-- Drop entries older than the TTL, then the oldest beyond p_max_entries.
+create or replace function evict_llm_cache(p_ttl_hours integer, p_max_entries integer)
+returns integer
+language plpgsql
+as $$
+declare
+  expired integer;
+  overflow integer;
+begin
+  delete from scout_llm_cache
+  where created_at < now() - make_interval(hours => p_ttl_hours);
+  get diagnostics expired = row_count;
+
+  delete from scout_llm_cache
+  where cache_key in (
+    select cache_key from scout_llm_cache
+    order by created_at desc
+    offset p_max_entries
+  );
+  get diagnostics overflow = row_count;
+
+  return expired + overflow;
+end;
+$$;
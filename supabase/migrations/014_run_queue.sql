@@ -0,0 +1,70 @@
+-- Durable run queue: the API inserts 'queued' runs, queue workers claim them
+
+alter table scout_runs drop constraint if exists scout_runs_status_check;
+alter table scout_runs
+  add constraint scout_runs_status_check check (status in ('queued', 'running', 'success', 'failed'));
+
+alter table scout_runs add column if not exists analysis_mode text not null default 'aggregated';
+alter table scout_runs add column if not exists notify_discord boolean not null default true;
+alter table scout_runs add column if not exists worker_id text;
+alter table scout_runs add column if not exists heartbeat_at timestamptz;
+alter table scout_runs add column if not exists attempts integer not null default 0;
+
+create index if not exists idx_scout_runs_queue
+  on scout_runs (created_at)
+  where status in ('queued', 'running');
+
+-- Claim the oldest queued run, or a running run whose worker stopped sending
+-- heartbeats for p_stale_seconds. Stale runs that already used p_max_attempts
+-- are failed instead. SKIP LOCKED lets any number of workers claim concurrently.
+create or replace function claim_scout_run(p_worker_id text, p_stale_seconds integer, p_max_attempts integer)
+returns setof scout_runs
+language plpgsql
+as $$
+begin
+  update scout_runs
+  set status = 'failed',
+      finished_at = now(),
+      summary = coalesce(summary, '{}'::jsonb)
+        || jsonb_build_object('fatal_error', 'Worker heartbeat lost after ' || attempts || ' attempts'),
+      updated_at = now()
+  where status = 'running'
+    and heartbeat_at < now() - make_interval(secs => p_stale_seconds)
+    and attempts >= p_max_attempts;
+
+  return query
+  with candidate as (
+    select r.id
+    from scout_runs r
+    where r.status = 'queued'
+       or (r.status = 'running' and r.heartbeat_at < now() - make_interval(secs => p_stale_seconds))
+    order by r.created_at
+    limit 1
+    for update skip locked
+  )
+  update scout_runs r
+  set status = 'running',
+      worker_id = p_worker_id,
+      heartbeat_at = now(),
+      started_at = now(),
+      attempts = r.attempts + 1,
+      updated_at = now()
+  from candidate
+  where r.id = candidate.id
+  returning r.*;
+end;
+$$;
+
+-- Returns false when the run is no longer held by p_worker_id (it was reclaimed).
+create or replace function heartbeat_scout_run(p_run_id uuid, p_worker_id text)
+returns boolean
+language sql
+as $$
+  with touched as (
+    update scout_runs
+    set heartbeat_at = now()
+    where id = p_run_id and worker_id = p_worker_id and status = 'running'
+    returning id
+  )
+  select exists (select 1 from touched);
+$$;
@@ -0,0 +1,12 @@
+-- Stage outputs of a run, so a resumed or reclaimed run skips finished stages
+
+create table if not exists scout_run_checkpoints (
+  run_id uuid not null references scout_runs(id) on delete cascade,
+  stage text not null,
+  output jsonb not null default '{}'::jsonb,
+  completed_at timestamptz not null default now(),
+  primary key (run_id, stage)
+);
+
+-- Snapshots of an interrupted collection are cleared per run before it is redone.
+create index if not exists idx_scout_snapshots_run_id on scout_snapshots (run_id);
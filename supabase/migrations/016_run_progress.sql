@@ -0,0 +1,3 @@
+-- Latest progress snapshot of a run (stage, stage statuses, counters) for SSE clients
+
+alter table scout_runs add column if not exists progress jsonb;
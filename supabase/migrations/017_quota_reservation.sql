@@ -0,0 +1,26 @@
+-- Budget-checked quota reservation shared by concurrent queue workers
+
+-- Add units to a day's usage only if the total stays within p_limit.
+-- Returns the new total, or null when the units do not fit. The row lock
+-- taken by the update serializes concurrent reservations for the day.
+create or replace function reserve_quota_usage(p_usage_date date, p_units integer, p_limit integer)
+returns integer
+language plpgsql
+as $$
+declare
+  v_units integer;
+begin
+  insert into scout_quota_usage (usage_date, units_used)
+  values (p_usage_date, 0)
+  on conflict (usage_date) do nothing;
+
+  update scout_quota_usage
+     set units_used = units_used + p_units,
+         updated_at = now()
+   where usage_date = p_usage_date
+     and units_used + p_units <= p_limit
+  returning units_used into v_units;
+
+  return v_units;
+end;
+$$;
@@ -0,0 +1,34 @@
+-- Scope the materialized tracked set by run so concurrent refreshes do not
+-- interleave on one global set. get_tracked_set already reads only the rows
+-- of the last successful run.
+
+alter table scout_tracked_set drop constraint if exists scout_tracked_set_pkey;
+alter table scout_tracked_set add primary key (run_id, entity_id);
+
+-- Replace p_run_id's rows with its selection. Rows of runs created before the
+-- last successful run can no longer be read and are pruned; rows of other
+-- runs still in flight are left alone.
+create or replace function refresh_tracked_set(p_run_id uuid)
+returns integer
+language plpgsql
+as $$
+declare
+  inserted integer;
+begin
+  delete from scout_tracked_set where run_id = p_run_id;
+
+  delete from scout_tracked_set ts
+  using scout_runs r
+  where r.id = ts.run_id
+    and ts.run_id <> p_run_id
+    and r.created_at < (
+      select created_at from scout_runs where status = 'success' order by created_at desc limit 1
+    );
+
+  insert into scout_tracked_set (entity_id, source, run_id)
+  select distinct on (t.entity_id) t.entity_id, t.source, p_run_id
+  from compute_tracked_set(p_run_id) t;
+  get diagnostics inserted = row_count;
+  return inserted;
+end;
+$$;
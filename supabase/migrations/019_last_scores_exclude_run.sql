@@ -0,0 +1,22 @@
+-- Prior scores must not include the scores of the run asking for them: a
+-- resumed run would otherwise compare against the rows it is replacing.
+
+drop function if exists get_last_scores(uuid[]);
+
+create or replace function get_last_scores(p_entity_ids uuid[], p_exclude_run_id uuid default null)
+returns table (
+  entity_id uuid,
+  id uuid,
+  total_score numeric,
+  category text,
+  created_at timestamptz
+)
+language sql
+stable
+as $$
+  select distinct on (s.entity_id) s.entity_id, s.id, s.total_score, s.category, s.created_at
+  from scout_scores s
+  where s.entity_id = any(p_entity_ids)
+    and (p_exclude_run_id is null or s.run_id <> p_exclude_run_id)
+  order by s.entity_id, s.created_at desc;
+$$;
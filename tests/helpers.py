@@ -0,0 +1,47 @@
+"""Shared builders for the analyzer tests."""
+
+SCORE = {
+    "demand_match": 25,
+    "improvement_potential": 15,
+    "ability_to_pay": 10,
+    "ease_of_contact": 10,
+    "style_fit": 18,
+    "summary": "要約",
+    "fit_reasons": ["a", "b", "c"],
+    "recommended_offer": "提案",
+}
+
+
+def snapshot(i, subscribers=1000):
+    """A collected snapshot for entity ``e-{i}``."""
+
+    return {
+        "entity_id": f"e-{i}",
+        "display_name": f"Creator {i}",
+        "subscribers": subscribers,
+        "total_views": 5000,
+        "upload_freq_days": 3.0,
+        "recent_videos_json": [],
+    }
+
+
+def completion(content, prompt_tokens=None, cached_tokens=0):
+    """A chat.completion response body; ``usage`` is included when ``prompt_tokens`` is given."""
+
+    body = {
+        "id": "chatcmpl-1",
+        "object": "chat.completion",
+        "created": 0,
+        "model": "gpt-4o-mini",
+        "choices": [
+            {"index": 0, "finish_reason": "stop", "message": {"role": "assistant", "content": content}}
+        ],
+    }
+    if prompt_tokens is not None:
+        body["usage"] = {
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": 40,
+            "total_tokens": prompt_tokens + 40,
+            "prompt_tokens_details": {"cached_tokens": cached_tokens},
+        }
+    return body
@@ -0,0 +1,140 @@
+"""Unit tests for map-reduce aggregated analysis in worker/analyzer.py."""
+
+import json
+import re
+import threading
+
+from unittest.mock import MagicMock, patch
+
+from worker.analyzer import AGGREGATED_PROMPT_HEADER, SYSTEM_PROMPT_AGGREGATED, Analyzer
+from worker.prompt_packer import estimate_message_tokens, estimate_tokens
+from helpers import snapshot
+
+
+def _budget_for(lines_per_call):
+    """Token budget that fits exactly ``lines_per_call`` entity lines."""
+
+    line = Analyzer._entity_line(snapshot("00"))
+    base = estimate_message_tokens(SYSTEM_PROMPT_AGGREGATED, AGGREGATED_PROMPT_HEADER)
+    return base + lines_per_call * (estimate_tokens(line) + 1)
+
+
+def _make_analyzer(create):
+    with patch("worker.analyzer.get_settings") as mock_settings, \
+            patch("worker.analyzer.OpenAI") as mock_openai:
+        mock_settings.return_value.openai_model = "gpt-4o-mini"
+        mock_settings.return_value.batch_size = 4
+        mock_settings.return_value.prompt_token_budget = _budget_for(10)
+        client = mock_openai.return_value
+        client.with_options.return_value = client
+        client.chat.completions.create.side_effect = create
+        return Analyzer()
+
+
+def _rank_highest_ids(seen, lock):
+    """Fake GPT: recommend the 3 highest-numbered entities of each prompt."""
+
+    def create(**kwargs):
+        ids = re.findall(r"ID: (e-\d+)", kwargs["messages"][1]["content"])
+        with lock:
+            seen.append(ids)
+        top = sorted(ids, key=lambda x: int(x.split("-")[1]), reverse=True)[:3]
+        recs = [{"rank": n + 1, "name": i, "id": i} for n, i in enumerate(top)]
+        response = MagicMock()
+        response.choices = [MagicMock(message=MagicMock(content=json.dumps({"recommendations": recs})))]
+        return response
+
+    return create
+
+
+def _recommend_everything(seen, lock):
+    """Fake GPT that ignores the top-3 instruction and recommends every entity."""
+
+    def create(**kwargs):
+        ids = re.findall(r"ID: (e-\d+)", kwargs["messages"][1]["content"])
+        with lock:
+            seen.append(ids)
+        recs = [{"rank": n + 1, "name": i, "id": i} for n, i in enumerate(reversed(ids))]
+        response = MagicMock()
+        response.choices = [MagicMock(message=MagicMock(content=json.dumps({"recommendations": recs})))]
+        return response
+
+    return create
+
+
+def test_every_candidate_is_ranked_and_winners_are_reduced():
+    seen, lock = [], threading.Lock()
+    analyzer = _make_analyzer(_rank_highest_ids(seen, lock))
+
+    result = analyzer.analyze_aggregated("run-1", [snapshot(f"{i:02d}") for i in range(45)])
+
+    # The budget fits 10 lines. Round 1: 5 groups cover all 45 candidates. Round 2: 15 winners -> 2 groups.
+    # Round 3: 6 winners in one final group.
+    first_round = seen[:5]
+    assert sorted(i for ids in first_round for i in ids) == sorted(f"e-{i:02d}" for i in range(45))
+    assert all(len(ids) <= 10 for ids in seen)
+    assert [r["id"] for r in result["recommendations"]] == ["e-44", "e-43", "e-42"]
+    assert result["candidates"] == 45
+    assert result["rounds"] == 3
+    assert result["calls"] == 8
+    assert result["failed_calls"] == 0
+
+
+def test_small_candidate_list_uses_one_call():
+    seen, lock = [], threading.Lock()
+    analyzer = _make_analyzer(_rank_highest_ids(seen, lock))
+
+    result = analyzer.analyze_aggregated("run-1", [snapshot(f"{i:02d}") for i in range(4)])
+
+    assert result["rounds"] == 1 and result["calls"] == 1
+    assert [r["id"] for r in result["recommendations"]] == ["e-03", "e-02", "e-01"]
+
+
+def test_failed_group_is_counted_and_others_still_advance():
+    seen, lock = [], threading.Lock()
+    ranker = _rank_highest_ids(seen, lock)
+
+    def create(**kwargs):
+        if "ID: e-00," in kwargs["messages"][1]["content"]:
+            raise RuntimeError("boom")
+        return ranker(**kwargs)
+
+    analyzer = _make_analyzer(create)
+    result = analyzer.analyze_aggregated("run-1", [snapshot(f"{i:02d}") for i in range(20)])
+
+    assert result["failed_calls"] == 1
+    assert [r["id"] for r in result["recommendations"]] == ["e-19", "e-18", "e-17"]
+
+
+def test_only_top_winners_of_a_group_advance():
+    seen, lock = [], threading.Lock()
+    analyzer = _make_analyzer(_recommend_everything(seen, lock))
+    result = analyzer.analyze_aggregated("run-1", [snapshot(f"{i:02d}") for i in range(45)])
+
+    # 5 groups x 3 winners, then 2 groups x 3 winners, then the final group.
+    assert [len(ids) for ids in seen[5:7]] == [10, 5]
+    assert len(seen[7]) == 6
+    assert result["rounds"] == 3 and result["calls"] == 8
+
+
+def test_round_limit_stops_the_reduction():
+    seen, lock = [], threading.Lock()
+    analyzer = _make_analyzer(_rank_highest_ids(seen, lock))
+
+    with patch("worker.analyzer.AGGREGATED_MAX_ROUNDS", 2):
+        result = analyzer.analyze_aggregated("run-1", [snapshot(f"{i:02d}") for i in range(45)])
+
+    assert result["recommendations"] == []
+    assert result["error"] == "Too many ranking rounds"
+    assert result["rounds"] == 2 and result["calls"] == 7
+
+
+def test_round_that_keeps_every_candidate_fails():
+    seen, lock = [], threading.Lock()
+    analyzer = _make_analyzer(_recommend_everything(seen, lock))
+
+    with patch("worker.analyzer.AGGREGATED_WINNERS_PER_GROUP", 10):
+        result = analyzer.analyze_aggregated("run-1", [snapshot(f"{i:02d}") for i in range(45)])
+
+    assert result["error"] == "Ranking did not reduce candidates"
+    assert result["rounds"] == 1 and result["calls"] == 5
@@ -21,7 +21,7 @@ def test_analyzer_logic():
     with patch("worker.analyzer.get_settings") as mock_settings, \
          patch("worker.analyzer.OpenAI") as mock_openai, \
          patch("worker.analyzer.insert_score") as mock_insert_score, \
-         patch("worker.analyzer.get_last_score") as mock_get_last_score:
+         patch("worker.analyzer.get_last_scores") as mock_get_last_scores:
 
         # 1. Setup Mock Settings
         mock_settings.return_value.openai_api_key = "fake_key"
@@ -31,6 +31,7 @@ def test_analyzer_logic():
         # 2. Setup Mock OpenAI Response
         mock_client = MagicMock()
         mock_openai.return_value = mock_client
+        mock_client.with_options.return_value = mock_client
         
         mock_response = MagicMock()
         mock_response.choices = [
@@ -50,7 +51,7 @@ def test_analyzer_logic():
         mock_client.chat.completions.create.return_value = mock_response
 
         # 3. Setup Mock DB response for last score
-        mock_get_last_score.return_value = {"total_score": 70}
+        mock_get_last_scores.side_effect = lambda ids: {i: {"total_score": 70} for i in ids}
 
         # 4. Initialize Analyzer
         analyzer = Analyzer()
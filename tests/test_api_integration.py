@@ -3,7 +3,7 @@
 import pytest
 from fastapi.testclient import TestClient
 from main import app
-from unittest.mock import patch, MagicMock
+from unittest.mock import patch, AsyncMock, MagicMock
 from api.deps import verify_api_key
 
 client = TestClient(app)
@@ -21,11 +21,10 @@ def test_root_health_check():
     assert response.status_code == 200
     assert response.json()["status"] == "online"
 
-@patch("api.runs.insert_run")
-@patch("api.runs.run_scout")
-def test_start_run(mock_run_scout, mock_insert_run):
+@patch("api.runs.enqueue_run")
+def test_start_run(mock_enqueue_run):
     """Test starting a scout run with valid API key."""
-    mock_insert_run.return_value = "test-run-id"
+    mock_enqueue_run.return_value = "test-run-id"
     
     payload = {
         "run_type": "manual",
@@ -40,14 +39,33 @@ def test_start_run(mock_run_scout, mock_insert_run):
     
     assert response.status_code == 200
     assert response.json()["run_id"] == "test-run-id"
-    assert response.json()["status"] == "running"
+    assert response.json()["status"] == "queued"
+    # The API only enqueues; run parameters are stored for the queue worker.
+    mock_enqueue_run.assert_called_once_with(
+        "manual", {"keywords": ["test"]}, analysis_mode="aggregated", notify_discord=False
+    )
+
+@patch("api.runs.requeue_run")
+def test_resume_run(mock_requeue_run):
+    """Test resuming a failed run re-queues it and rejects other runs."""
+    mock_requeue_run.return_value = True
+    response = client.post("/v1/scout/runs/run-1/resume", headers={"X-API-KEY": TEST_API_KEY})
+    assert response.status_code == 200
+    assert response.json() == {"run_id": "run-1", "status": "queued"}
+    mock_requeue_run.assert_called_once_with("run-1")
 
-@patch("api.runs.get_supabase_client")
+    mock_requeue_run.return_value = False
+    response = client.post("/v1/scout/runs/run-2/resume", headers={"X-API-KEY": TEST_API_KEY})
+    assert response.status_code == 409
+
+@patch("db.async_queries.get_async_supabase_client", new_callable=AsyncMock)
 def test_get_run_status(mock_get_sb):
     """Test fetching run status with valid API key."""
     mock_sb = MagicMock()
     mock_get_sb.return_value = mock_sb
-    mock_sb.table.return_value.select.return_value.eq.return_value.execute.return_value.data = [
+    execute = AsyncMock()
+    mock_sb.table.return_value.select.return_value.eq.return_value.execute = execute
+    execute.return_value.data = [
         {
             "id": "test-run-id",
             "status": "success",
@@ -63,6 +81,32 @@ def test_get_run_status(mock_get_sb):
     )
     assert response.status_code == 200
     assert response.json()["status"] == "success"
+    execute.assert_awaited_once()
+
+    execute.return_value.data = []
+    response = client.get("/v1/scout/runs/missing", headers={"X-API-KEY": TEST_API_KEY})
+    assert response.status_code == 404
+
+def test_async_client_is_created_once_under_concurrent_first_use():
+    """Concurrent first requests share one async Supabase client."""
+    import asyncio
+    import db.client
+
+    async def slow_create(url, key):
+        await asyncio.sleep(0.01)
+        return MagicMock()
+
+    async def first_requests():
+        return await asyncio.gather(*(db.client.get_async_supabase_client() for _ in range(5)))
+
+    with patch("supabase.acreate_client", side_effect=slow_create) as mock_create, \
+            patch("db.client.get_settings"), patch.object(db.client, "_async_client", None), \
+            patch.object(db.client, "_async_client_lock", None):
+        # Importing db.client does not bind a lock outside this event loop.
+        clients = asyncio.run(first_requests())
+
+    mock_create.assert_called_once()
+    assert all(c is clients[0] for c in clients)
 
 @patch("api.pins.insert_pin")
 def test_add_pin(mock_insert_pin):
@@ -82,7 +126,7 @@ def test_add_pin(mock_insert_pin):
 @patch("api.commands.start_run")
 def test_handle_command_run(mock_start_run):
     """Test slash command /scout run with valid API key."""
-    mock_start_run.return_value = {"run_id": "cmd-run-id", "status": "running"}
+    mock_start_run.return_value = {"run_id": "cmd-run-id", "status": "queued"}
     
     payload = {"text": "/scout run VTuber Anime"}
     response = client.post(
@@ -0,0 +1,159 @@
+"""Unit tests for worker/async_collector.py."""
+
+import asyncio
+import time
+
+import httpx
+import pytest
+from unittest.mock import patch
+
+from worker.async_collector import AsyncYouTubeCollector
+from worker.quota import QuotaLedger
+
+
+@pytest.fixture(autouse=True)
+def mock_settings():
+    with patch("worker.async_collector.get_settings") as mock:
+        mock.return_value.youtube_api_key = "test"
+        mock.return_value.collector_concurrency = 2
+        mock.return_value.video_stage_enabled = False
+        yield mock
+
+
+def _channel_item(channel_id):
+    return {
+        "id": channel_id,
+        "snippet": {"title": f"Title {channel_id}"},
+        "statistics": {"subscriberCount": "1000", "viewCount": "5000", "videoCount": "10"},
+    }
+
+
+def make_transport(state):
+    async def handler(request: httpx.Request) -> httpx.Response:
+        state["in_flight"] += 1
+        state["max_in_flight"] = max(state["max_in_flight"], state["in_flight"])
+        try:
+            await asyncio.sleep(0.01)
+            if request.url.path.endswith("/search"):
+                keyword = request.url.params["q"]
+                items = [{"id": {"channelId": f"{keyword}-{i}"}} for i in range(30)]
+                return httpx.Response(200, json={"items": items})
+            if request.url.path.endswith("/channels"):
+                ids = request.url.params["id"].split(",")
+                state["chunk_sizes"].append(len(ids))
+                return httpx.Response(200, json={"items": [_channel_item(i) for i in ids]})
+            return httpx.Response(404)
+        finally:
+            state["in_flight"] -= 1
+
+    return httpx.MockTransport(handler)
+
+
+def test_collect_multiple_sources_fans_out_within_limit():
+    state = {"in_flight": 0, "max_in_flight": 0, "chunk_sizes": []}
+    quota = QuotaLedger(daily_budget=10000, persist=False)
+    collector = AsyncYouTubeCollector(transport=make_transport(state), quota=quota)
+
+    saved = []
+
+    def fake_save_entities(channels, errors, etag_cache=None):
+        saved.extend(channels)
+        return {c.channel_id: f"e-{c.channel_id}" for c in channels}, 0
+
+    with patch("worker.async_collector.save_entities", side_effect=fake_save_entities), \
+            patch("worker.async_collector.save_snapshots", side_effect=lambda r, c, ids, e: len(ids)):
+        result = collector.collect_multiple_sources("run-1", ["a", "b", "c", "d"], ["tracked-1"])
+
+    # Tracked IDs get their own chunk; 4 keywords x 30 results -> chunks of 50, 50, 20
+    assert result.entity_count == 121
+    assert result.snapshot_count == 121
+    assert sorted(state["chunk_sizes"]) == [1, 20, 50, 50]
+    assert {c.channel_id for c in saved} >= {"tracked-1", "a-0", "d-29"}
+    assert state["max_in_flight"] == 2
+    # 4 searches x 100 + 4 detail chunks x 1
+    assert quota.run_units == 404
+
+
+def test_writes_start_while_searches_are_in_flight():
+    events = []
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path.endswith("/search"):
+            keyword = request.url.params["q"]
+            await asyncio.sleep(0.3 if keyword == "slow" else 0.01)
+            events.append(f"search:{keyword}")
+            items = [{"id": {"channelId": f"{keyword}-{i}"}} for i in range(30)]
+            return httpx.Response(200, json={"items": items})
+        ids = request.url.params["id"].split(",")
+        return httpx.Response(200, json={"items": [_channel_item(i) for i in ids]})
+
+    collector = AsyncYouTubeCollector(
+        transport=httpx.MockTransport(handler),
+        quota=QuotaLedger(daily_budget=10000, persist=False),
+    )
+
+    def fake_save_entities(channels, errors, etag_cache=None):
+        events.append(f"save:{len(channels)}")
+        return {c.channel_id: f"e-{c.channel_id}" for c in channels}, 0
+
+    with patch("worker.async_collector.save_entities", side_effect=fake_save_entities), \
+            patch("worker.async_collector.save_snapshots", side_effect=lambda r, c, ids, e: len(ids)):
+        result = collector.collect_multiple_sources("run-1", ["slow", "a", "b"], [])
+
+    # The first 50 IDs from the fast searches are fetched and saved before "slow" returns.
+    assert events.index("save:50") < events.index("search:slow")
+    assert result.entity_count == 90
+
+
+def test_search_failure_is_isolated():
+    async def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path.endswith("/search"):
+            if request.url.params["q"] == "broken":
+                return httpx.Response(500)
+            return httpx.Response(200, json={"items": [{"id": {"channelId": "ok-1"}}]})
+        ids = request.url.params["id"].split(",")
+        return httpx.Response(200, json={"items": [_channel_item(i) for i in ids]})
+
+    collector = AsyncYouTubeCollector(
+        transport=httpx.MockTransport(handler),
+        quota=QuotaLedger(daily_budget=10000, persist=False),
+    )
+
+    async def run():
+        async with collector.session():
+            broken = await collector.search_channels("broken")
+            ok = await collector.search_channels("fine")
+            details = await collector.get_channel_details(ok)
+        return broken, ok, details
+
+    broken, ok, details = asyncio.run(run())
+    assert broken == []
+    assert ok == ["ok-1"]
+    assert details[0].subscriber_count == 1000
+
+
+def test_write_failure_fails_the_run_instead_of_hanging():
+    state = {"in_flight": 0, "max_in_flight": 0, "chunk_sizes": []}
+    collector = AsyncYouTubeCollector(
+        transport=make_transport(state),
+        quota=QuotaLedger(daily_budget=10000, persist=False),
+    )
+
+    def failing_save_entities(channels, errors, etag_cache=None):
+        # Let the fetch stage fill the bounded channel queue first.
+        time.sleep(0.2)
+        raise RuntimeError("database unavailable")
+
+    async def run():
+        return await asyncio.wait_for(
+            collector.collect_multiple_sources_async(
+                "run-1", ["a", "b"], [f"tracked-{i}" for i in range(200)]
+            ),
+            timeout=5,
+        )
+
+    with patch("worker.async_collector.save_entities", side_effect=failing_save_entities):
+        with pytest.raises(ExceptionGroup) as excinfo:
+            asyncio.run(run())
+
+    assert excinfo.group_contains(RuntimeError, match="database unavailable")
@@ -0,0 +1,163 @@
+"""Unit tests for worker/batch_analyzer.py against a fake Batch API endpoint."""
+
+import json
+
+import httpx
+import pytest
+from openai import OpenAI
+from unittest.mock import patch
+
+from worker.analyzer import Analyzer
+from worker.batch_analyzer import BatchAnalyzer
+from helpers import SCORE, snapshot
+
+
+def _batch(status, output_file_id=None):
+    return {
+        "id": "batch_1",
+        "object": "batch",
+        "endpoint": "/v1/chat/completions",
+        "input_file_id": "file_in",
+        "completion_window": "24h",
+        "status": status,
+        "output_file_id": output_file_id,
+        "error_file_id": None,
+        "created_at": 0,
+    }
+
+
+class FakeBatchApi:
+    """Minimal in-memory stand-in for the files and batches endpoints."""
+
+    def __init__(self, polls_until_done=2, expired_polls=0):
+        self.polls_until_done = polls_until_done
+        # Polls answered with "expired" (no output file) before the normal sequence.
+        self.expired_polls = expired_polls
+        self.polls = 0
+        self.uploaded = None
+        self.created = []
+
+    def handler(self, request: httpx.Request) -> httpx.Response:
+        path = request.url.path
+        if request.method == "POST" and path.endswith("/files"):
+            self.uploaded = request.content
+            return httpx.Response(200, json={
+                "id": "file_in", "object": "file", "bytes": 1, "created_at": 0,
+                "filename": "in.jsonl", "purpose": "batch", "status": "processed",
+            })
+        if request.method == "POST" and path.endswith("/batches"):
+            self.created.append(json.loads(request.content))
+            return httpx.Response(200, json=_batch("validating"))
+        if request.method == "GET" and path.endswith("/batches/batch_1"):
+            if self.expired_polls:
+                self.expired_polls -= 1
+                return httpx.Response(200, json=_batch("expired"))
+            self.polls += 1
+            if self.polls < self.polls_until_done:
+                return httpx.Response(200, json=_batch("in_progress"))
+            return httpx.Response(200, json=_batch("completed", "file_out"))
+        if request.method == "GET" and path.endswith("/files/file_out/content"):
+            return httpx.Response(200, text=self.output())
+        return httpx.Response(404)
+
+    def output(self):
+        lines = []
+        for i in range(3):
+            body = {"choices": [{"message": {"content": json.dumps(SCORE)}}]}
+            if i == 2:
+                body = {"choices": [{"message": {"content": "{\"summary\": \"broken\"}"}}]}
+            lines.append(json.dumps({
+                "custom_id": f"e-{i}",
+                "response": {"status_code": 200, "body": body},
+                "error": None,
+            }))
+        return "\n".join(lines)
+
+
+@pytest.fixture
+def fake_api():
+    return FakeBatchApi()
+
+
+@pytest.fixture
+def analyzer(fake_api):
+    def make_client(api_key, base_url=None):
+        return OpenAI(
+            api_key=api_key,
+            base_url="http://openai.test/v1",
+            http_client=httpx.Client(transport=httpx.MockTransport(fake_api.handler)),
+        )
+
+    with patch("worker.analyzer.get_settings") as mock_settings, \
+            patch("worker.analyzer.OpenAI", side_effect=make_client):
+        mock_settings.return_value.openai_api_key = "test"
+        mock_settings.return_value.openai_model = "gpt-4o-mini"
+        mock_settings.return_value.batch_size = 2
+        yield Analyzer()
+
+
+def test_batch_mode_submits_polls_and_ingests(fake_api, analyzer):
+    with patch("worker.batch_analyzer.get_analysis_batch", return_value=None), \
+            patch("worker.batch_analyzer.insert_analysis_batch") as mock_insert_batch, \
+            patch("worker.batch_analyzer.update_analysis_batch") as mock_update_batch, \
+            patch("worker.analyzer.insert_score") as mock_insert_score, \
+            patch("worker.analyzer.get_last_scores",
+                  side_effect=lambda ids: {i: {"total_score": 70} for i in ids}):
+        mock_insert_batch.return_value = {"openai_batch_id": "batch_1", "request_count": 3}
+        batch_analyzer = BatchAnalyzer(analyzer, poll_interval=0)
+        errors = batch_analyzer.run("run-1", [snapshot(i) for i in range(3)])
+
+    # One JSONL line per snapshot, custom_id = entity_id, same request body as call_gpt.
+    lines = [json.loads(line) for line in fake_api.uploaded.decode().splitlines() if line.startswith("{")]
+    assert [line["custom_id"] for line in lines] == ["e-0", "e-1", "e-2"]
+    assert lines[0]["body"]["model"] == "gpt-4o-mini"
+    assert fake_api.created[0]["endpoint"] == "/v1/chat/completions"
+
+    assert mock_insert_batch.call_args.kwargs["openai_batch_id"] == "batch_1"
+    assert fake_api.polls == 2
+    # The invalid result fails ScoreOutput validation and is reported per entity.
+    assert len(errors) == 1 and "entity_id=e-2" in errors[0]
+    assert mock_insert_score.call_count == 2
+    assert mock_insert_score.call_args.kwargs["score_data"]["score_delta"] == 8
+    assert "ingested_at" in mock_update_batch.call_args[0][1]
+    assert batch_analyzer.summary()["resumed"] is False
+
+
+def test_batch_mode_resumes_existing_batch(fake_api, analyzer):
+    existing = {"openai_batch_id": "batch_1", "request_count": 3, "ingested_at": None}
+    with patch("worker.batch_analyzer.get_analysis_batch", return_value=existing), \
+            patch("worker.batch_analyzer.insert_analysis_batch") as mock_insert_batch, \
+            patch("worker.batch_analyzer.update_analysis_batch"), \
+            patch("worker.analyzer.insert_score") as mock_insert_score, \
+            patch("worker.analyzer.get_last_scores", return_value={}):
+        batch_analyzer = BatchAnalyzer(analyzer, poll_interval=0)
+        batch_analyzer.run("run-1", [snapshot(i) for i in range(3)])
+
+    # No new upload or batch; the stored batch is polled and ingested.
+    assert fake_api.uploaded is None
+    mock_insert_batch.assert_not_called()
+    assert mock_insert_score.call_count == 2
+    assert batch_analyzer.summary()["resumed"] is True
+
+
+def test_resumed_batch_that_expired_is_resubmitted(fake_api, analyzer):
+    fake_api.expired_polls = 1
+    fake_api.polls_until_done = 1
+    existing = {"openai_batch_id": "batch_1", "request_count": 3, "ingested_at": None}
+    with patch("worker.batch_analyzer.get_analysis_batch", return_value=existing), \
+            patch("worker.batch_analyzer.insert_analysis_batch") as mock_insert_batch, \
+            patch("worker.batch_analyzer.update_analysis_batch"), \
+            patch("worker.analyzer.insert_score") as mock_insert_score, \
+            patch("worker.analyzer.get_last_scores", return_value={}):
+        mock_insert_batch.return_value = {"openai_batch_id": "batch_1", "request_count": 3}
+        batch_analyzer = BatchAnalyzer(analyzer, poll_interval=0)
+        errors = batch_analyzer.run("run-1", [snapshot(i) for i in range(3)])
+
+    # The expired batch is replaced by a new submission, which completes and is ingested.
+    assert fake_api.uploaded is not None
+    mock_insert_batch.assert_called_once()
+    assert mock_insert_score.call_count == 2
+    assert len(errors) == 1 and "entity_id=e-2" in errors[0]
+    summary = batch_analyzer.summary()
+    assert summary["status"] == "completed"
+    assert summary["replaced_batch_id"] == "batch_1"
@@ -0,0 +1,93 @@
+"""Unit tests for bulk entity/snapshot writes."""
+
+import pytest
+from unittest.mock import patch, MagicMock
+
+from db.queries import upsert_entities_bulk, insert_snapshots_bulk
+from models.schemas import YouTubeChannel
+from worker.collector import save_channels
+
+
+def _echo_upsert(sb):
+    """Make table().upsert(rows).execute() return the rows with generated ids."""
+
+    def upsert(rows, on_conflict=None):
+        query = MagicMock()
+        query.execute.return_value.data = [
+            {"id": f"uuid-{row['platform_id']}", **row} for row in rows
+        ]
+        return query
+
+    sb.table.return_value.upsert.side_effect = upsert
+
+
+@patch("db.queries.get_supabase_client")
+def test_upsert_entities_bulk_groups_by_columns(mock_get_sb):
+    sb = MagicMock()
+    mock_get_sb.return_value = sb
+    _echo_upsert(sb)
+
+    result = upsert_entities_bulk(
+        "youtube",
+        [
+            {"platform_id": "c1", "channel_title": "One"},
+            {"platform_id": "c2", "channel_title": "Two"},
+            {"platform_id": "c3", "channel_title": "Three", "country": "US"},
+            {"platform_id": "c1", "channel_title": "One (dup)"},
+        ],
+    )
+
+    assert result == {"c1": "uuid-c1", "c2": "uuid-c2", "c3": "uuid-c3"}
+    # Rows with and without country must not share a request (nulls would overwrite).
+    assert sb.table.return_value.upsert.call_count == 2
+    for call in sb.table.return_value.upsert.call_args_list:
+        rows = call.args[0]
+        assert len({frozenset(r) for r in rows}) == 1
+        assert call.kwargs["on_conflict"] == "platform,platform_id"
+
+
+@patch("db.queries.get_supabase_client")
+def test_insert_snapshots_bulk_chunks(mock_get_sb):
+    sb = MagicMock()
+    mock_get_sb.return_value = sb
+
+    def insert(rows):
+        query = MagicMock()
+        query.execute.return_value.data = [
+            {"id": f"snap-{row['entity_id']}", **row} for row in rows
+        ]
+        return query
+
+    sb.table.return_value.insert.side_effect = insert
+
+    rows = [{"entity_id": f"e{i}", "subscriber_count": i} for i in range(1200)]
+    result = insert_snapshots_bulk("run-1", rows)
+
+    assert len(result) == 1200
+    sizes = [len(c.args[0]) for c in sb.table.return_value.insert.call_args_list]
+    assert sizes == [500, 500, 200]
+    assert all(r["run_id"] == "run-1" for c in sb.table.return_value.insert.call_args_list for r in c.args[0])
+
+
+@patch("worker.collector.insert_snapshot")
+@patch("worker.collector.upsert_entity")
+@patch("worker.collector.insert_snapshots_bulk")
+@patch("worker.collector.upsert_entities_bulk")
+def test_save_channels_falls_back_to_per_row_errors(
+    mock_bulk_entities, mock_bulk_snapshots, mock_upsert_entity, mock_insert_snapshot
+):
+    channels = [YouTubeChannel(channel_id=f"c{i}", title=f"T{i}") for i in range(3)]
+
+    mock_bulk_entities.side_effect = RuntimeError("batch rejected")
+    mock_upsert_entity.side_effect = ["uuid-0", RuntimeError("bad row"), "uuid-2"]
+    mock_bulk_snapshots.return_value = {"uuid-0": "s0", "uuid-2": "s2"}
+
+    result = save_channels("run-1", channels)
+
+    assert result.entity_count == 2
+    assert result.snapshot_count == 2
+    assert len(result.errors) == 1
+    assert "c1" in result.errors[0]
+    snapshot_rows = mock_bulk_snapshots.call_args.args[1]
+    assert [r["entity_id"] for r in snapshot_rows] == ["uuid-0", "uuid-2"]
+    mock_insert_snapshot.assert_not_called()
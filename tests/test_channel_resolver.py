@@ -0,0 +1,65 @@
+"""Unit tests for discovery handle/name resolution."""
+
+import pytest
+from unittest.mock import patch, MagicMock
+
+from worker.channel_index import ChannelIndex, plan_discovery_lookups
+from worker.collector import YouTubeCollector
+from worker.quota import QuotaLedger
+
+
+def test_plan_discovery_lookups_normalizes_and_dedups():
+    lookups = plan_discovery_lookups([
+        {"name": "Creator A", "handle": "@CreatorA"},
+        {"name": "Creator A again", "handle": "@creatora"},
+        {"name": "Bare Name", "handle": "@handle (分かれば)"},
+        {"name": "", "handle": None},
+    ])
+
+    assert [(l.handle, l.name) for l in lookups] == [
+        ("@creatora", "Creator A"),
+        (None, "Bare Name"),
+    ]
+
+
+@patch("worker.channel_index.upsert_channel_index")
+@patch("worker.channel_index.get_channel_index")
+def test_resolve_prefers_index_then_handle_then_search(mock_get_index, mock_upsert_index):
+    mock_get_index.return_value = {"handle:@known": "UC-known"}
+
+    with patch("worker.collector.build") as mock_build, patch("worker.collector.get_settings"):
+        youtube = mock_build.return_value
+        youtube.channels.return_value.list.return_value.execute.return_value = {
+            "items": [{"id": "UC-handle"}]
+        }
+        youtube.search.return_value.list.return_value.execute.return_value = {
+            "items": [{"id": {"channelId": "UC-search"}}]
+        }
+        quota = QuotaLedger(daily_budget=10000, persist=False)
+        index = ChannelIndex()
+        collector = YouTubeCollector(quota=quota, channel_index=index)
+
+        resolved = collector.resolve_discovered_channels([
+            {"name": "Known", "handle": "@known"},
+            {"name": "Fresh", "handle": "@Fresh"},
+            {"name": "Only A Name"},
+        ])
+
+    assert resolved == ["UC-known", "UC-handle", "UC-search"]
+    youtube.channels.return_value.list.assert_called_once_with(forHandle="@fresh", part="id")
+    youtube.search.return_value.list.assert_called_once_with(
+        q="Only A Name", type="channel", part="id", maxResults=1
+    )
+    # 1 handle lookup (1 unit) + 1 search (100 units)
+    assert quota.run_units == 101
+    assert index.summary() == {
+        "index_hits": 1,
+        "handle_lookups": 1,
+        "handle_resolved": 1,
+        "search_fallbacks": 1,
+        "unresolved": 0,
+    }
+
+    stored = {row["lookup_key"]: row for row in mock_upsert_index.call_args.args[0]}
+    assert stored["handle:@fresh"]["channel_id"] == "UC-handle"
+    assert stored["name:only a name"]["source"] == "search"
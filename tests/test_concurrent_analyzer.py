@@ -0,0 +1,121 @@
+"""Unit tests for concurrent scoring in worker/analyzer.py."""
+
+import json
+import threading
+import time
+
+import httpx
+import pytest
+from openai import OpenAI
+from unittest.mock import patch
+
+from worker.analyzer import Analyzer
+from worker.rate_limit import parse_reset_seconds, retry_delay
+from helpers import SCORE, completion, snapshot
+
+
+def test_parse_reset_seconds_and_retry_delay():
+    assert parse_reset_seconds("20ms") == pytest.approx(0.02)
+    assert parse_reset_seconds("6m0s") == 360
+    assert parse_reset_seconds("1.5s") == 1.5
+    assert parse_reset_seconds("") is None
+
+    assert retry_delay({"retry-after-ms": "250"}, 0) == 0.25
+    assert retry_delay({"retry-after": "2"}, 0) == 2
+    headers = {
+        "x-ratelimit-remaining-requests": "10",
+        "x-ratelimit-reset-requests": "1s",
+        "x-ratelimit-remaining-tokens": "0",
+        "x-ratelimit-reset-tokens": "3s",
+    }
+    assert retry_delay(headers, 0) == 3
+    assert 4 <= retry_delay({}, 2) <= 5
+
+
+def test_analyze_batch_runs_concurrently_and_backs_off_on_429():
+    state = {"in_flight": 0, "max_in_flight": 0, "requests": 0, "limited_prompt": None, "retry_gap": None}
+    lock = threading.Lock()
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        prompt = json.loads(request.content)["messages"][1]["content"]
+        with lock:
+            state["requests"] += 1
+            first = state["requests"] == 1
+            state["in_flight"] += 1
+            state["max_in_flight"] = max(state["max_in_flight"], state["in_flight"])
+            if first:
+                state["limited_prompt"] = prompt
+            elif prompt == state["limited_prompt"] and state["retry_gap"] is None:
+                state["retry_gap"] = time.monotonic() - state["rate_limited_at"]
+        try:
+            time.sleep(0.02)
+            if first:
+                with lock:
+                    state["rate_limited_at"] = time.monotonic()
+                return httpx.Response(429, headers={"retry-after-ms": "100"}, json={"error": {"message": "slow down"}})
+            if "Creator 3" in prompt:
+                return httpx.Response(200, json=completion("not json"))
+            return httpx.Response(200, json=completion(json.dumps(SCORE)))
+        finally:
+            with lock:
+                state["in_flight"] -= 1
+
+    def make_client(api_key, base_url=None):
+        return OpenAI(
+            api_key=api_key,
+            base_url="http://openai.test/v1",
+            http_client=httpx.Client(transport=httpx.MockTransport(handler)),
+        )
+
+    with patch("worker.analyzer.get_settings") as mock_settings, \
+            patch("worker.analyzer.OpenAI", side_effect=make_client), \
+            patch("worker.analyzer.insert_score") as mock_insert, \
+            patch("worker.analyzer.get_last_scores", return_value={}):
+        mock_settings.return_value.openai_api_key = "test"
+        mock_settings.return_value.openai_model = "gpt-4o-mini"
+        mock_settings.return_value.batch_size = 4
+
+        analyzer = Analyzer()
+        errors = analyzer.analyze_batch("run-1", [snapshot(i) for i in range(8)])
+
+    # Creator 3 returns invalid JSON twice; every other entity is saved.
+    assert len(errors) == 1 and "entity_id=e-3" in errors[0]
+    assert mock_insert.call_count == 7
+    assert state["max_in_flight"] > 1
+    assert analyzer.rate_limits.summary()["rate_limited"] == 1
+    # The rate-limited request was retried only after the retry-after-ms window.
+    assert state["retry_gap"] >= 0.09
+
+
+def test_server_errors_are_retried_per_request():
+    statuses = iter([503, 500])
+    requests = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        status = next(statuses, 200)
+        if status != 200:
+            return httpx.Response(status, headers={"retry-after-ms": "10"}, json={"error": {"message": "oops"}})
+        return httpx.Response(200, json=completion(json.dumps(SCORE)))
+
+    def make_client(api_key, base_url=None):
+        return OpenAI(
+            api_key=api_key,
+            base_url="http://openai.test/v1",
+            http_client=httpx.Client(transport=httpx.MockTransport(handler)),
+        )
+
+    with patch("worker.analyzer.get_settings") as mock_settings, \
+            patch("worker.analyzer.OpenAI", side_effect=make_client):
+        mock_settings.return_value.openai_api_key = "test"
+        mock_settings.return_value.openai_model = "gpt-4o-mini"
+        mock_settings.return_value.batch_size = 1
+
+        analyzer = Analyzer()
+        score = analyzer.call_gpt("prompt")
+
+    assert score.demand_match == 25
+    assert len(requests) == 3
+    # Server errors do not pause the other workers.
+    assert analyzer.rate_limits.summary()["rate_limited"] == 0
+    assert analyzer.usage.summary()["analysis"]["retries"] == 2
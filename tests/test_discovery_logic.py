@@ -1,4 +1,8 @@
 
+import json
+import threading
+import time
+
 import pytest
 from unittest.mock import MagicMock, patch
 from worker.discovery import DiscoveryWorker
@@ -9,12 +13,25 @@ def mock_settings():
         settings = MagicMock()
         settings.openai_api_key = "test_key"
         settings.openai_search_model = "gpt-4o-search-preview"
+        settings.discovery_concurrency = 4
+        settings.discovery_keywords_per_request = 1
+        settings.discovery_cache_enabled = True
         mock.return_value = settings
         yield settings
 
+@pytest.fixture(autouse=True)
+def mock_cache():
+    with patch("worker.discovery.get_discovery_cache", return_value={}) as get_cache, \
+            patch("worker.discovery.upsert_discovery_cache") as put_cache:
+        yield get_cache, put_cache
+
+def _response(items):
+    return MagicMock(choices=[MagicMock(message=MagicMock(content=json.dumps({"discovered_channels": items})))])
+
 def test_discovery_worker_discover_native(mock_settings):
     with patch("worker.discovery.OpenAI") as mock_openai:
         mock_client = mock_openai.return_value
+        mock_client.with_options.return_value = mock_client
         # Mock single LLM call with search results
         mock_client.chat.completions.create.return_value.choices = [
             MagicMock(message=MagicMock(content=
@@ -32,3 +49,49 @@ def test_discovery_worker_discover_native(mock_settings):
         # Verify call parameters (model selection)
         args, kwargs = mock_client.chat.completions.create.call_args
         assert kwargs["model"] == "gpt-4o-search-preview"
+
+def test_discovery_fans_out_per_keyword_with_cache_and_dedup(mock_settings, mock_cache):
+    get_cache, put_cache = mock_cache
+    # "cached kw" was already searched today.
+    get_cache.return_value = {"cached kw": [{"name": "Cached", "handle": "@cached"}]}
+
+    state = {"in_flight": 0, "max_in_flight": 0}
+    lock = threading.Lock()
+
+    def create(**kwargs):
+        prompt = kwargs["messages"][1]["content"]
+        with lock:
+            state["in_flight"] += 1
+            state["max_in_flight"] = max(state["max_in_flight"], state["in_flight"])
+        time.sleep(0.05)
+        with lock:
+            state["in_flight"] -= 1
+        if "alpha" in prompt:
+            return _response([{"name": "A", "handle": "@Shared"}, {"name": "Only A", "handle": None}])
+        if "beta" in prompt:
+            return _response([{"name": "B", "handle": "@shared"}, {"name": "Cached", "handle": "@cached"}])
+        raise RuntimeError("search failed")
+
+    with patch("worker.discovery.OpenAI") as mock_openai:
+        mock_openai.return_value.with_options.return_value = mock_openai.return_value
+        mock_openai.return_value.chat.completions.create.side_effect = create
+        dw = DiscoveryWorker()
+        results = dw.discover(["alpha", "beta", "Cached  KW", "broken"])
+
+    # Handles are deduplicated case-insensitively across keywords.
+    assert [r["name"] for r in results] == ["A", "Only A", "Cached"]
+    assert mock_openai.return_value.chat.completions.create.call_count == 3
+    assert state["max_in_flight"] > 1
+
+    stats = dw.summary()
+    assert stats["requests"] == 2
+    assert stats["cache_hits"] == 1
+    assert stats["keywords"]["alpha"]["yield"] == 2
+    # Yield credits the first keyword (in input order) to find a channel.
+    assert stats["keywords"]["beta"]["yield"] == 1
+    assert stats["keywords"]["cached kw"]["yield"] == 0
+    assert stats["keywords"]["broken"]["failed"] is True
+
+    # Only successful fresh searches are cached.
+    stored = put_cache.call_args[0][0]
+    assert sorted(row["query_key"] for row in stored) == ["alpha", "beta"]
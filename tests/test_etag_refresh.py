@@ -0,0 +1,94 @@
+"""Unit tests for conditional (ETag) tracked-channel refreshes."""
+
+import asyncio
+
+import httpx
+import pytest
+from unittest.mock import patch
+
+from models.schemas import YouTubeChannel
+from worker.async_collector import AsyncYouTubeCollector
+from worker.collector import save_channels
+from worker.etag_cache import EtagCache, chunk_cache_key
+from worker.quota import QuotaLedger
+
+
+def _item(channel_id, etag, subs="1000"):
+    return {
+        "id": channel_id,
+        "etag": etag,
+        "snippet": {"title": channel_id},
+        "statistics": {"subscriberCount": subs, "viewCount": "1", "videoCount": "1"},
+    }
+
+
+@pytest.fixture
+def etag_cache():
+    cache = EtagCache()
+    chunk = ["UC-a", "UC-b"]
+    with patch("worker.etag_cache.get_entity_etags") as mock_entities, \
+            patch("worker.etag_cache.get_request_etags") as mock_requests:
+        mock_entities.return_value = {
+            "UC-a": {"id": "uuid-a", "etag": "item-a"},
+            "UC-b": {"id": "uuid-b", "etag": "item-b-old"},
+        }
+        mock_requests.return_value = {
+            chunk_cache_key(chunk): {
+                "etag": "resp-1",
+                "items": [_item("UC-a", "item-a", "1111"), _item("UC-b", "item-b-old")],
+            }
+        }
+        yield cache
+
+
+def test_not_modified_replays_cached_items(etag_cache):
+    seen_headers = []
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        seen_headers.append(request.headers.get("If-None-Match"))
+        return httpx.Response(304)
+
+    with patch("worker.async_collector.get_settings") as mock_settings:
+        mock_settings.return_value.collector_concurrency = 4
+        collector = AsyncYouTubeCollector(
+            transport=httpx.MockTransport(handler),
+            quota=QuotaLedger(daily_budget=10000, persist=False),
+            etag_cache=etag_cache,
+        )
+
+    async def run():
+        async with collector.session():
+            return await collector.refresh_tracked_channels(["UC-b", "UC-a"])
+
+    channels = asyncio.run(run())
+
+    assert seen_headers == ["resp-1"]
+    assert {c.channel_id: c.subscriber_count for c in channels} == {"UC-a": 1111, "UC-b": 1000}
+    summary = etag_cache.summary()
+    assert summary["conditional_requests"] == 1
+    assert summary["not_modified"] == 1
+    assert summary["not_modified_rate"] == 1.0
+    assert summary["bytes_saved"] > 0
+
+
+@patch("worker.collector.insert_snapshots_bulk")
+@patch("worker.collector.upsert_entities_bulk")
+def test_unchanged_items_skip_entity_upsert(mock_upsert, mock_snapshots, etag_cache):
+    etag_cache.prepare(["UC-a", "UC-b"])
+    channels = [
+        YouTubeChannel(channel_id="UC-a", title="A", etag="item-a"),
+        YouTubeChannel(channel_id="UC-b", title="B", etag="item-b-new"),
+        YouTubeChannel(channel_id="UC-new", title="New", etag="item-new"),
+    ]
+    mock_upsert.return_value = {"UC-b": "uuid-b", "UC-new": "uuid-new"}
+    mock_snapshots.return_value = {"uuid-a": "s1", "uuid-b": "s2", "uuid-new": "s3"}
+
+    result = save_channels("run-1", channels, etag_cache)
+
+    upserted = [row["platform_id"] for row in mock_upsert.call_args.args[1]]
+    assert upserted == ["UC-b", "UC-new"]
+    assert mock_upsert.call_args.args[1][0]["etag"] == "item-b-new"
+    assert result.entity_count == 3
+    assert result.snapshot_count == 3
+    assert result.entity_upserts_skipped == 1
+    assert etag_cache.summary()["upsert_skip_rate"] == 0.5
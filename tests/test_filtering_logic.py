@@ -58,3 +58,45 @@ def test_should_analyze_last_score():
     }
     should, reason = should_analyze(snapshot, last_score, settings)
     assert should is True
+
+def test_filter_snapshots_fetches_last_scores_once():
+    from unittest.mock import patch
+    from worker.context import RunContext
+    from worker.orchestrator import filter_snapshots
+
+    settings = MockSettings()
+    snapshots = [
+        {"entity_id": "e-new", "subscribers": 1000, "upload_freq_days": 5},
+        {"entity_id": "e-recent-normal", "subscribers": 1000, "upload_freq_days": 5},
+        {"entity_id": "e-small", "subscribers": 10, "upload_freq_days": 5},
+    ]
+    last_scores = {
+        "e-recent-normal": {
+            "total_score": 50,
+            "category": "normal",
+            "created_at": (datetime.now() - timedelta(days=2)).isoformat(),
+        },
+    }
+
+    with patch("worker.context.get_snapshots_by_run", return_value=snapshots), \
+            patch("worker.context.get_last_scores", return_value=last_scores) as mock_get:
+        context = RunContext("run-1")
+        to_analyze, skipped = filter_snapshots(context, "smart", settings)
+        # The Analyzer's score delta reads the same memo.
+        with patch("worker.analyzer.get_settings") as mock_settings, patch("worker.analyzer.OpenAI"):
+            mock_settings.return_value.batch_size = 5
+            from worker.analyzer import Analyzer
+            assert Analyzer(context).calc_score_delta("e-recent-normal", 62) == 12
+
+    mock_get.assert_called_once()
+    assert sorted(mock_get.call_args[0][0]) == ["e-new", "e-recent-normal", "e-small"]
+    assert [s["entity_id"] for s in to_analyze] == ["e-new"]
+    assert skipped == 2
+    assert context.summary() == {"queries": 2}
+
+    # Batch mode analyzes everything without a score lookup.
+    with patch("worker.context.get_snapshots_by_run", return_value=snapshots), \
+            patch("worker.context.get_last_scores") as mock_get:
+        to_analyze, skipped = filter_snapshots(RunContext("run-2"), "batch", settings)
+    mock_get.assert_not_called()
+    assert len(to_analyze) == 3 and skipped == 0
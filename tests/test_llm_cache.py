@@ -0,0 +1,80 @@
+"""Unit tests for worker/llm_cache.py."""
+
+import json
+from datetime import datetime, timedelta, timezone
+
+from unittest.mock import MagicMock, patch
+
+from models.schemas import ScoreInput
+from worker.analyzer import Analyzer
+from worker.llm_cache import LlmCache, bucket_count
+from helpers import SCORE, snapshot
+
+
+def test_bucket_count():
+    assert bucket_count(123456) == 120000
+    assert bucket_count(99) == 99
+    assert bucket_count(0) == 0
+    assert bucket_count(None) is None
+
+
+def test_cache_hits_skip_openai_and_misses_are_stored():
+    with patch("worker.analyzer.get_settings") as mock_settings, \
+            patch("worker.analyzer.OpenAI") as mock_openai, \
+            patch("worker.analyzer.insert_score") as mock_insert, \
+            patch("worker.analyzer.get_last_scores", return_value={}):
+        mock_settings.return_value.openai_model = "gpt-4o-mini"
+        mock_settings.return_value.batch_size = 2
+        client = mock_openai.return_value
+        client.with_options.return_value = client
+        response = MagicMock()
+        response.choices = [MagicMock(message=MagicMock(content=json.dumps(SCORE)))]
+        response.usage.prompt_tokens = 300
+        response.usage.completion_tokens = 120
+        client.chat.completions.create.return_value = response
+
+        cache = LlmCache(ttl=timedelta(days=14), max_entries=100)
+        analyzer = Analyzer(llm_cache=cache)
+
+        # "cached" was scored before at 10,400 subscribers: same bucket as 10,499 now.
+        cached_key = analyzer.cache_key(ScoreInput.model_validate(snapshot("cached", 10400)))
+        stale_key = analyzer.cache_key(ScoreInput.model_validate(snapshot("stale", 5000)))
+        now = datetime.now(timezone.utc)
+        stored = {
+            cached_key: {
+                "cache_key": cached_key, "output": SCORE, "prompt_tokens": 310, "completion_tokens": 110,
+                "created_at": now.isoformat(),
+            },
+            stale_key: {
+                "cache_key": stale_key, "output": SCORE, "prompt_tokens": 310, "completion_tokens": 110,
+                "created_at": (now - timedelta(days=30)).isoformat(),
+            },
+        }
+
+        with patch("worker.llm_cache.get_llm_cache", return_value=stored), \
+                patch("worker.llm_cache.upsert_llm_cache") as mock_upsert, \
+                patch("worker.llm_cache.evict_llm_cache", return_value=3) as mock_evict:
+            errors = analyzer.analyze_batch("run-1", [
+                snapshot("cached", 10499),
+                snapshot("stale", 5000),
+                snapshot("new", 777),
+            ])
+
+    assert errors == []
+    assert mock_insert.call_count == 3
+    # Only the stale (expired) and new entries called OpenAI.
+    assert client.chat.completions.create.call_count == 2
+
+    rows = mock_upsert.call_args[0][0]
+    assert len(rows) == 2
+    assert {r["prompt_tokens"] for r in rows} == {300}
+    mock_evict.assert_called_once_with(336, 100)
+
+    assert cache.summary() == {
+        "hits": 1,
+        "misses": 2,
+        "hit_rate": 0.333,
+        "saved_prompt_tokens": 310,
+        "saved_completion_tokens": 110,
+        "evicted": 3,
+    }
@@ -0,0 +1,127 @@
+"""Unit tests for per-call OpenAI usage and latency recording."""
+
+import json
+
+import httpx
+from openai import OpenAI
+from unittest.mock import patch
+
+from worker.analyzer import Analyzer
+from worker.llm_usage import LlmUsage
+from worker.metrics import LLM_CALLS, LLM_PROMPT_TOKENS, LLM_RETRIES, LLM_TOKENS
+from helpers import SCORE, completion, snapshot
+
+
+def test_usage_is_recorded_per_stage_with_retries():
+    calls = {"n": 0}
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls["n"] += 1
+        messages = json.loads(request.content)["messages"]
+        if messages[0]["content"] == "あなたは市場アナリストです。":
+            return httpx.Response(200, json=completion("A, B, C", 200))
+        if calls["n"] == 1:
+            # Invalid output is retried once by call_gpt.
+            return httpx.Response(200, json=completion("{}", 300))
+        return httpx.Response(200, json=completion(json.dumps(SCORE), 300, cached_tokens=128))
+
+    def make_client(api_key, base_url=None):
+        return OpenAI(
+            api_key=api_key,
+            base_url="http://openai.test/v1",
+            http_client=httpx.Client(transport=httpx.MockTransport(handler)),
+        )
+
+    with patch("worker.analyzer.get_settings") as mock_settings, \
+            patch("worker.analyzer.OpenAI", side_effect=make_client), \
+            patch("worker.analyzer.time.sleep"), \
+            patch("worker.analyzer.get_scores_by_run",
+                  return_value=[{"display_name": "C1", "total_score": 90, "score_delta": 5}]):
+        mock_settings.return_value.openai_api_key = "test"
+        mock_settings.return_value.openai_model = "gpt-usage-test"
+        mock_settings.return_value.batch_size = 1
+        mock_settings.return_value.prompt_token_budget = 3000
+        usage = LlmUsage()
+        analyzer = Analyzer(usage=usage)
+        prompt_count_before = sum(
+            sum(counts) for counts, _ in LLM_PROMPT_TOKENS.values.values()
+        )
+
+        analyzer.call_gpt("prompt")
+        analyzer.extract_trends("run-1")
+
+    summary = usage.summary()
+    analysis = summary["analysis"]
+    assert analysis["calls"] == 2
+    assert analysis["retries"] == 1
+    assert analysis["failed"] == 0
+    assert analysis["prompt_tokens"] == 600
+    assert analysis["completion_tokens"] == 80
+    assert analysis["cached_tokens"] == 128
+    assert analysis["models"] == ["gpt-usage-test"]
+    assert analysis["max_latency_ms"] <= analysis["latency_ms"]
+
+    assert summary["trends"]["calls"] == 1
+    assert summary["trends"]["prompt_tokens"] == 200
+
+    # Process-wide histograms and counters see the same calls.
+    prompt_count_after = sum(sum(counts) for counts, _ in LLM_PROMPT_TOKENS.values.values())
+    assert prompt_count_after - prompt_count_before == 3
+    # Each attempt is one call with one outcome; retries are counted separately.
+    assert LLM_CALLS.values[("analysis", "gpt-usage-test", "ok")] == 2
+    assert ("analysis", "gpt-usage-test", "retry") not in LLM_CALLS.values
+    assert LLM_RETRIES.values[("analysis", "gpt-usage-test")] == 1
+    assert LLM_TOKENS.values[("analysis", "gpt-usage-test", "cached")] == 128
+
+
+def test_failed_call_is_counted_and_reraised():
+    class FailingClient:
+        class chat:
+            class completions:
+                @staticmethod
+                def create(**params):
+                    raise RuntimeError("boom")
+
+    usage = LlmUsage()
+    try:
+        usage.complete("discovery", FailingClient, model="search-model")
+    except RuntimeError:
+        pass
+
+    stats = usage.summary()["discovery"]
+    assert stats["calls"] == 1 and stats["failed"] == 1
+    assert stats["prompt_tokens"] == 0
+
+
+def test_rate_limited_aggregation_call_is_retried_and_counted():
+    statuses = iter([429])
+    recommendations = {"recommendations": [{"rank": 1, "name": "Creator 1", "id": "e-1"}]}
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if next(statuses, 200) == 429:
+            return httpx.Response(429, headers={"retry-after-ms": "10"}, json={"error": {"message": "slow down"}})
+        return httpx.Response(200, json=completion(json.dumps(recommendations), 100))
+
+    def make_client(api_key, base_url=None):
+        return OpenAI(
+            api_key=api_key,
+            base_url="http://openai.test/v1",
+            http_client=httpx.Client(transport=httpx.MockTransport(handler)),
+        )
+
+    with patch("worker.analyzer.get_settings") as mock_settings, \
+            patch("worker.analyzer.OpenAI", side_effect=make_client):
+        mock_settings.return_value.openai_api_key = "test"
+        mock_settings.return_value.openai_model = "gpt-usage-test"
+        mock_settings.return_value.batch_size = 1
+        mock_settings.return_value.prompt_token_budget = 3000
+        analyzer = Analyzer()
+        result = analyzer.analyze_aggregated("run-1", [snapshot(i) for i in range(2)])
+
+    assert result["recommendations"][0]["id"] == "e-1"
+    # The SDK does not retry on its own, so the 429 shows up as a counted retry.
+    aggregation = analyzer.usage.summary()["aggregation"]
+    assert aggregation["calls"] == 2
+    assert aggregation["failed"] == 1
+    assert aggregation["retries"] == 1
+    assert analyzer.rate_limits.summary()["rate_limited"] == 1
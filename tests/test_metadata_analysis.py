@@ -3,6 +3,7 @@ import pytest
 from unittest.mock import MagicMock, patch
 from worker.collector import YouTubeCollector
 from models.schemas import YouTubeVideo
+from worker.quota import QuotaLedger
 
 @pytest.fixture
 def mock_youtube_client():
@@ -46,7 +47,7 @@ def test_get_recent_videos_detection(mock_youtube_client):
     
     with patch("worker.collector.get_settings") as mock_set:
         mock_set.return_value.youtube_api_key = "test"
-        collector = YouTubeCollector()
+        collector = YouTubeCollector(quota=QuotaLedger(daily_budget=10000, persist=False))
         videos = collector.get_recent_videos("channel_id", max_results=3)
         
         assert len(videos) == 3
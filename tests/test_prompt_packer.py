@@ -0,0 +1,35 @@
+"""Unit tests for worker/prompt_packer.py."""
+
+from worker.prompt_packer import estimate_tokens, pack_all, pack_lines
+
+
+def test_estimate_tokens_counts_cjk_per_character():
+    assert estimate_tokens("") == 0
+    assert estimate_tokens("abcdefgh") == 2
+    assert estimate_tokens("abcde") == 2
+    assert estimate_tokens("日本語") == 3
+    assert estimate_tokens("チャンネル: abcd") == 5 + 2
+
+
+def test_pack_lines_fills_budget_and_returns_overflow():
+    lines = ["aaaa" * 3, "bbbb" * 3, "cccc" * 3]  # 3 tokens + newline each
+    packed, overflow = pack_lines(lines, budget=10, base_tokens=2)
+    assert packed == lines[:2]
+    assert overflow == lines[2:]
+
+
+def test_pack_lines_always_makes_progress():
+    huge = ["x" * 400, "y"]
+    packed, overflow = pack_lines(huge, budget=10)
+    assert packed == ["x" * 400]
+    assert overflow == ["y"]
+
+    packed, _ = pack_lines(huge, budget=10, min_lines=2)
+    assert packed == huge
+
+
+def test_pack_all_keeps_order_and_every_line():
+    lines = [f"line {i:03d}" for i in range(50)]  # 2 tokens + newline each
+    requests = pack_all(lines, budget=30)
+    assert [line for request in requests for line in request] == lines
+    assert [len(r) for r in requests] == [10] * 5
@@ -0,0 +1,98 @@
+"""Unit tests for worker/queue_worker.py."""
+
+import threading
+
+import httpx
+from unittest.mock import patch
+
+from worker.metrics import start_http_server
+from worker.queue_worker import Heartbeat, QueueWorker
+from worker.timings import StageTimings
+
+
+def _worker():
+    with patch("worker.queue_worker.get_settings") as mock_settings:
+        mock_settings.return_value.queue_poll_interval_seconds = 0
+        mock_settings.return_value.queue_heartbeat_seconds = 0.01
+        mock_settings.return_value.queue_stale_seconds = 300
+        mock_settings.return_value.queue_max_attempts = 3
+        return QueueWorker(worker_id="host:1")
+
+
+def test_run_once_claims_and_runs_with_heartbeats():
+    worker = _worker()
+    run = {
+        "id": "run-1",
+        "config": {"keywords": ["VTuber"]},
+        "analysis_mode": "smart",
+        "notify_discord": False,
+        "attempts": 2,
+    }
+    heartbeats = threading.Event()
+
+    def fake_run_scout(**kwargs):
+        # The run executes while heartbeats are being sent.
+        assert heartbeats.wait(1)
+        assert not kwargs["cancel"].is_set()
+
+    def fake_heartbeat(run_id, worker_id):
+        assert (run_id, worker_id) == ("run-1", "host:1")
+        heartbeats.set()
+        return True
+
+    with patch("worker.queue_worker.claim_run", return_value=run) as mock_claim, \
+            patch("worker.queue_worker.heartbeat_run", side_effect=fake_heartbeat), \
+            patch("worker.queue_worker.run_scout", side_effect=fake_run_scout) as mock_run_scout:
+        assert worker.run_once() is True
+
+    mock_claim.assert_called_once_with("host:1", 300, 3)
+    kwargs = mock_run_scout.call_args.kwargs
+    assert kwargs["cancel"] is not None
+    assert {k: v for k, v in kwargs.items() if k != "cancel"} == {
+        "run_id": "run-1",
+        "config": {"keywords": ["VTuber"]},
+        "notify_discord": False,
+        "analysis_mode": "smart",
+        "worker_id": "host:1",
+    }
+
+
+def test_run_once_returns_false_on_empty_queue():
+    worker = _worker()
+    with patch("worker.queue_worker.claim_run", return_value=None), \
+            patch("worker.queue_worker.run_scout") as mock_run_scout:
+        assert worker.run_once() is False
+    mock_run_scout.assert_not_called()
+
+
+def test_heartbeat_stops_when_run_is_reclaimed():
+    with patch("worker.queue_worker.heartbeat_run", return_value=False) as mock_heartbeat:
+        with Heartbeat("run-1", "host:1", 0.01) as heartbeat:
+            for _ in range(100):
+                if heartbeat.lost.wait(0.01):
+                    break
+    assert heartbeat.lost.is_set()
+    assert mock_heartbeat.call_count == 1
+
+
+def test_metrics_server_requires_api_key_and_renders_stages():
+    timings = StageTimings()
+    with timings.stage("collection") as stage:
+        stage["items"] = 12
+        stage["calls"] = 3
+
+    server = start_http_server(0, "secret", host="127.0.0.1")
+    url = f"http://127.0.0.1:{server.server_address[1]}/metrics"
+    try:
+        assert httpx.get(url, headers={"X-API-KEY": "wrong"}).status_code == 403
+        response = httpx.get(url, headers={"X-API-KEY": "secret"})
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    body = response.text
+    assert "# TYPE signalforge_stage_seconds histogram" in body
+    assert 'signalforge_stage_seconds_count{stage="collection"}' in body
+    assert 'signalforge_stage_items_total{stage="collection"}' in body
@@ -0,0 +1,121 @@
+"""Unit tests for worker/quota.py."""
+
+import pytest
+from datetime import datetime, timezone
+from unittest.mock import patch
+
+from worker.quota import (
+    PRIORITY_EXPLORE,
+    PRIORITY_TRACKED,
+    QuotaExceededError,
+    QuotaLedger,
+    RESERVE_BLOCK_UNITS,
+    quota_day,
+)
+
+
+def test_charge_tracks_units_per_endpoint():
+    ledger = QuotaLedger(daily_budget=1000, persist=False)
+
+    ledger.charge("search.list")
+    ledger.charge("channels.list", PRIORITY_TRACKED)
+    ledger.charge("channels.list")
+
+    summary = ledger.summary()
+    assert summary["units_used"] == 102
+    assert summary["units_by_endpoint"] == {"search.list": 100, "channels.list": 2}
+    assert summary["calls_by_endpoint"] == {"search.list": 1, "channels.list": 2}
+
+
+def test_explore_calls_leave_tracked_reserve():
+    ledger = QuotaLedger(daily_budget=250, tracked_reserve=50, persist=False)
+
+    ledger.charge("search.list", PRIORITY_EXPLORE)
+    ledger.charge("search.list", PRIORITY_EXPLORE)
+    with pytest.raises(QuotaExceededError):
+        ledger.charge("search.list", PRIORITY_EXPLORE)
+    with pytest.raises(QuotaExceededError):
+        # 200 used, limit for exploratory calls is 200
+        ledger.charge("channels.list", PRIORITY_EXPLORE)
+
+    # Tracked refreshes may still use the reserve.
+    for _ in range(50):
+        ledger.charge("channels.list", PRIORITY_TRACKED)
+    with pytest.raises(QuotaExceededError):
+        ledger.charge("channels.list", PRIORITY_TRACKED)
+
+    assert ledger.summary()["deferred_by_endpoint"] == {"search.list": 1, "channels.list": 2}
+
+
+class FakeUsageTable:
+    """scout_quota_usage for one day, shared by several ledgers."""
+
+    def __init__(self, units_used: int = 0) -> None:
+        self.units_used = units_used
+
+    def reserve(self, usage_date, units, limit):
+        if self.units_used + units > limit:
+            return None
+        self.units_used += units
+        return self.units_used
+
+    def add(self, usage_date, units):
+        self.units_used += units
+        return self.units_used
+
+
+def test_reservations_count_against_budget():
+    table = FakeUsageTable(9950)
+    with patch("worker.quota.reserve_quota_usage", side_effect=table.reserve), \
+            patch("worker.quota.add_quota_usage", side_effect=table.add) as mock_add:
+        ledger = QuotaLedger(daily_budget=10000)
+
+        with pytest.raises(QuotaExceededError):
+            ledger.charge("search.list")
+        ledger.charge("channels.list")
+        # The 100-unit block did not fit, so only the call's unit was reserved.
+        assert table.units_used == 9951
+        ledger.flush()
+
+    mock_add.assert_not_called()
+    assert ledger.daily_units == 9951
+
+
+def test_concurrent_ledgers_share_the_budget():
+    table = FakeUsageTable()
+    with patch("worker.quota.reserve_quota_usage", side_effect=table.reserve), \
+            patch("worker.quota.add_quota_usage", side_effect=table.add):
+        workers = [QuotaLedger(daily_budget=1000) for _ in range(2)]
+        charged = 0
+        for _ in range(20):
+            for ledger in workers:
+                try:
+                    charged += ledger.charge("search.list")
+                except QuotaExceededError:
+                    pass
+
+        # Each ledger alone saw spare budget; together they stop at the limit.
+        assert charged == 1000
+        assert table.units_used == 1000
+
+
+def test_flush_releases_unused_block_units():
+    table = FakeUsageTable()
+    with patch("worker.quota.reserve_quota_usage", side_effect=table.reserve), \
+            patch("worker.quota.add_quota_usage", side_effect=table.add):
+        ledger = QuotaLedger(daily_budget=10000)
+        ledger.charge("channels.list")
+        ledger.charge("channels.list")
+        assert table.units_used == RESERVE_BLOCK_UNITS
+
+        ledger.flush()
+        assert table.units_used == 2
+        assert ledger.daily_units == 2
+        # Nothing reserved after flush
+        ledger.flush()
+        assert table.units_used == 2
+
+
+def test_quota_day_uses_pacific_time():
+    # 2024-03-01 05:00 UTC is still 2024-02-29 in Pacific time.
+    assert quota_day(datetime(2024, 3, 1, 5, 0, tzinfo=timezone.utc)) == "2024-02-29"
@@ -0,0 +1,151 @@
+"""Unit tests for resuming scout runs from stage checkpoints."""
+
+import threading
+from contextlib import ExitStack
+from unittest.mock import MagicMock, patch
+
+from worker.analyzer import Analyzer
+from worker.context import RunContext
+from worker.metrics import RUNS
+from worker.orchestrator import run_scout
+
+SNAPSHOTS = [
+    {"entity_id": "e-1", "subscribers": 1000, "upload_freq_days": 3},
+    {"entity_id": "e-2", "subscribers": 1000, "upload_freq_days": 3},
+]
+
+
+def _run(checkpoints, scores, analysis_mode="full", on_analyze=None, status_written=True, **run_kwargs):
+    """Run run_scout with every external dependency mocked; return the mocks."""
+    with ExitStack() as stack:
+        def mock(target, **kwargs):
+            return stack.enter_context(patch(target, **kwargs))
+
+        settings = mock("worker.orchestrator.get_settings").return_value
+        settings.discovery_enabled = False
+        settings.etag_refresh_enabled = False
+        settings.video_stage_enabled = False
+        mock("worker.orchestrator.QuotaLedger.from_settings").return_value.calls_by_endpoint = {}
+        mock("worker.orchestrator.SearchCache.from_settings", return_value=None)
+        mock("worker.orchestrator.LlmCache.from_settings", return_value=None)
+        collector = mock("worker.orchestrator.create_collector").return_value
+        collector.collect_multiple_sources.return_value = MagicMock(entity_count=2, errors=[])
+        analyzer = mock("worker.orchestrator.Analyzer").return_value
+        analyzer.analyze_batch.return_value = []
+        if on_analyze:
+            analyzer.analyze_batch.side_effect = on_analyze
+        analyzer.extract_trends.return_value = {"keywords": ["VTuber"]}
+        mocks = {
+            "collector": collector,
+            "analyzer": analyzer,
+            "get_tracked_set": mock("worker.orchestrator.get_tracked_set", return_value=["UC-new"]),
+            "delete_run_snapshots": mock("worker.orchestrator.delete_run_snapshots"),
+            "update_run_status": mock("worker.orchestrator.update_run_status", return_value=status_written),
+            "upsert_run_checkpoint": mock("worker.checkpoints.upsert_run_checkpoint"),
+        }
+        mock("worker.orchestrator.refresh_tracked_set", return_value=0)
+        mock("worker.orchestrator.update_score_classifications", return_value=0)
+        mock("worker.orchestrator.classify_scores", return_value={"top": [], "hot": [], "watch": [], "normal": []})
+        mock("worker.checkpoints.get_run_checkpoints", return_value=checkpoints)
+        mock("worker.events.update_run_progress")
+        mock("worker.context.get_snapshots_by_run", return_value=SNAPSHOTS)
+        mock("worker.context.get_last_scores", return_value={})
+        mock("worker.context.get_scores_by_run", return_value=scores)
+
+        run_scout(
+            "run-1", {"keywords": ["VTuber"]}, notify_discord=False, analysis_mode=analysis_mode, **run_kwargs
+        )
+    return mocks
+
+
+def test_resume_skips_completed_stages_and_scored_entities():
+    checkpoints = {
+        "tracked_set": {"platform_ids": ["UC-1"]},
+        "collection": {"scanned": 2, "errors": ["quota"], "summary": {"videos": {"fetched": 2}}},
+    }
+    mocks = _run(checkpoints, scores=[{"entity_id": "e-1", "total_score": 80}])
+
+    mocks["get_tracked_set"].assert_not_called()
+    mocks["collector"].collect_multiple_sources.assert_not_called()
+    mocks["delete_run_snapshots"].assert_not_called()
+    # Only the entity without a score from the first attempt is analyzed again.
+    mocks["analyzer"].analyze_batch.assert_called_once_with("run-1", [SNAPSHOTS[1]])
+
+    status, summary = mocks["update_run_status"].call_args[0][1:]
+    assert status == "success"
+    assert summary["scanned"] == 2
+    assert summary["errors"] == ["quota"]
+    assert summary["videos"] == {"fetched": 2}
+    assert summary["resumed_scores"] == 1
+    assert summary["checkpoints"] == {"restored": ["tracked_set", "collection"], "saved": ["analysis", "trends"]}
+
+
+def test_interrupted_collection_is_cleared_and_redone():
+    mocks = _run({"tracked_set": {"platform_ids": ["UC-1"]}}, scores=[])
+
+    mocks["delete_run_snapshots"].assert_called_once_with("run-1")
+    mocks["collector"].collect_multiple_sources.assert_called_once_with("run-1", ["VTuber"], ["UC-1"])
+    saved = [c.args[1] for c in mocks["upsert_run_checkpoint"].call_args_list]
+    assert saved == ["collection", "analysis", "trends"]
+
+
+def test_fresh_run_saves_every_stage():
+    mocks = _run({}, scores=[])
+
+    mocks["delete_run_snapshots"].assert_not_called()
+    mocks["analyzer"].analyze_batch.assert_called_once_with("run-1", SNAPSHOTS)
+    saved = [c.args[1] for c in mocks["upsert_run_checkpoint"].call_args_list]
+    assert saved == ["tracked_set", "collection", "analysis", "trends"]
+
+
+def test_reclaimed_run_stops_at_the_next_stage_without_writing():
+    cancel = threading.Event()
+
+    def lose_claim_during_analysis(run_id, snapshots):
+        cancel.set()
+        return []
+
+    cancelled = RUNS.values[("cancelled",)]
+    mocks = _run({}, scores=[], on_analyze=lose_claim_during_analysis, worker_id="host:1", cancel=cancel)
+
+    saved = [c.args[1] for c in mocks["upsert_run_checkpoint"].call_args_list]
+    assert saved == ["tracked_set", "collection"]
+    mocks["analyzer"].extract_trends.assert_not_called()
+    mocks["update_run_status"].assert_not_called()
+    assert RUNS.values[("cancelled",)] == cancelled + 1
+
+
+def test_final_status_is_only_written_by_the_owning_worker():
+    with patch("worker.orchestrator.RunProgress") as mock_progress:
+        mocks = _run({}, scores=[], worker_id="host:1", cancel=threading.Event(), status_written=False)
+
+    mocks["update_run_status"].assert_called_once()
+    assert mocks["update_run_status"].call_args.kwargs == {"worker_id": "host:1"}
+    mock_progress.return_value.finish.assert_not_called()
+
+
+def test_resumed_run_compares_scores_against_the_previous_run():
+    # e-1 was scored 70 by the previous run and 80 by the interrupted attempt.
+    rows = [
+        {"entity_id": "e-1", "run_id": "run-0", "id": "s-0", "total_score": 70, "created_at": "2024-01-01"},
+        {"entity_id": "e-1", "run_id": "run-1", "id": "s-1", "total_score": 80, "created_at": "2024-01-02"},
+    ]
+
+    def rpc(name, params):
+        assert name == "get_last_scores"
+        latest = {}
+        for row in sorted(rows, key=lambda r: r["created_at"]):
+            if row["entity_id"] in params["p_entity_ids"] and row["run_id"] != params["p_exclude_run_id"]:
+                latest[row["entity_id"]] = row
+        return MagicMock(execute=MagicMock(return_value=MagicMock(data=list(latest.values()))))
+
+    with patch("db.queries.get_supabase_client") as mock_client, \
+            patch("worker.context.get_snapshots_by_run", return_value=SNAPSHOTS), \
+            patch("worker.analyzer.get_settings") as mock_settings, patch("worker.analyzer.OpenAI"):
+        mock_client.return_value.rpc.side_effect = rpc
+        mock_settings.return_value.batch_size = 1
+        context = RunContext("run-1")
+        delta = Analyzer(context).calc_score_delta("e-1", 80)
+
+    assert context.last_score("e-1")["id"] == "s-0"
+    assert delta == 10
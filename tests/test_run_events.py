@@ -0,0 +1,133 @@
+"""Unit tests for run progress events and the SSE endpoint."""
+
+import asyncio
+import json
+import threading
+
+import pytest
+from fastapi.testclient import TestClient
+from unittest.mock import AsyncMock, patch
+
+from api.runs import POLLERS, _run_events
+from main import app
+from worker.events import BUS, RunProgress
+
+client = TestClient(app)
+TEST_API_KEY = "test-secret-key"
+
+
+@pytest.fixture(autouse=True)
+def mock_settings():
+    with patch("api.deps.get_settings") as mock_deps, patch("api.runs.get_settings") as mock_runs:
+        mock_deps.return_value.scout_api_key = TEST_API_KEY
+        mock_runs.return_value.run_events_poll_seconds = 0.01
+        yield
+
+
+def _parse(text):
+    events = []
+    for block in text.strip().split("\n\n"):
+        lines = dict(line.split(": ", 1) for line in block.splitlines() if not line.startswith(":"))
+        if lines:
+            events.append((lines["event"], json.loads(lines["data"])))
+    return events
+
+
+def test_progress_is_published_on_the_bus():
+    async def run():
+        row = {"id": "run-bus", "status": "running", "progress": None}
+        queue = BUS.subscribe("run-bus")
+        stream = _run_events("run-bus", row, queue, poll_interval=5)
+
+        def pipeline():
+            progress = RunProgress("run-bus")
+            progress.stage("collection", "started")
+            progress.count(collected=12)
+            progress.advance("analyzed")
+            progress.finish("success", {"scanned": 12})
+
+        with patch("worker.events.update_run_progress") as mock_store:
+            chunks = [await anext(stream)]
+            thread = threading.Thread(target=pipeline)
+            thread.start()
+            chunks += [chunk async for chunk in stream]
+            thread.join()
+        return chunks, mock_store
+
+    chunks, mock_store = asyncio.run(run())
+    events = _parse("".join(chunks))
+    assert events == [
+        ("snapshot", {"status": "running"}),
+        ("stage", {"stage": "collection", "status": "started"}),
+        ("progress", {"collected": 12, "analyzed": 0, "skipped": 0}),
+        ("progress", {"collected": 12, "analyzed": 1, "skipped": 0}),
+        ("summary", {"status": "success", "summary": {"scanned": 12}}),
+    ]
+    # Stage transitions and the final state are persisted for other processes.
+    assert mock_store.call_args[0][1]["stages"] == {"collection": "started"}
+    assert "run-bus" not in BUS._subscribers
+
+
+def test_event_stream_polls_runs_executed_elsewhere():
+    running = {"id": "run-1", "status": "running", "progress": {"stage": "collection"}}
+    rows = [
+        running,
+        running,
+        {**running, "progress": {"stage": "analysis", "counters": {"analyzed": 3}}},
+        {**running, "status": "success", "summary": {"scanned": 10}},
+    ]
+    with patch("api.runs.get_run", new_callable=AsyncMock, side_effect=rows), \
+            patch("api.runs.KEEPALIVE_SECONDS", 0.005):
+        response = client.get("/v1/scout/runs/run-1/events", headers={"X-API-KEY": TEST_API_KEY})
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/event-stream")
+    assert ": keep-alive" in response.text
+    assert _parse(response.text) == [
+        ("snapshot", {"status": "running", "stage": "collection"}),
+        ("snapshot", {"status": "running", "stage": "analysis", "counters": {"analyzed": 3}}),
+        ("summary", {"status": "success", "summary": {"scanned": 10}}),
+    ]
+
+
+def test_viewers_of_a_run_share_one_poller():
+    running = {"id": "run-3", "status": "running", "progress": {"stage": "collection"}}
+    polled = [
+        {**running, "progress": {"stage": "analysis"}},
+        {**running, "status": "success", "summary": {"scanned": 10}},
+    ]
+
+    async def run():
+        queues = [BUS.subscribe("run-3") for _ in range(3)]
+        streams = [_run_events("run-3", running, queue, poll_interval=0.01) for queue in queues]
+
+        async def consume(stream):
+            return [chunk async for chunk in stream]
+
+        return await asyncio.gather(*(consume(stream) for stream in streams))
+
+    with patch("api.runs.get_run", new_callable=AsyncMock, side_effect=polled) as mock_get_run:
+        results = asyncio.run(run())
+
+    # Three viewers, one row read per poll interval.
+    assert mock_get_run.await_count == 2
+    for chunks in results:
+        assert _parse("".join(chunks)) == [
+            ("snapshot", {"status": "running", "stage": "collection"}),
+            ("snapshot", {"status": "running", "stage": "analysis"}),
+            ("summary", {"status": "success", "summary": {"scanned": 10}}),
+        ]
+    assert "run-3" not in BUS._subscribers
+    assert "run-3" not in POLLERS._tasks
+
+
+def test_event_stream_for_finished_and_missing_runs():
+    finished = {"id": "run-2", "status": "failed", "progress": None, "summary": {"fatal_error": "boom"}}
+    with patch("api.runs.get_run", new_callable=AsyncMock, return_value=finished):
+        response = client.get("/v1/scout/runs/run-2/events", headers={"X-API-KEY": TEST_API_KEY})
+    assert _parse(response.text)[-1] == ("summary", {"status": "failed", "summary": {"fatal_error": "boom"}})
+
+    with patch("api.runs.get_run", new_callable=AsyncMock, return_value=None):
+        response = client.get("/v1/scout/runs/missing/events", headers={"X-API-KEY": TEST_API_KEY})
+    assert response.status_code == 404
+    assert "missing" not in BUS._subscribers
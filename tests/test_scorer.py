@@ -66,3 +66,21 @@ def test_classify_scores_empty():
     assert result["hot"] == []
     assert result["watch"] == []
     assert result["normal"] == []
+
+
+def test_save_classifications_writes_all_categories_in_one_call():
+    from unittest.mock import patch
+    from worker.orchestrator import save_classifications
+
+    result = {
+        "top": [{"score_id": "s1"}, {"score_id": "s2"}],
+        "hot": [{"score_id": "s2"}],
+        "watch": [{"score_id": "s3"}],
+        "normal": [{"score_id": "s4"}],
+    }
+    with patch("worker.orchestrator.update_score_classifications", return_value=4) as mock_update:
+        stats = save_classifications(result)
+
+    mock_update.assert_called_once_with({"s1": "top", "s2": "hot", "s3": "watch", "s4": "normal"})
+    assert stats["updated"] == 4
+    assert stats["duration_ms"] >= 0
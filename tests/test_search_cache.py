@@ -0,0 +1,63 @@
+"""Unit tests for worker/search_cache.py."""
+
+import pytest
+from datetime import datetime, timedelta, timezone
+from unittest.mock import patch, MagicMock
+
+from worker.collector import YouTubeCollector
+from worker.quota import QuotaLedger
+from worker.search_cache import SearchCache
+
+
+def _row(channel_ids, age_hours):
+    fetched_at = datetime.now(timezone.utc) - timedelta(hours=age_hours)
+    return {"channel_ids": channel_ids, "fetched_at": fetched_at.isoformat()}
+
+
+@patch("worker.search_cache.get_search_cache")
+def test_cache_hit_miss_and_expiry(mock_get):
+    cache = SearchCache(ttl=timedelta(hours=24))
+
+    mock_get.return_value = _row(["c1", "c2"], age_hours=2)
+    assert cache.get("  VTuber ", 12) == ["c1", "c2"]
+    mock_get.assert_called_with("vtuber", 12)
+
+    mock_get.return_value = _row(["c1"], age_hours=30)
+    assert cache.get("VTuber", 12) is None
+
+    mock_get.return_value = None
+    assert cache.get("Cover", 12) is None
+
+    assert cache.summary() == {"hits": 1, "misses": 2, "refreshed": 0, "hit_rate": 0.333}
+
+
+@patch("worker.search_cache.get_search_cache")
+def test_forced_refresh_bypasses_cache(mock_get):
+    cache = SearchCache(ttl=timedelta(hours=24), refresh_keywords=["Singer"])
+    mock_get.return_value = _row(["c1"], age_hours=1)
+
+    assert cache.get("singer", 12) is None
+    assert cache.get("VTuber", 12, force_refresh=True) is None
+    mock_get.assert_not_called()
+    assert cache.refreshed == 2
+
+
+@patch("worker.search_cache.upsert_search_cache")
+@patch("worker.search_cache.get_search_cache")
+def test_search_channels_uses_cache_before_api(mock_get, mock_put):
+    with patch("worker.collector.build") as mock_build, patch("worker.collector.get_settings"):
+        youtube = mock_build.return_value
+        youtube.search().list().execute.return_value = {
+            "items": [{"id": {"channelId": "fresh-1"}}]
+        }
+        quota = QuotaLedger(daily_budget=10000, persist=False)
+        collector = YouTubeCollector(quota=quota, search_cache=SearchCache(ttl=timedelta(hours=24)))
+
+        mock_get.return_value = _row(["cached-1"], age_hours=1)
+        assert collector.search_channels("VTuber") == ["cached-1"]
+        assert quota.run_units == 0
+
+        mock_get.return_value = None
+        assert collector.search_channels("Cover") == ["fresh-1"]
+        assert quota.run_units == 100
+        assert mock_put.call_args.args[:3] == ("cover", 12, ["fresh-1"])
@@ -12,6 +12,7 @@ def test_extract_trends(mock_openai_class, mock_get_scores):
     # Setup OpenAI mock
     mock_client = MagicMock()
     mock_openai_class.return_value = mock_client
+    mock_client.with_options.return_value = mock_client
     
     # Mock scores
     mock_get_scores.return_value = [
@@ -0,0 +1,153 @@
+"""Unit tests for the collector recent-video stage."""
+
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from unittest.mock import patch, MagicMock
+
+from models.schemas import YouTubeChannel, YouTubeVideo
+from worker.collector import VIDEO_PARTS, YouTubeCollector, calculate_upload_interval_days
+from worker.quota import QuotaLedger
+
+
+def _video(video_id, days_ago, now):
+    return YouTubeVideo(video_id=video_id, published_at=now - timedelta(days=days_ago))
+
+
+def test_upload_interval_grows_when_channel_goes_quiet():
+    now = datetime(2024, 6, 1, tzinfo=timezone.utc)
+    active = [_video(f"v{i}", d, now) for i, d in enumerate([1, 4, 8, 12])]
+    quiet = [_video(f"v{i}", d, now) for i, d in enumerate([90, 93, 97, 100])]
+
+    assert calculate_upload_interval_days(active, now) == 3.0
+    assert calculate_upload_interval_days(quiet, now) == 25.0
+    assert calculate_upload_interval_days([], now) is None
+
+
+def _video_item(video_id, duration="PT10M"):
+    return {
+        "id": video_id,
+        "snippet": {"publishedAt": "2024-01-01T00:00:00Z", "title": f"Title {video_id}"},
+        "contentDetails": {"duration": duration},
+    }
+
+
+def test_collect_recent_videos_batches_across_channels():
+    with patch("worker.collector.build") as mock_build, patch("worker.collector.get_settings") as mock_set:
+        mock_set.return_value.video_stage_enabled = True
+        mock_set.return_value.recent_videos_per_channel = 10
+        mock_set.return_value.min_subscribers = 500
+        youtube = mock_build.return_value
+
+        def playlist_items(playlistId, part, maxResults, pageToken=None):
+            request = MagicMock()
+            request.execute.return_value = {
+                "items": [{"contentDetails": {"videoId": f"{playlistId}-v{i}"}} for i in range(maxResults)]
+            }
+            return request
+
+        video_calls = []
+
+        def videos_list(id, part):
+            ids = id.split(",")
+            video_calls.append(len(ids))
+            request = MagicMock()
+            request.execute.return_value = {"items": [_video_item(v) for v in ids]}
+            return request
+
+        youtube.playlistItems.return_value.list.side_effect = playlist_items
+        youtube.videos.return_value.list.side_effect = videos_list
+
+        quota = QuotaLedger(daily_budget=10000, persist=False)
+        collector = YouTubeCollector(quota=quota)
+
+        channels = [
+            YouTubeChannel(
+                channel_id=f"UC{i}",
+                title=f"C{i}",
+                subscriber_count=1000,
+                video_count=50,
+                uploads_playlist_id=f"UU{i}",
+            )
+            for i in range(7)
+        ]
+        # Screened out by MIN_SUBSCRIBERS: no video lookup.
+        channels.append(YouTubeChannel(
+            channel_id="UCsmall", title="small", subscriber_count=10, video_count=5, uploads_playlist_id="UUsmall"
+        ))
+
+        entity_ids = {c.channel_id: f"e-{c.channel_id}" for c in channels}
+        with patch("worker.video_store.get_recent_entity_videos", return_value={}), \
+                patch("worker.video_store.upsert_videos_bulk") as mock_upsert:
+            collector.collect_recent_videos(channels, entity_ids, tracked_ids={"UC0"})
+
+    # 7 playlists x 10 videos = 70 IDs; tracked channel's 10 in one call, others 50 + 10
+    assert sorted(video_calls) == [10, 10, 50]
+    assert quota.run_units == 7 + 3
+    assert len(channels[1].recent_videos) == 10
+    assert channels[1].recent_videos[0]["title"].startswith("Title UU1-")
+    assert channels[1].upload_freq_days is not None
+    assert channels[-1].recent_videos == []
+    assert channels[-1].upload_freq_days is None
+    # Every fetched upload is stored for the next run's high-water mark.
+    assert len(mock_upsert.call_args[0][0]) == 70
+
+
+def test_collect_recent_videos_fetches_only_uploads_after_high_water_mark():
+    with patch("worker.collector.build") as mock_build, patch("worker.collector.get_settings") as mock_set:
+        mock_set.return_value.video_stage_enabled = True
+        mock_set.return_value.recent_videos_per_channel = 3
+        mock_set.return_value.min_subscribers = 0
+        youtube = mock_build.return_value
+
+        playlist = [
+            ("new-2", "2024-05-03T00:00:00Z"),
+            ("new-1", "2024-05-02T00:00:00Z"),
+            ("old-2", "2024-05-01T00:00:00Z"),
+        ]
+        youtube.playlistItems.return_value.list.return_value.execute.return_value = {
+            "items": [
+                {"contentDetails": {"videoId": v, "videoPublishedAt": published}}
+                for v, published in playlist
+            ],
+            "nextPageToken": "page-2",
+        }
+
+        def videos_list(id, part):
+            request = MagicMock()
+            request.execute.return_value = {"items": [
+                {
+                    "id": v,
+                    "snippet": {"publishedAt": dict(playlist)[v], "title": v},
+                    "contentDetails": {"duration": "PT30S"},
+                }
+                for v in id.split(",")
+            ]}
+            return request
+
+        youtube.videos.return_value.list.side_effect = videos_list
+
+        stored = {"e-1": [
+            {"video_id": "old-2", "published_at": "2024-05-01T00:00:00+00:00", "video_type": "normal", "title": "old-2"},
+            {"video_id": "old-1", "published_at": "2024-04-20T00:00:00+00:00", "video_type": "live", "title": "old-1"},
+        ]}
+        quota = QuotaLedger(daily_budget=10000, persist=False)
+        collector = YouTubeCollector(quota=quota)
+        channel = YouTubeChannel(
+            channel_id="UC1", title="C1", subscriber_count=1000, video_count=50, uploads_playlist_id="UU1"
+        )
+
+        with patch("worker.video_store.get_recent_entity_videos", return_value=stored), \
+                patch("worker.video_store.upsert_videos_bulk") as mock_upsert:
+            collector.collect_recent_videos([channel], {"UC1": "e-1"})
+
+    # Scan stopped at the first stored upload: one page, one videos.list for 2 IDs.
+    youtube.playlistItems.return_value.list.assert_called_once()
+    youtube.videos.return_value.list.assert_called_once_with(id="new-2,new-1", part=VIDEO_PARTS)
+    assert quota.run_units == 2
+    assert [v["video_id"] for v in channel.recent_videos] == ["new-2", "new-1", "old-2"]
+    assert channel.recent_videos[0]["video_type"] == "shorts"
+    rows = mock_upsert.call_args[0][0]
+    assert {r["video_id"] for r in rows} == {"new-1", "new-2"}
+    assert all(r["entity_id"] == "e-1" for r in rows)
+    assert collector.video_store.summary()["stored_videos_reused"] == 2
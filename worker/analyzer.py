@@ -5,17 +5,30 @@ from __future__ import annotations
 import json
 import logging
 import time
+from concurrent.futures import ThreadPoolExecutor
 from typing import Any
 
 from openai import OpenAI
 from pydantic import ValidationError
 
 from config import get_settings
-from db.queries import get_last_score, insert_score, get_scores_by_run
+from db.queries import get_last_scores, insert_score, get_scores_by_run
 from models.schemas import ScoreInput, ScoreOutput
+from worker.context import RunContext
+from worker.events import RunProgress
+from worker.llm_cache import LlmCache, bucket_input, cache_key
+from worker.llm_usage import LlmUsage, usage_counts
+from worker.prompt_packer import estimate_message_tokens, pack_all, pack_lines
+from worker.rate_limit import RateLimitGate
 
 logger = logging.getLogger(__name__)
 
+# At most 3 entities of a group advance, so groups of 4+ shrink every reduce
+# round; the round limit still bounds the paid calls of one analysis.
+AGGREGATED_WINNERS_PER_GROUP = 3
+AGGREGATED_MIN_GROUP = 4
+AGGREGATED_MAX_ROUNDS = 8
+
 SYSTEM_PROMPT = """
 あなたは海外クリエイターの市場分析スペシャリストです。
 提供されたYouTubeチャンネルデータ（登録者数、再生数、直近の通常動画・ライブ・ショートの分布とタイトル）を詳細に分析し、以下のJSON形式で返答してください。
@@ -37,11 +50,28 @@ SYSTEM_PROMPT = """
 class Analyzer:
     """GPT scoring worker for snapshots."""
 
-    def __init__(self) -> None:
+    def __init__(
+        self,
+        context: RunContext | None = None,
+        llm_cache: LlmCache | None = None,
+        usage: LlmUsage | None = None,
+        progress: RunProgress | None = None,
+    ) -> None:
         settings = get_settings()
+        self.context = context
+        self.llm_cache = llm_cache
+        self.usage = usage or LlmUsage()
+        self.progress = progress
         self.model = settings.openai_model
-        self.batch_size = settings.batch_size
-        self.client = OpenAI(api_key=settings.openai_api_key)
+        # BATCH_SIZE is the number of scoring requests in flight at once.
+        self.batch_size = max(1, settings.batch_size)
+        self.client = OpenAI(api_key=settings.openai_api_key, base_url=settings.openai_base_url)
+        # LlmUsage.complete retries chat calls itself: 429s through the shared
+        # gate, 5xx and connection errors per request (the SDK cannot exclude
+        # 429s alone). The batch files and batches calls keep the SDK retries.
+        self.chat_client = self.client.with_options(max_retries=0)
+        self.rate_limits = RateLimitGate()
+        self.prompt_token_budget = settings.prompt_token_budget
 
     def build_prompt(self, snapshot: ScoreInput) -> str:
         """Build user prompt from snapshot record."""
@@ -56,126 +86,256 @@ class Analyzer:
             f"{json.dumps(snapshot.recent_videos_json, ensure_ascii=False)}"
         )
 
+    def score_request(self, prompt: str) -> dict[str, Any]:
+        """Chat completion parameters for scoring one prompt."""
+
+        return {
+            "model": self.model,
+            "response_format": {"type": "json_object"},
+            "messages": [
+                {"role": "system", "content": SYSTEM_PROMPT},
+                {"role": "user", "content": prompt},
+            ],
+        }
+
     def call_gpt(self, prompt: str) -> ScoreOutput:
         """Call OpenAI and parse validated score output with bounded retry."""
 
-        for attempt in range(2):
+        return self.call_gpt_with_usage(prompt)[0]
+
+    def call_gpt_with_usage(self, prompt: str) -> tuple[ScoreOutput, dict[str, int]]:
+        """``call_gpt`` that also returns the token usage of the successful call.
+
+        Invalid output is retried once; rate limits and transient errors are
+        retried by ``LlmUsage.complete``.
+        """
+
+        attempt = 0
+        while True:
+            response = self.usage.complete(
+                "analysis", self.chat_client,
+                retry=attempt > 0,
+                gate=self.rate_limits,
+                **self.score_request(prompt),
+            )
+
             try:
-                response = self.client.chat.completions.create(
-                    model=self.model,
-                    response_format={"type": "json_object"},
-                    messages=[
-                        {"role": "system", "content": SYSTEM_PROMPT},
-                        {"role": "user", "content": prompt},
-                    ],
-                )
                 content = response.choices[0].message.content or "{}"
-                return ScoreOutput.model_validate(json.loads(content))
+                counts = usage_counts(getattr(response, "usage", None))
+                return ScoreOutput.model_validate(json.loads(content)), {
+                    "prompt_tokens": counts["prompt_tokens"],
+                    "completion_tokens": counts["completion_tokens"],
+                }
             except (json.JSONDecodeError, ValidationError):
                 logger.exception("Invalid GPT output. attempt=%s", attempt + 1)
                 if attempt == 0:
+                    attempt += 1
                     time.sleep(0.3)
                     continue
                 raise
 
-        raise ValueError("Unreachable GPT parse failure")
-
     def calc_score_delta(self, entity_id: str, current_score: int) -> int:
         """Calculate score difference from latest stored score."""
 
-        previous = get_last_score(entity_id)
+        if self.context:
+            previous = self.context.last_score(entity_id)
+        else:
+            previous = get_last_scores([entity_id]).get(entity_id)
         if previous is None:
             return 0
 
         previous_total = int(float(previous.get("total_score", 0)))
         return current_score - previous_total
 
+    def save_score(self, run_id: str, entity_id: str, score_output: ScoreOutput) -> None:
+        """Attach the score delta and upsert the score row."""
+
+        score_delta = self.calc_score_delta(entity_id, score_output.total_score)
+
+        payload = score_output.model_dump()
+        payload["score_delta"] = score_delta
+
+        insert_score(
+            run_id=run_id,
+            entity_id=entity_id,
+            score_data=payload,
+            gpt_model=self.model,
+        )
+        logger.info("Analyzer saved score. run_id=%s entity_id=%s", run_id, entity_id)
+
+    def cache_key(self, score_input: ScoreInput) -> str:
+        """LLM cache key: (system prompt, prompt over bucketed stats, model)."""
+
+        return cache_key(SYSTEM_PROMPT, self.build_prompt(bucket_input(score_input)), self.model)
+
+    def _load_cache(self, snapshots: list[dict[str, Any]]) -> None:
+        keys = []
+        for raw in snapshots:
+            try:
+                keys.append(self.cache_key(ScoreInput.model_validate(raw)))
+            except ValidationError:
+                continue
+        self.llm_cache.load(keys)
+
+    def score_entity(self, run_id: str, raw: dict[str, Any]) -> str | None:
+        """Score and save one snapshot; return an error message instead of raising."""
+
+        entity_id = str(raw.get("entity_id", ""))
+        try:
+            score_input = ScoreInput.model_validate(raw)
+            prompt = self.build_prompt(score_input)
+            key = self.cache_key(score_input) if self.llm_cache else None
+            score_output = self.llm_cache.get(key) if key else None
+            if score_output is None:
+                score_output, usage = self.call_gpt_with_usage(prompt)
+                if key:
+                    self.llm_cache.put(key, self.model, score_output, usage)
+            self.save_score(run_id, entity_id, score_output)
+            return None
+        except Exception as exc:
+            msg = f"Analyzer skipped entity_id={entity_id}: {exc}"
+            logger.exception(msg)
+            return msg
+
     def analyze_batch(self, run_id: str, snapshots: list[dict[str, Any]]) -> list[str]:
-        """Analyze snapshots in batches and save score rows."""
-
-        errors: list[str] = []
-
-        for idx in range(0, len(snapshots), self.batch_size):
-            batch = snapshots[idx : idx + self.batch_size]
-            for raw in batch:
-                entity_id = str(raw.get("entity_id", ""))
-                try:
-                    score_input = ScoreInput.model_validate(raw)
-                    prompt = self.build_prompt(score_input)
-                    score_output = self.call_gpt(prompt)
-                    score_delta = self.calc_score_delta(entity_id, score_output.total_score)
-
-                    payload = score_output.model_dump()
-                    payload["score_delta"] = score_delta
-
-                    insert_score(
-                        run_id=run_id,
-                        entity_id=entity_id,
-                        score_data=payload,
-                        gpt_model=self.model,
-                    )
-                    logger.info("Analyzer saved score. run_id=%s entity_id=%s", run_id, entity_id)
-                except Exception as exc:
-                    msg = f"Analyzer skipped entity_id={entity_id}: {exc}"
-                    logger.exception(msg)
-                    errors.append(msg)
-            time.sleep(0.5)
+        """Score snapshots with up to ``BATCH_SIZE`` requests in flight and save score rows.
+
+        Errors are returned per entity, in snapshot order.
+        """
 
+        if not snapshots:
+            return []
+
+        def score(raw: dict[str, Any]) -> str | None:
+            msg = self.score_entity(run_id, raw)
+            if self.progress:
+                self.progress.advance("analyzed")
+            return msg
+
+        if self.llm_cache:
+            self._load_cache(snapshots)
+        with ThreadPoolExecutor(max_workers=min(self.batch_size, len(snapshots))) as pool:
+            errors = [msg for msg in pool.map(score, snapshots) if msg]
+        if self.llm_cache:
+            self.llm_cache.flush()
         return errors
 
+    @staticmethod
+    def _entity_line(snapshot: dict[str, Any]) -> str:
+        return (
+            f"ID: {snapshot['entity_id']}, Name: {snapshot['display_name']}, "
+            f"Subs: {snapshot['subscribers']}, Views: {snapshot['total_views']}"
+        )
+
+    def _rank_group(self, lines: list[str]) -> dict[str, Any]:
+        """Ask GPT for the top recommendations within one packed group of entity lines."""
+
+        prompt = AGGREGATED_PROMPT_HEADER + "\n".join(lines)
+        response = self.usage.complete(
+            "aggregation",
+            self.chat_client,
+            gate=self.rate_limits,
+            model=self.model,
+            response_format={"type": "json_object"},
+            messages=[
+                {"role": "system", "content": SYSTEM_PROMPT_AGGREGATED},
+                {"role": "user", "content": prompt},
+            ],
+        )
+        content = response.choices[0].message.content or "{}"
+        return json.loads(content)
+
     def analyze_aggregated(self, run_id: str, snapshots: list[dict[str, Any]]) -> dict[str, Any]:
-        """Analyze multiple entities at once and return top recommendations."""
+        """Analyze all candidates map-reduce style and return top recommendations.
+
+        Candidate lines are packed into groups that fill ``PROMPT_TOKEN_BUDGET``
+        and ranked concurrently; each group's first ``AGGREGATED_WINNERS_PER_GROUP``
+        recommended entities advance to the next round until one group remains,
+        whose ranking is the result. Groups hold at least ``AGGREGATED_MIN_GROUP``
+        entities, so every round shrinks; a round that does not, or more than
+        ``AGGREGATED_MAX_ROUNDS`` rounds, fails the analysis.
+        """
         if not snapshots:
             return {"recommendations": []}
 
-        # Context build for multiple entities
-        context_items = []
-        for s in snapshots[:10]: # Limit to 10 for context window
-            context_items.append(
-                f"ID: {s['entity_id']}, Name: {s['display_name']}, Subs: {s['subscribers']}, Views: {s['total_views']}"
-            )
-        
-        prompt = "以下は収集されたチャンネルリストです:\n" + "\n".join(context_items)
-
-        try:
-            response = self.client.chat.completions.create(
-                model=self.model,
-                response_format={"type": "json_object"},
-                messages=[
-                    {"role": "system", "content": SYSTEM_PROMPT_AGGREGATED},
-                    {"role": "user", "content": prompt},
-                ],
-            )
-            content = response.choices[0].message.content or "{}"
-            return json.loads(content)
-        except Exception:
-            logger.exception("Aggregated analysis failed.")
-            return {"recommendations": [], "error": "Analysis failed"}
+        base_tokens = estimate_message_tokens(SYSTEM_PROMPT_AGGREGATED, AGGREGATED_PROMPT_HEADER)
+        candidates = list(snapshots)
+        stats = {"candidates": len(candidates), "rounds": 0, "calls": 0, "failed_calls": 0}
+
+        while True:
+            if stats["rounds"] >= AGGREGATED_MAX_ROUNDS:
+                logger.error("Aggregated analysis did not finish within %d rounds.", AGGREGATED_MAX_ROUNDS)
+                return {"recommendations": [], "error": "Too many ranking rounds", **stats}
+
+            by_line = {self._entity_line(s): s for s in candidates}
+            groups = pack_all(list(by_line), self.prompt_token_budget, base_tokens, AGGREGATED_MIN_GROUP)
+            stats["rounds"] += 1
+            stats["calls"] += len(groups)
+
+            with ThreadPoolExecutor(max_workers=min(self.batch_size, len(groups))) as pool:
+                futures = [pool.submit(self._rank_group, group) for group in groups]
+                results = []
+                for future in futures:
+                    try:
+                        results.append(future.result())
+                    except Exception:
+                        logger.exception("Aggregated analysis failed for a group.")
+                        stats["failed_calls"] += 1
+                        results.append(None)
+
+            if len(groups) == 1:
+                if results[0] is None:
+                    return {"recommendations": [], "error": "Analysis failed", **stats}
+                return {**results[0], **stats}
+
+            # Reduce: the top winners of every group advance to the next round.
+            winners = []
+            for group, result in zip(groups, results):
+                by_id = {str(by_line[line]["entity_id"]): by_line[line] for line in group}
+                group_winners = []
+                for rec in (result or {}).get("recommendations", []):
+                    snap = by_id.pop(str(rec.get("id")), None)
+                    if snap is not None:
+                        group_winners.append(snap)
+                winners.extend(group_winners[:AGGREGATED_WINNERS_PER_GROUP])
+
+            if not winners:
+                return {"recommendations": [], "error": "Analysis failed", **stats}
+            if len(winners) >= len(candidates):
+                logger.error("Aggregated round kept all %d candidates.", len(candidates))
+                return {"recommendations": [], "error": "Ranking did not reduce candidates", **stats}
+            candidates = winners
 
     def extract_trends(self, run_id: str) -> dict[str, Any]:
         """
         Analyze recent scores to identify trends.
         """
         try:
-            scores = get_scores_by_run(run_id)
+            if self.context and self.context.run_id == run_id:
+                scores = self.context.scores()
+            else:
+                scores = get_scores_by_run(run_id)
             if not scores:
                 return {"keywords": []}
 
-            text_context = "\n".join([
+            lines = [
                 f"Entity: {s['display_name']}, TotalScore: {s['total_score']}, Delta: {s['score_delta']}"
-                for s in scores[:20]
-            ])
-
-            prompt = (
-                "以下の分析結果からトレンドワードを3つ抽出してください。\n"
-                "返答形式: キーワード1, キーワード2, キーワード3\n\n"
-                f"{text_context}"
-            )
-
-            response = self.client.chat.completions.create(
+                for s in scores
+            ]
+            base_tokens = estimate_message_tokens(SYSTEM_PROMPT_TRENDS, TRENDS_PROMPT_HEADER)
+            lines, overflow = pack_lines(lines, self.prompt_token_budget, base_tokens)
+            if overflow:
+                logger.info("Trend prompt holds %d/%d scores within the token budget.", len(lines), len(scores))
+
+            prompt = TRENDS_PROMPT_HEADER + "\n".join(lines)
+
+            response = self.usage.complete(
+                "trends",
+                self.chat_client,
+                gate=self.rate_limits,
                 model=self.model,
                 messages=[
-                    {"role": "system", "content": "あなたは市場アナリストです。"},
+                    {"role": "system", "content": SYSTEM_PROMPT_TRENDS},
                     {"role": "user", "content": prompt},
                 ],
                 max_completion_tokens=50
@@ -211,3 +371,12 @@ SYSTEM_PROMPT_AGGREGATED = """
   ]
 }
 """.strip()
+
+AGGREGATED_PROMPT_HEADER = "以下は収集されたチャンネルリストです:\n"
+
+SYSTEM_PROMPT_TRENDS = "あなたは市場アナリストです。"
+
+TRENDS_PROMPT_HEADER = (
+    "以下の分析結果からトレンドワードを3つ抽出してください。\n"
+    "返答形式: キーワード1, キーワード2, キーワード3\n\n"
+)
@@ -0,0 +1,521 @@
+"""Async collector for YouTube Data API (REST via httpx)."""
+
+import asyncio
+import logging
+from contextlib import asynccontextmanager, suppress
+from datetime import datetime
+from typing import Any, AsyncIterator, Awaitable
+
+import httpx
+
+from config import get_settings
+from db.queries import BULK_CHUNK_SIZE
+from models.schemas import YouTubeChannel, YouTubeVideo, CollectorResult
+from worker.collector import (
+    CHANNEL_PARTS,
+    VIDEO_PARTS,
+    apply_video_stats,
+    parse_channel_item,
+    parse_video_item,
+    save_entities,
+    save_snapshots,
+    split_video_ids,
+    video_stage_candidates,
+)
+from worker.quota import PRIORITY_EXPLORE, PRIORITY_TRACKED, QuotaExceededError, QuotaLedger
+from worker.channel_index import ChannelIndex, DiscoveryLookup, plan_discovery_lookups
+from worker.etag_cache import EtagCache
+from worker.search_cache import SearchCache
+from worker.video_store import VideoStore, new_upload_ids
+
+logger = logging.getLogger(__name__)
+
+YOUTUBE_API_BASE_URL = "https://www.googleapis.com/youtube/v3"
+MAX_IDS_PER_REQUEST = 50
+
+
+def _close_queue(queue: asyncio.Queue) -> None:
+    """Signal end of input to a consumer that may already have stopped.
+
+    A failed or cancelled producer must not block on a full queue while its
+    TaskGroup unwinds; the TaskGroup cancels a consumer that misses the sentinel.
+    """
+    with suppress(asyncio.QueueFull):
+        queue.put_nowait(None)
+
+
+class AsyncYouTubeCollector:
+    """Collector that fans out YouTube Data API calls concurrently.
+
+    Keyword searches and 50-ID detail chunks are issued in parallel, bounded by
+    ``COLLECTOR_CONCURRENCY`` in-flight requests, and saved in batches while
+    collection is still running. Results are saved with the same logic as
+    ``YouTubeCollector`` and returned as a ``CollectorResult``.
+    """
+
+    def __init__(
+        self,
+        concurrency: int | None = None,
+        transport: httpx.AsyncBaseTransport | None = None,
+        quota: QuotaLedger | None = None,
+        search_cache: SearchCache | None = None,
+        etag_cache: EtagCache | None = None,
+        channel_index: ChannelIndex | None = None,
+        video_store: VideoStore | None = None,
+    ):
+        settings = get_settings()
+        self.api_key = settings.youtube_api_key
+        self.concurrency = max(1, concurrency or settings.collector_concurrency)
+        self.video_stage_enabled = settings.video_stage_enabled
+        self.recent_videos_limit = settings.recent_videos_per_channel
+        self.min_subscribers = settings.min_subscribers
+        self.transport = transport
+        self.quota = quota or QuotaLedger.from_settings()
+        self.search_cache = search_cache
+        self.etag_cache = etag_cache
+        self.channel_index = channel_index
+        self.video_store = video_store or VideoStore(self.recent_videos_limit)
+        self._client: httpx.AsyncClient | None = None
+        self._semaphore: asyncio.Semaphore | None = None
+
+    @asynccontextmanager
+    async def session(self) -> AsyncIterator["AsyncYouTubeCollector"]:
+        """Open the shared HTTP client and concurrency limiter."""
+        async with httpx.AsyncClient(
+            base_url=YOUTUBE_API_BASE_URL,
+            timeout=30.0,
+            transport=self.transport,
+        ) as client:
+            self._client = client
+            self._semaphore = asyncio.Semaphore(self.concurrency)
+            try:
+                yield self
+            finally:
+                self._client = None
+                self._semaphore = None
+
+    async def _request(
+        self,
+        endpoint: str,
+        params: dict[str, Any],
+        priority: str = PRIORITY_EXPLORE,
+        headers: dict[str, str] | None = None,
+    ) -> httpx.Response:
+        """Issue a GET against a Data API endpoint under the concurrency limit."""
+        if self._client is None or self._semaphore is None:
+            raise RuntimeError("AsyncYouTubeCollector.session() is not open.")
+
+        # Charging may reserve a block of units from the database.
+        await asyncio.to_thread(self.quota.charge, f"{endpoint}.list", priority)
+        async with self._semaphore:
+            return await self._client.get(
+                f"/{endpoint}", params={**params, "key": self.api_key}, headers=headers
+            )
+
+    async def _get(
+        self, endpoint: str, params: dict[str, Any], priority: str = PRIORITY_EXPLORE
+    ) -> dict[str, Any]:
+        response = await self._request(endpoint, params, priority)
+        response.raise_for_status()
+        return response.json()
+
+    async def search_channels(
+        self, keyword: str, max_results: int = 12, force_refresh: bool = False
+    ) -> list[str]:
+        """Search channels by keyword and return list of channel IDs.
+
+        Results are served from the search cache when present and fresh.
+        """
+        if self.search_cache:
+            cached = await asyncio.to_thread(
+                self.search_cache.get, keyword, max_results, force_refresh
+            )
+            if cached is not None:
+                return cached
+
+        try:
+            response = await self._get(
+                "search",
+                {"q": keyword, "type": "channel", "part": "id", "maxResults": max_results},
+            )
+            channel_ids = [item["id"]["channelId"] for item in response.get("items", [])]
+            if self.search_cache:
+                await asyncio.to_thread(self.search_cache.put, keyword, max_results, channel_ids)
+            return channel_ids
+        except QuotaExceededError as e:
+            logger.warning("Deferred keyword search '%s': %s", keyword, e)
+            return []
+        except Exception:
+            logger.exception("Failed to search channels for keyword: %s", keyword)
+            return []
+
+    async def _get_channel_chunk(self, chunk: list[str], priority: str) -> list[YouTubeChannel]:
+        try:
+            response = await self._get(
+                "channels", {"id": ",".join(chunk), "part": CHANNEL_PARTS}, priority
+            )
+            return [parse_channel_item(item) for item in response.get("items", [])]
+        except QuotaExceededError as e:
+            logger.warning("Deferred %d channel detail lookups: %s", len(chunk), e)
+            return []
+        except Exception:
+            logger.exception("Failed to get channel details. chunk_size=%d", len(chunk))
+            return []
+
+    async def get_channel_details(
+        self, channel_ids: list[str], priority: str = PRIORITY_EXPLORE
+    ) -> list[YouTubeChannel]:
+        """Get channel details, fetching 50-ID chunks concurrently."""
+        if not channel_ids:
+            return []
+
+        chunks = [
+            channel_ids[i:i + MAX_IDS_PER_REQUEST]
+            for i in range(0, len(channel_ids), MAX_IDS_PER_REQUEST)
+        ]
+        chunk_results = await asyncio.gather(
+            *(self._get_channel_chunk(c, priority) for c in chunks)
+        )
+        return [channel for chunk in chunk_results for channel in chunk]
+
+    async def _refresh_tracked_chunk(self, chunk: list[str]) -> list[YouTubeChannel]:
+        etag = self.etag_cache.etag_for(chunk)
+        try:
+            response = await self._request(
+                "channels",
+                {"id": ",".join(chunk), "part": CHANNEL_PARTS},
+                PRIORITY_TRACKED,
+                headers={"If-None-Match": etag} if etag else None,
+            )
+            if etag and response.status_code == 304:
+                items = self.etag_cache.not_modified(chunk)
+            else:
+                response.raise_for_status()
+                data = response.json()
+                items = data.get("items", [])
+                await asyncio.to_thread(self.etag_cache.modified, chunk, data.get("etag"), items)
+        except QuotaExceededError as e:
+            logger.warning("Deferred tracked refresh of %d channels: %s", len(chunk), e)
+            return []
+        except Exception:
+            logger.exception("Failed to refresh tracked channels. chunk_size=%d", len(chunk))
+            return []
+
+        return [parse_channel_item(item) for item in items]
+
+    async def _tracked_fetches(self, tracked_ids: list[str]) -> list[Awaitable[list[YouTubeChannel]]]:
+        """One detail fetch per tracked chunk, conditional when an etag is stored."""
+        chunks = [
+            tracked_ids[i:i + MAX_IDS_PER_REQUEST]
+            for i in range(0, len(tracked_ids), MAX_IDS_PER_REQUEST)
+        ]
+        if not self.etag_cache or not tracked_ids:
+            return [self._get_channel_chunk(c, PRIORITY_TRACKED) for c in chunks]
+
+        try:
+            etag_chunks = await asyncio.to_thread(self.etag_cache.prepare, tracked_ids)
+        except Exception:
+            logger.warning("Etag lookup failed; refreshing tracked channels unconditionally.")
+            return [self._get_channel_chunk(c, PRIORITY_TRACKED) for c in chunks]
+        return [self._refresh_tracked_chunk(c) for c in etag_chunks]
+
+    async def refresh_tracked_channels(self, tracked_ids: list[str]) -> list[YouTubeChannel]:
+        """Refresh tracked channels, using If-None-Match when an etag is stored."""
+        chunk_results = await asyncio.gather(*await self._tracked_fetches(tracked_ids))
+        return [channel for chunk in chunk_results for channel in chunk]
+
+    async def _new_upload_ids(
+        self, channel: YouTubeChannel, mark: datetime | None, priority: str
+    ) -> list[str] | None:
+        """Page the uploads playlist newest-first until the high-water mark or the limit."""
+        video_ids: list[str] = []
+        params = {
+            "playlistId": channel.uploads_playlist_id,
+            "part": "contentDetails",
+            "maxResults": min(self.recent_videos_limit, 50),
+        }
+        try:
+            while True:
+                response = await self._get("playlistItems", params, priority)
+                self.video_store.count("playlist_pages")
+                ids, reached_mark = new_upload_ids(response.get("items", []), mark)
+                video_ids.extend(ids)
+                page_token = response.get("nextPageToken")
+                if reached_mark or not page_token or len(video_ids) >= self.recent_videos_limit:
+                    break
+                params = {**params, "pageToken": page_token}
+        except QuotaExceededError as e:
+            logger.warning("Deferred uploads lookup for %s: %s", channel.channel_id, e)
+            return None
+        except Exception:
+            logger.exception("Failed to fetch uploads for %s", channel.channel_id)
+            return None
+        return video_ids[:self.recent_videos_limit]
+
+    async def _get_video_chunk(self, chunk: list[str], priority: str) -> list[YouTubeVideo]:
+        try:
+            response = await self._get(
+                "videos", {"id": ",".join(chunk), "part": VIDEO_PARTS}, priority
+            )
+        except QuotaExceededError as e:
+            logger.warning("Deferred %d video detail lookups: %s", len(chunk), e)
+            return []
+        except Exception:
+            logger.exception("Failed to get video details. chunk_size=%d", len(chunk))
+            return []
+        return [parse_video_item(item) for item in response.get("items", [])]
+
+    async def get_videos(
+        self, video_ids: list[str], priority: str = PRIORITY_EXPLORE
+    ) -> dict[str, YouTubeVideo]:
+        """Fetch video details across channels, 50-ID videos.list chunks in parallel."""
+        chunks = [
+            video_ids[i:i + MAX_IDS_PER_REQUEST]
+            for i in range(0, len(video_ids), MAX_IDS_PER_REQUEST)
+        ]
+        chunk_results = await asyncio.gather(*(self._get_video_chunk(c, priority) for c in chunks))
+        return {video.video_id: video for chunk in chunk_results for video in chunk}
+
+    async def collect_recent_videos(
+        self,
+        channels: list[YouTubeChannel],
+        entity_ids: dict[str, str],
+        tracked_ids: set[str] | None = None,
+    ) -> None:
+        """Video stage: set upload_freq_days / recent_videos on channels in place.
+
+        Uploads playlists are read concurrently down to each channel's high-water
+        mark in ``scout_videos``, then the new uploads of all channels are fetched
+        together in concurrent 50-ID videos.list batches and stored.
+        """
+        if not self.video_stage_enabled:
+            return
+
+        tracked_ids = tracked_ids or set()
+        candidates = [
+            c for c in video_stage_candidates(channels, self.min_subscribers)
+            if c.channel_id in entity_ids
+        ]
+        await asyncio.to_thread(
+            self.video_store.load, [entity_ids[c.channel_id] for c in candidates]
+        )
+        playlists = await asyncio.gather(*(
+            self._new_upload_ids(
+                c,
+                self.video_store.high_water_mark(entity_ids[c.channel_id]),
+                PRIORITY_TRACKED if c.channel_id in tracked_ids else PRIORITY_EXPLORE,
+            )
+            for c in candidates
+        ))
+        video_ids_by_channel = {
+            c.channel_id: ids for c, ids in zip(candidates, playlists) if ids is not None
+        }
+
+        tracked_video_ids, other_video_ids = split_video_ids(video_ids_by_channel, tracked_ids)
+        tracked_videos, other_videos = await asyncio.gather(
+            self.get_videos(tracked_video_ids, PRIORITY_TRACKED),
+            self.get_videos(other_video_ids),
+        )
+        videos = {**tracked_videos, **other_videos}
+
+        for channel in candidates:
+            ids = video_ids_by_channel.get(channel.channel_id)
+            if ids is not None:
+                merged = self.video_store.merge(
+                    entity_ids[channel.channel_id], [videos[v] for v in ids if v in videos]
+                )
+                apply_video_stats(channel, merged, self.recent_videos_limit)
+        await asyncio.to_thread(self.video_store.flush)
+
+    @staticmethod
+    async def _emit(fetch: Awaitable[list[Any]], queue: asyncio.Queue) -> None:
+        items = await fetch
+        if items:
+            await queue.put(items)
+
+    async def _search_stage(self, keywords: list[str], id_queue: asyncio.Queue) -> None:
+        """Producer: push each keyword's channel IDs as soon as its search returns."""
+        try:
+            async with asyncio.TaskGroup() as tg:
+                for kw in keywords:
+                    tg.create_task(self._emit(self.search_channels(kw), id_queue))
+        except BaseException:
+            _close_queue(id_queue)
+            raise
+        await id_queue.put(None)
+
+    async def _detail_stage(
+        self, id_queue: asyncio.Queue, channel_queue: asyncio.Queue, exclude: set[str]
+    ) -> None:
+        """Start a channels.list chunk whenever 50 new IDs have accumulated."""
+        seen = set(exclude)
+        pending: list[str] = []
+        async with asyncio.TaskGroup() as tg:
+            while (ids := await id_queue.get()) is not None:
+                for channel_id in ids:
+                    if channel_id not in seen:
+                        seen.add(channel_id)
+                        pending.append(channel_id)
+                while len(pending) >= MAX_IDS_PER_REQUEST:
+                    chunk, pending = pending[:MAX_IDS_PER_REQUEST], pending[MAX_IDS_PER_REQUEST:]
+                    tg.create_task(self._emit(self._get_channel_chunk(chunk, PRIORITY_EXPLORE), channel_queue))
+            if pending:
+                tg.create_task(self._emit(self._get_channel_chunk(pending, PRIORITY_EXPLORE), channel_queue))
+
+    async def _fetch_stage(
+        self,
+        keywords: list[str],
+        tracked: list[str],
+        channel_queue: asyncio.Queue,
+    ) -> None:
+        """Run the tracked refresh and the search -> details chain into channel_queue."""
+        id_queue: asyncio.Queue = asyncio.Queue(maxsize=self.concurrency)
+        try:
+            async with asyncio.TaskGroup() as tg:
+                tg.create_task(self._search_stage(keywords, id_queue))
+                tg.create_task(self._detail_stage(id_queue, channel_queue, set(tracked)))
+                for fetch in await self._tracked_fetches(tracked):
+                    tg.create_task(self._emit(fetch, channel_queue))
+        except BaseException:
+            _close_queue(channel_queue)
+            raise
+        await channel_queue.put(None)
+
+    async def _save_batch(
+        self, channels: list[YouTubeChannel], tracked: set[str], result: CollectorResult
+    ) -> None:
+        errors: list[str] = []
+        entity_ids, upserts_skipped = await asyncio.to_thread(
+            save_entities, channels, errors, self.etag_cache
+        )
+        await self.collect_recent_videos(channels, entity_ids, tracked)
+        snapshot_count = await asyncio.to_thread(save_snapshots, result.run_id, channels, entity_ids, errors)
+
+        result.entity_count += len(entity_ids)
+        result.snapshot_count += snapshot_count
+        result.entity_upserts_skipped += upserts_skipped
+        result.errors.extend(errors)
+
+    async def _write_stage(
+        self, channel_queue: asyncio.Queue, tracked: set[str], result: CollectorResult
+    ) -> None:
+        """Consumer: save each detail chunk (coalescing whatever is already queued)."""
+        done = False
+        while not done:
+            batch = await channel_queue.get()
+            if batch is None:
+                break
+            while len(batch) < BULK_CHUNK_SIZE and not channel_queue.empty():
+                more = channel_queue.get_nowait()
+                if more is None:
+                    done = True
+                    break
+                batch = batch + more
+            await self._save_batch(batch, tracked, result)
+
+    async def collect_multiple_sources_async(
+        self, run_id: str, keywords: list[str], tracked_ids: list[str]
+    ) -> CollectorResult:
+        """Collect tracked and keyword channels as a streaming pipeline.
+
+        Searches feed channel IDs into a bounded queue; a detail chunk starts as
+        soon as 50 new IDs exist, and fetched channels are saved (entities, video
+        stage, snapshots) while later API chunks are still in flight. The bounded
+        queues apply backpressure when writes fall behind, so total latency is
+        close to the slowest stage rather than the sum of all stages.
+        """
+        tracked = list(dict.fromkeys(tracked_ids))
+        channel_queue: asyncio.Queue = asyncio.Queue(maxsize=self.concurrency)
+        result = CollectorResult(run_id=run_id, entity_count=0, snapshot_count=0)
+
+        async with self.session():
+            async with asyncio.TaskGroup() as tg:
+                tg.create_task(self._fetch_stage(keywords, tracked, channel_queue))
+                tg.create_task(self._write_stage(channel_queue, set(tracked), result))
+
+        return result
+
+    def collect_multiple_sources(
+        self, run_id: str, keywords: list[str], tracked_ids: list[str]
+    ) -> CollectorResult:
+        """Blocking entry point used by the orchestrator."""
+        return asyncio.run(self.collect_multiple_sources_async(run_id, keywords, tracked_ids))
+
+    async def _resolve_handle(self, lookup: DiscoveryLookup, index: ChannelIndex) -> str | None:
+        index.count("handle_lookups")
+        try:
+            response = await self._get("channels", {"forHandle": lookup.handle, "part": "id"})
+        except QuotaExceededError as e:
+            logger.warning("Deferred handle lookup '%s': %s", lookup.handle, e)
+            return None
+        except Exception:
+            logger.exception("Failed to resolve handle '%s'", lookup.handle)
+            return None
+
+        items = response.get("items", [])
+        if not items:
+            return None
+        index.count("handle_resolved")
+        index.record(lookup, items[0]["id"], "handle")
+        return items[0]["id"]
+
+    async def _resolve_by_search(self, lookup: DiscoveryLookup, index: ChannelIndex) -> str | None:
+        index.count("search_fallbacks")
+        query = lookup.name or lookup.handle
+        try:
+            response = await self._get(
+                "search", {"q": query, "type": "channel", "part": "id", "maxResults": 1}
+            )
+        except QuotaExceededError as e:
+            logger.warning("Deferred discovery search for '%s': %s", query, e)
+            return None
+        except Exception:
+            logger.exception("Failed to resolve channel for '%s'", query)
+            return None
+
+        items = response.get("items", [])
+        if not items:
+            return None
+        index.record(lookup, items[0]["id"]["channelId"], "search")
+        return items[0]["id"]["channelId"]
+
+    async def resolve_discovered_channels_async(
+        self, discovery_items: list[dict[str, Any]]
+    ) -> list[str]:
+        """Concurrent equivalent of ``YouTubeCollector.resolve_discovered_channels``.
+
+        Index hits cost nothing; uncached handles are looked up concurrently with
+        1-unit ``forHandle`` calls; only what is still unresolved falls back to search.
+        """
+        lookups = plan_discovery_lookups(discovery_items)
+        index = self.channel_index or ChannelIndex()
+        await asyncio.to_thread(index.load, lookups)
+
+        resolved: dict[DiscoveryLookup, str | None] = {lookup: index.cached(lookup) for lookup in lookups}
+
+        async with self.session():
+            pending = [l for l in lookups if resolved[l] is None and l.handle]
+            for lookup, channel_id in zip(
+                pending, await asyncio.gather(*(self._resolve_handle(l, index) for l in pending))
+            ):
+                resolved[lookup] = channel_id
+
+            pending = [l for l in lookups if resolved[l] is None]
+            for lookup, channel_id in zip(
+                pending, await asyncio.gather(*(self._resolve_by_search(l, index) for l in pending))
+            ):
+                resolved[lookup] = channel_id
+
+        resolved_ids = []
+        for lookup in lookups:
+            if resolved[lookup]:
+                resolved_ids.append(resolved[lookup])
+            else:
+                index.count("unresolved")
+
+        await asyncio.to_thread(index.flush)
+        return list(dict.fromkeys(resolved_ids))
+
+    def resolve_discovered_channels(self, discovery_items: list[dict[str, Any]]) -> list[str]:
+        """Blocking entry point used by the orchestrator."""
+        return asyncio.run(self.resolve_discovered_channels_async(discovery_items))
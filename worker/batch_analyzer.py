@@ -0,0 +1,180 @@
+"""Offline scoring through the OpenAI Batch API (analysis_mode = "batch")."""
+
+from __future__ import annotations
+
+import json
+import logging
+import time
+from datetime import datetime, timezone
+from typing import Any
+
+from config import get_settings
+from db.queries import get_analysis_batch, insert_analysis_batch, update_analysis_batch
+from models.schemas import ScoreInput, ScoreOutput
+from worker.analyzer import Analyzer
+
+logger = logging.getLogger(__name__)
+
+BATCH_ENDPOINT = "/v1/chat/completions"
+COMPLETION_WINDOW = "24h"
+TERMINAL_STATUSES = {"completed", "failed", "expired", "cancelled"}
+
+
+def build_batch_file(analyzer: Analyzer, snapshots: list[dict[str, Any]]) -> tuple[bytes, list[str]]:
+    """Render snapshots as Batch API JSONL (custom_id = entity_id).
+
+    Returns the file content and per-entity errors for snapshots that could not
+    be turned into a prompt.
+    """
+    lines = []
+    errors = []
+    for raw in snapshots:
+        entity_id = str(raw.get("entity_id", ""))
+        try:
+            prompt = analyzer.build_prompt(ScoreInput.model_validate(raw))
+        except Exception as exc:
+            errors.append(f"Analyzer skipped entity_id={entity_id}: {exc}")
+            continue
+        lines.append(json.dumps({
+            "custom_id": entity_id,
+            "method": "POST",
+            "url": BATCH_ENDPOINT,
+            "body": analyzer.score_request(prompt),
+        }, ensure_ascii=False))
+    return "\n".join(lines).encode("utf-8"), errors
+
+
+def _ended_without_output(batch: Any) -> bool:
+    return batch.status != "completed" and not batch.output_file_id
+
+
+class BatchAnalyzer:
+    """Submits a run's scoring prompts as one OpenAI batch and ingests the results.
+
+    The batch id is stored in ``scout_analysis_batches`` right after submission,
+    so a restarted process calling ``run`` for the same run resumes polling the
+    existing batch instead of submitting a new one; a stored batch that OpenAI
+    ended without output (failed, expired, cancelled) is replaced by a new
+    submission. Results go through the same ``ScoreOutput`` validation and
+    ``insert_score`` path as ``analyze_batch``.
+    """
+
+    def __init__(self, analyzer: Analyzer, poll_interval: float | None = None) -> None:
+        self.analyzer = analyzer
+        self.client = analyzer.client
+        self.poll_interval = (
+            poll_interval if poll_interval is not None else get_settings().batch_poll_interval_seconds
+        )
+        self.stats: dict[str, Any] = {}
+
+    def submit(self, run_id: str, snapshots: list[dict[str, Any]]) -> tuple[dict[str, Any] | None, list[str]]:
+        """Upload the JSONL file, create the batch and record it."""
+        content, errors = build_batch_file(self.analyzer, snapshots)
+        if not content:
+            return None, errors
+
+        input_file = self.client.files.create(file=(f"scout-{run_id}.jsonl", content), purpose="batch")
+        batch = self.client.batches.create(
+            input_file_id=input_file.id,
+            endpoint=BATCH_ENDPOINT,
+            completion_window=COMPLETION_WINDOW,
+            metadata={"run_id": run_id},
+        )
+        request_count = len(snapshots) - len(errors)
+        logger.info("Submitted OpenAI batch %s for run_id=%s (%d requests)", batch.id, run_id, request_count)
+        record = insert_analysis_batch(
+            run_id=run_id,
+            openai_batch_id=batch.id,
+            input_file_id=input_file.id,
+            status=batch.status,
+            request_count=request_count,
+        )
+        return record, errors
+
+    def wait(self, openai_batch_id: str) -> Any:
+        """Poll until the batch reaches a terminal status, recording progress."""
+        while True:
+            batch = self.client.batches.retrieve(openai_batch_id)
+            update_analysis_batch(openai_batch_id, {
+                "status": batch.status,
+                "output_file_id": batch.output_file_id,
+                "error_file_id": batch.error_file_id,
+            })
+            if batch.status in TERMINAL_STATUSES:
+                return batch
+            logger.info("OpenAI batch %s is %s; polling again in %ss", openai_batch_id, batch.status, self.poll_interval)
+            time.sleep(self.poll_interval)
+
+    def _read_lines(self, file_id: str | None) -> list[dict[str, Any]]:
+        if not file_id:
+            return []
+        text = self.client.files.content(file_id).text
+        return [json.loads(line) for line in text.splitlines() if line.strip()]
+
+    def ingest(self, run_id: str, batch: Any) -> list[str]:
+        """Validate and save every result line; return per-entity errors."""
+        errors = []
+        saved = 0
+        for line in self._read_lines(batch.output_file_id) + self._read_lines(batch.error_file_id):
+            entity_id = line.get("custom_id", "")
+            response = line.get("response") or {}
+            try:
+                if line.get("error") or response.get("status_code") != 200:
+                    raise RuntimeError(line.get("error") or f"status_code={response.get('status_code')}")
+                body = response["body"]
+                self.analyzer.usage.record("batch", body.get("model"), body.get("usage"), 0.0)
+                content = body["choices"][0]["message"]["content"] or "{}"
+                score_output = ScoreOutput.model_validate(json.loads(content))
+                self.analyzer.save_score(run_id, entity_id, score_output)
+                saved += 1
+            except Exception as exc:
+                msg = f"Analyzer skipped entity_id={entity_id}: {exc}"
+                logger.exception(msg)
+                errors.append(msg)
+
+        update_analysis_batch(batch.id, {"ingested_at": datetime.now(timezone.utc).isoformat()})
+        self.stats["saved"] = saved
+        return errors
+
+    def run(self, run_id: str, snapshots: list[dict[str, Any]]) -> list[str]:
+        """Submit (or resume) the run's batch, wait for it and ingest the results."""
+        errors: list[str] = []
+        record = get_analysis_batch(run_id)
+        if record and record.get("ingested_at"):
+            logger.info("OpenAI batch %s for run_id=%s was already ingested.", record["openai_batch_id"], run_id)
+            self.stats.update({"batch_id": record["openai_batch_id"], "resumed": True})
+            return errors
+
+        batch = None
+        if record:
+            logger.info("Resuming OpenAI batch %s for run_id=%s", record["openai_batch_id"], run_id)
+            self.stats["resumed"] = True
+            batch = self.wait(record["openai_batch_id"])
+            if _ended_without_output(batch):
+                # A dead batch would fail every later resume; the new record replaces it.
+                logger.warning(
+                    "OpenAI batch %s for run_id=%s ended with status %s; submitting a new batch.",
+                    batch.id, run_id, batch.status,
+                )
+                self.stats["replaced_batch_id"] = batch.id
+                batch = None
+        else:
+            self.stats["resumed"] = False
+
+        if batch is None:
+            record, errors = self.submit(run_id, snapshots)
+            if record is None:
+                return errors
+            batch = self.wait(record["openai_batch_id"])
+
+        self.stats["batch_id"] = record["openai_batch_id"]
+        self.stats["requests"] = record.get("request_count")
+        self.stats["status"] = batch.status
+        if _ended_without_output(batch):
+            errors.append(f"OpenAI batch {batch.id} ended with status {batch.status}")
+            return errors
+
+        return errors + self.ingest(run_id, batch)
+
+    def summary(self) -> dict[str, Any]:
+        return dict(self.stats)
@@ -0,0 +1,132 @@
+"""Persistent handle/name -> channel ID index for discovered channels."""
+
+from __future__ import annotations
+
+import logging
+import threading
+from collections import Counter
+from typing import Any, NamedTuple
+
+from db.queries import get_channel_index, upsert_channel_index
+
+logger = logging.getLogger(__name__)
+
+
+class DiscoveryLookup(NamedTuple):
+    """A discovered creator to resolve: normalized handle and/or bare name."""
+
+    handle: str | None
+    name: str | None
+
+
+def normalize_handle(value: Any) -> str | None:
+    """Return '@handle' (lowercased) if value looks like a YouTube handle."""
+
+    if not isinstance(value, str):
+        return None
+    handle = value.strip()
+    if not handle.startswith("@") or len(handle) < 2 or any(c.isspace() for c in handle):
+        return None
+    return handle.lower()
+
+
+def handle_key(handle: str) -> str:
+    """Index key for a normalized handle."""
+
+    return f"handle:{handle}"
+
+
+def name_key(name: str) -> str:
+    """Index key for a bare channel/creator name."""
+
+    return f"name:{' '.join(name.split()).lower()}"
+
+
+def plan_discovery_lookups(discovery_items: list[dict[str, Any]]) -> list[DiscoveryLookup]:
+    """Turn DiscoveryWorker items into deduplicated lookups."""
+
+    lookups = []
+    seen = set()
+    for item in discovery_items:
+        handle = normalize_handle(item.get("handle"))
+        name = (item.get("name") or "").strip() or None
+        if not handle and not name:
+            continue
+
+        key = handle_key(handle) if handle else name_key(name)
+        if key in seen:
+            continue
+        seen.add(key)
+        lookups.append(DiscoveryLookup(handle, name))
+    return lookups
+
+
+class ChannelIndex:
+    """Run-scoped view of ``scout_channel_index``.
+
+    ``load`` fetches every known key in one query; new resolutions are buffered
+    with ``record`` and written back in one request by ``flush``.
+    """
+
+    def __init__(self) -> None:
+        self.stats: Counter[str] = Counter()
+        self._known: dict[str, str] = {}
+        self._pending: dict[str, dict[str, str]] = {}
+        self._lock = threading.Lock()
+
+    def load(self, lookups: list[DiscoveryLookup]) -> None:
+        keys = []
+        for lookup in lookups:
+            if lookup.handle:
+                keys.append(handle_key(lookup.handle))
+            if lookup.name:
+                keys.append(name_key(lookup.name))
+        try:
+            self._known.update(get_channel_index(keys))
+        except Exception:
+            logger.warning("Channel index lookup failed; resolving %d items via API.", len(lookups))
+
+    def cached(self, lookup: DiscoveryLookup) -> str | None:
+        """Return an indexed channel ID for the lookup, preferring the handle."""
+
+        for key in (
+            handle_key(lookup.handle) if lookup.handle else None,
+            name_key(lookup.name) if lookup.name else None,
+        ):
+            if key and key in self._known:
+                self.count("index_hits")
+                return self._known[key]
+        return None
+
+    def record(self, lookup: DiscoveryLookup, channel_id: str, source: str) -> None:
+        """Remember a fresh resolution under every key of the lookup."""
+
+        with self._lock:
+            for key in (
+                handle_key(lookup.handle) if lookup.handle else None,
+                name_key(lookup.name) if lookup.name else None,
+            ):
+                if key:
+                    self._known[key] = channel_id
+                    self._pending[key] = {"lookup_key": key, "channel_id": channel_id, "source": source}
+
+    def count(self, stat: str) -> None:
+        with self._lock:
+            self.stats[stat] += 1
+
+    def flush(self) -> None:
+        with self._lock:
+            rows = list(self._pending.values())
+            self._pending.clear()
+        try:
+            upsert_channel_index(rows)
+        except Exception:
+            logger.warning("Failed to store %d channel index rows.", len(rows))
+
+    def summary(self) -> dict[str, int]:
+        """Return resolution counters for scout_runs.summary."""
+
+        return {
+            key: self.stats[key]
+            for key in ("index_hits", "handle_lookups", "handle_resolved", "search_fallbacks", "unresolved")
+        }
@@ -0,0 +1,73 @@
+"""Per-run stage checkpoints backed by ``scout_run_checkpoints``."""
+
+from __future__ import annotations
+
+import logging
+import threading
+from typing import Any
+
+from db.queries import get_run_checkpoints, upsert_run_checkpoint
+
+logger = logging.getLogger(__name__)
+
+
+class RunCancelledError(RuntimeError):
+    """Raised when the run's claim was lost and another worker now owns it."""
+
+
+class RunCheckpoints:
+    """Completed stage outputs of one run.
+
+    ``load`` reads every checkpoint of the run in one query; a stage whose
+    output is returned by ``get`` is restored instead of executed again.
+    ``save`` writes the output as soon as the stage completes. Checkpoint
+    failures are logged and only cost a later resume the stage.
+
+    ``cancel`` is set by the queue worker when the run is reclaimed; from then
+    on ``check_cancelled`` and ``save`` raise ``RunCancelledError`` so the
+    stale attempt stops at the next stage boundary without writing.
+    """
+
+    def __init__(self, run_id: str, cancel: threading.Event | None = None) -> None:
+        self.run_id = run_id
+        self.cancel = cancel
+        self.restored: list[str] = []
+        self.saved: list[str] = []
+        # True when an earlier attempt of the run completed at least one stage.
+        self.resuming = False
+        self._outputs: dict[str, dict[str, Any]] = {}
+
+    def load(self) -> None:
+        try:
+            self._outputs = get_run_checkpoints(self.run_id)
+        except Exception:
+            logger.warning("Checkpoint lookup failed for run_id=%s; running every stage.", self.run_id)
+            self._outputs = {}
+        self.resuming = bool(self._outputs)
+        if self.resuming:
+            logger.info("Resuming run_id=%s after stages: %s", self.run_id, ", ".join(sorted(self._outputs)))
+
+    def check_cancelled(self) -> None:
+        if self.cancel is not None and self.cancel.is_set():
+            raise RunCancelledError(f"run_id={self.run_id} was reclaimed by another worker")
+
+    def get(self, stage: str) -> dict[str, Any] | None:
+        output = self._outputs.get(stage)
+        if output is not None:
+            self.restored.append(stage)
+        return output
+
+    def save(self, stage: str, output: dict[str, Any]) -> None:
+        self.check_cancelled()
+        try:
+            upsert_run_checkpoint(self.run_id, stage, output)
+        except Exception:
+            logger.warning("Failed to checkpoint stage %s for run_id=%s.", stage, self.run_id)
+            return
+        self._outputs[stage] = output
+        self.saved.append(stage)
+
+    def summary(self) -> dict[str, list[str]]:
+        """Return restored and newly saved stages for scout_runs.summary."""
+
+        return {"restored": list(self.restored), "saved": list(self.saved)}
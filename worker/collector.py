@@ -1,27 +1,305 @@
 """Collector worker for Scout System."""
 
 import logging
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 from typing import Any
 
 from googleapiclient.discovery import build
+from googleapiclient.errors import HttpError
 
 from config import get_settings
-from db.queries import upsert_entity, insert_snapshot
+from db.queries import (
+    BULK_CHUNK_SIZE,
+    upsert_entity,
+    upsert_entities_bulk,
+    insert_snapshot,
+    insert_snapshots_bulk,
+)
 from models.schemas import YouTubeChannel, YouTubeVideo, CollectorResult
+from worker.quota import PRIORITY_EXPLORE, PRIORITY_TRACKED, QuotaExceededError, QuotaLedger
+from worker.channel_index import ChannelIndex, DiscoveryLookup, plan_discovery_lookups
+from worker.etag_cache import EtagCache
+from worker.search_cache import SearchCache
+from worker.video_store import VideoStore, new_upload_ids
 
 logger = logging.getLogger(__name__)
 
+# contentDetails carries the uploads playlist ID at no extra quota cost.
+CHANNEL_PARTS = "snippet,statistics,contentDetails"
+VIDEO_PARTS = "snippet,contentDetails,liveStreamingDetails"
+MAX_IDS_PER_REQUEST = 50
+
+
+def parse_channel_item(item: dict[str, Any]) -> YouTubeChannel:
+    """Convert a channels.list item into a YouTubeChannel."""
+    snippet = item.get("snippet", {})
+    stats = item.get("statistics", {})
+    uploads = item.get("contentDetails", {}).get("relatedPlaylists", {}).get("uploads")
+    if not uploads and item["id"].startswith("UC"):
+        # The uploads playlist of channel UCxxxx is UUxxxx.
+        uploads = "UU" + item["id"][2:]
+
+    return YouTubeChannel(
+        channel_id=item["id"],
+        title=snippet.get("title", ""),
+        description=snippet.get("description"),
+        published_at=snippet.get("publishedAt"),
+        subscriber_count=int(stats.get("subscriberCount", 0)),
+        view_count=int(stats.get("viewCount", 0)),
+        video_count=int(stats.get("videoCount", 0)),
+        country=snippet.get("country"),
+        etag=item.get("etag"),
+        uploads_playlist_id=uploads,
+    )
+
+
+def parse_video_item(item: dict[str, Any]) -> YouTubeVideo:
+    """Convert a videos.list item into a YouTubeVideo and identify type (normal/live/shorts)."""
+    snippet = item["snippet"]
+    details = item["contentDetails"]
+    duration = details.get("duration", "")
+
+    # Determine type
+    v_type = "normal"
+    if item.get("liveStreamingDetails"):
+        v_type = "live"
+    else:
+        # Simple duration check for shorts (PT#S or PT#M#S)
+        if "M" not in duration and "H" not in duration:
+            if "S" in duration:
+                sec_str = duration.split("T")[-1].replace("S", "")
+                if sec_str and sec_str.isdigit() and int(sec_str) < 60:
+                    v_type = "shorts"
+
+    return YouTubeVideo(
+        video_id=item["id"],
+        published_at=datetime.fromisoformat(snippet["publishedAt"].replace("Z", "+00:00")),
+        video_type=v_type,
+        title=snippet.get("title"),
+        duration=duration or None,
+    )
+
+
+def calculate_upload_interval_days(videos: list[YouTubeVideo], now: datetime | None = None) -> float | None:
+    """Average days per upload over the window from the oldest recent video to now.
+
+    Measuring up to ``now`` (not to the newest video) makes the value grow when a
+    channel stops posting, which is what the activity filter in should_analyze needs.
+    """
+    if not videos:
+        return None
+
+    now = now or datetime.now(timezone.utc)
+    oldest = min(v.published_at for v in videos)
+    days = max((now - oldest).total_seconds() / 86400, 0.0)
+    return round(days / len(videos), 1)
+
+
+def summarize_recent_videos(videos: list[YouTubeVideo], limit: int) -> list[dict[str, Any]]:
+    """Compact newest-first video list stored on the snapshot and used in prompts."""
+    newest = sorted(videos, key=lambda v: v.published_at, reverse=True)[:limit]
+    return [
+        {
+            "video_id": v.video_id,
+            "title": v.title,
+            "video_type": v.video_type,
+            "published_at": v.published_at.isoformat(),
+        }
+        for v in newest
+    ]
+
+
+def apply_video_stats(channel: YouTubeChannel, videos: list[YouTubeVideo], limit: int) -> None:
+    """Set upload_freq_days and recent_videos on a channel from its recent uploads."""
+    channel.upload_freq_days = calculate_upload_interval_days(videos)
+    channel.recent_videos = summarize_recent_videos(videos, limit)
+
+
+def video_stage_candidates(channels: list[YouTubeChannel], min_subscribers: int) -> list[YouTubeChannel]:
+    """Channels worth a video lookup: they have uploads and pass the subscriber screen.
+
+    Channels below MIN_SUBSCRIBERS are skipped by should_analyze anyway, so their
+    videos would never reach a prompt.
+    """
+    return [
+        c for c in channels
+        if c.uploads_playlist_id
+        and (c.video_count or 0) > 0
+        and (c.subscriber_count or 0) >= min_subscribers
+    ]
+
+
+def split_video_ids(
+    video_ids_by_channel: dict[str, list[str]], tracked_ids: set[str]
+) -> tuple[list[str], list[str]]:
+    """Split per-channel video IDs into (tracked, other) lists for quota priority."""
+    tracked, other = [], []
+    for channel_id, ids in video_ids_by_channel.items():
+        (tracked if channel_id in tracked_ids else other).extend(ids)
+    return tracked, other
+
+
+def _entity_row(channel: YouTubeChannel) -> dict[str, Any]:
+    return {
+        "platform_id": channel.channel_id,
+        "channel_title": channel.title,
+        "channel_description": channel.description,
+        "country": channel.country,
+        "published_at": channel.published_at.isoformat() if channel.published_at else None,
+        "etag": channel.etag,
+    }
+
+
+def _snapshot_row(channel: YouTubeChannel, entity_id: str) -> dict[str, Any]:
+    return {
+        "entity_id": entity_id,
+        "subscriber_count": channel.subscriber_count,
+        "view_count": channel.view_count,
+        "video_count": channel.video_count,
+        "upload_freq_days": channel.upload_freq_days,
+        "recent_videos_json": channel.recent_videos,
+    }
+
+
+def _upsert_entities(channels: list[YouTubeChannel], errors: list[str]) -> dict[str, str]:
+    """Bulk upsert entities, falling back to per-row upserts if the batch fails."""
+    rows = [_entity_row(channel) for channel in channels]
+    try:
+        entity_ids = upsert_entities_bulk("youtube", rows)
+    except Exception:
+        logger.warning("Bulk entity upsert failed; retrying %d rows individually.", len(rows))
+    else:
+        for row in rows:
+            if row["platform_id"] not in entity_ids:
+                errors.append(f"Failed to process channel {row['platform_id']}: no entity id returned")
+        return entity_ids
+
+    entity_ids = {}
+    for row in rows:
+        try:
+            entity_ids[row["platform_id"]] = upsert_entity(platform="youtube", **row)
+        except Exception as e:
+            errors.append(f"Failed to process channel {row['platform_id']}: {str(e)}")
+    return entity_ids
+
+
+def _insert_snapshots(
+    run_id: str, rows: list[dict[str, Any]], errors: list[str]
+) -> dict[str, str]:
+    """Bulk insert snapshots, falling back to per-row inserts if the batch fails."""
+    try:
+        return insert_snapshots_bulk(run_id, rows)
+    except Exception:
+        logger.warning("Bulk snapshot insert failed; retrying %d rows individually.", len(rows))
+
+    snapshot_ids = {}
+    for row in rows:
+        try:
+            snapshot_ids[row["entity_id"]] = insert_snapshot(run_id=run_id, **row)
+        except Exception as e:
+            errors.append(f"Failed to insert snapshot for entity {row['entity_id']}: {str(e)}")
+    return snapshot_ids
+
+
+def save_entities(
+    channels: list[YouTubeChannel], errors: list[str], etag_cache: EtagCache | None = None
+) -> tuple[dict[str, str], int]:
+    """Upsert entities in bulk and return (platform_id -> entity UUID, upserts skipped).
+
+    Writes are sent in chunks of ``BULK_CHUNK_SIZE``. A failing chunk is retried
+    row by row so that per-channel errors are appended to ``errors``. Channels
+    whose item etag is unchanged (per ``etag_cache``) reuse their stored id.
+    """
+    entity_ids: dict[str, str] = {}
+    upserts_skipped = 0
+
+    for i in range(0, len(channels), BULK_CHUNK_SIZE):
+        changed = []
+        for channel in channels[i:i + BULK_CHUNK_SIZE]:
+            unchanged_id = etag_cache.unchanged_entity_id(channel) if etag_cache else None
+            if unchanged_id:
+                entity_ids[channel.channel_id] = unchanged_id
+                upserts_skipped += 1
+            else:
+                changed.append(channel)
+
+        if changed:
+            entity_ids.update(_upsert_entities(changed, errors))
+
+    return entity_ids, upserts_skipped
+
+
+def save_snapshots(
+    run_id: str, channels: list[YouTubeChannel], entity_ids: dict[str, str], errors: list[str]
+) -> int:
+    """Insert snapshots in bulk for channels that have an entity; return the count."""
+    snapshot_rows = [
+        _snapshot_row(channel, entity_ids[channel.channel_id])
+        for channel in channels
+        if channel.channel_id in entity_ids
+    ]
+
+    snapshot_count = 0
+    for i in range(0, len(snapshot_rows), BULK_CHUNK_SIZE):
+        snapshot_ids = _insert_snapshots(run_id, snapshot_rows[i:i + BULK_CHUNK_SIZE], errors)
+        snapshot_count += len(snapshot_ids)
+    return snapshot_count
+
+
+def save_channels(
+    run_id: str, channels: list[YouTubeChannel], etag_cache: EtagCache | None = None
+) -> CollectorResult:
+    """Upsert entities and insert snapshots for collected channels in bulk."""
+    errors: list[str] = []
+    entity_ids, upserts_skipped = save_entities(channels, errors, etag_cache)
+    snapshot_count = save_snapshots(run_id, channels, entity_ids, errors)
+
+    return CollectorResult(
+        run_id=run_id,
+        entity_count=len(entity_ids),
+        snapshot_count=snapshot_count,
+        errors=errors,
+        entity_upserts_skipped=upserts_skipped,
+    )
+
 
 class YouTubeCollector:
     """Collector for YouTube Data API."""
 
-    def __init__(self):
+    def __init__(
+        self,
+        quota: QuotaLedger | None = None,
+        search_cache: SearchCache | None = None,
+        etag_cache: EtagCache | None = None,
+        channel_index: ChannelIndex | None = None,
+        video_store: VideoStore | None = None,
+    ):
         settings = get_settings()
         self.youtube = build("youtube", "v3", developerKey=settings.youtube_api_key)
+        self.video_stage_enabled = settings.video_stage_enabled
+        self.recent_videos_limit = settings.recent_videos_per_channel
+        self.min_subscribers = settings.min_subscribers
+        self.quota = quota or QuotaLedger.from_settings()
+        self.search_cache = search_cache
+        self.etag_cache = etag_cache
+        self.channel_index = channel_index
+        self.video_store = video_store or VideoStore(self.recent_videos_limit)
+
+    def _execute(self, endpoint: str, request: Any, priority: str = PRIORITY_EXPLORE) -> dict[str, Any]:
+        """Charge the quota ledger, then execute a googleapiclient request."""
+        self.quota.charge(endpoint, priority)
+        return request.execute()
+
+    def search_channels(self, keyword: str, max_results: int = 12, force_refresh: bool = False) -> list[str]:
+        """Search channels by keyword and return list of channel IDs.
+
+        Results are served from the search cache when present and fresh.
+        """
+        if self.search_cache:
+            cached = self.search_cache.get(keyword, max_results, force_refresh)
+            if cached is not None:
+                return cached
 
-    def search_channels(self, keyword: str, max_results: int = 12) -> list[str]:
-        """Search channels by keyword and return list of channel IDs."""
         try:
             request = self.youtube.search().list(
                 q=keyword,
@@ -29,48 +307,88 @@ class YouTubeCollector:
                 part="id",
                 maxResults=max_results
             )
-            response = request.execute()
+            response = self._execute("search.list", request)
             channel_ids = [item["id"]["channelId"] for item in response.get("items", [])]
+            if self.search_cache:
+                self.search_cache.put(keyword, max_results, channel_ids)
             return channel_ids
+        except QuotaExceededError as e:
+            logger.warning("Deferred keyword search '%s': %s", keyword, e)
+            return []
         except Exception:
             logger.exception("Failed to search channels for keyword: %s", keyword)
             return []
 
-    def get_channel_details(self, channel_ids: list[str]) -> list[YouTubeChannel]:
+    def get_channel_details(
+        self, channel_ids: list[str], priority: str = PRIORITY_EXPLORE
+    ) -> list[YouTubeChannel]:
         """Get detailed information for a list of channel IDs."""
         if not channel_ids:
             return []
 
-        try:
-            # YouTube API allows up to 50 IDs per request
-            results = []
-            for i in range(0, len(channel_ids), 50):
-                chunk = channel_ids[i:i+50]
+        # YouTube API allows up to 50 IDs per request
+        results = []
+        for i in range(0, len(channel_ids), 50):
+            chunk = channel_ids[i:i+50]
+            try:
                 request = self.youtube.channels().list(
                     id=",".join(chunk),
-                    part="snippet,statistics"
+                    part=CHANNEL_PARTS
                 )
-                response = request.execute()
-
-                for item in response.get("items", []):
-                    snippet = item.get("snippet", {})
-                    stats = item.get("statistics", {})
-
-                    results.append(YouTubeChannel(
-                        channel_id=item["id"],
-                        title=snippet.get("title", ""),
-                        description=snippet.get("description"),
-                        published_at=snippet.get("publishedAt"),
-                        subscriber_count=int(stats.get("subscriberCount", 0)),
-                        view_count=int(stats.get("viewCount", 0)),
-                        video_count=int(stats.get("videoCount", 0)),
-                        country=snippet.get("country"),
-                    ))
-            return results
-        except Exception:
-            logger.exception("Failed to get channel details.")
+                response = self._execute("channels.list", request, priority)
+            except QuotaExceededError as e:
+                logger.warning("Deferred %d channel detail lookups: %s", len(channel_ids) - i, e)
+                break
+            except Exception:
+                logger.exception("Failed to get channel details. chunk_size=%d", len(chunk))
+                continue
+
+            for item in response.get("items", []):
+                results.append(parse_channel_item(item))
+        return results
+
+    def refresh_tracked_channels(self, tracked_ids: list[str]) -> list[YouTubeChannel]:
+        """Refresh tracked channels, using If-None-Match when an etag is stored."""
+        if not self.etag_cache:
+            return self.get_channel_details(tracked_ids, priority=PRIORITY_TRACKED)
+        if not tracked_ids:
             return []
 
+        try:
+            chunks = self.etag_cache.prepare(tracked_ids)
+        except Exception:
+            logger.warning("Etag lookup failed; refreshing tracked channels unconditionally.")
+            return self.get_channel_details(tracked_ids, priority=PRIORITY_TRACKED)
+
+        results = []
+        for chunk in chunks:
+            etag = self.etag_cache.etag_for(chunk)
+            try:
+                request = self.youtube.channels().list(
+                    id=",".join(chunk),
+                    part=CHANNEL_PARTS
+                )
+                if etag:
+                    request.headers["If-None-Match"] = etag
+                response = self._execute("channels.list", request, PRIORITY_TRACKED)
+                items = response.get("items", [])
+                self.etag_cache.modified(chunk, response.get("etag"), items)
+            except HttpError as e:
+                if not (etag and e.resp.status == 304):
+                    logger.exception("Failed to refresh tracked channels. chunk_size=%d", len(chunk))
+                    continue
+                items = self.etag_cache.not_modified(chunk)
+            except QuotaExceededError as e:
+                logger.warning("Deferred tracked refresh of %d channels: %s", len(chunk), e)
+                break
+            except Exception:
+                logger.exception("Failed to refresh tracked channels. chunk_size=%d", len(chunk))
+                continue
+
+            for item in items:
+                results.append(parse_channel_item(item))
+        return results
+
     def get_recent_videos(self, channel_id: str, max_results: int = 10) -> list[YouTubeVideo]:
         """Fetch recent videos and identify type (normal/live/shorts)."""
         try:
@@ -79,7 +397,7 @@ class YouTubeCollector:
                 part="snippet,contentDetails",
                 maxResults=max_results * 2, # Fetch more to reliably get videos
             )
-            response = request.execute()
+            response = self._execute("activities.list", request, PRIORITY_TRACKED)
             
             video_ids = [
                 item["contentDetails"]["upload"]["videoId"]
@@ -93,39 +411,102 @@ class YouTubeCollector:
             # Get details for duration and live info
             details_req = self.youtube.videos().list(
                 id=",".join(video_ids[:max_results]),
-                part="snippet,contentDetails,liveStreamingDetails"
+                part=VIDEO_PARTS
             )
-            details_res = details_req.execute()
+            details_res = self._execute("videos.list", details_req, PRIORITY_TRACKED)
             
-            videos = []
-            for v in details_res.get("items", []):
-                snippet = v["snippet"]
-                details = v["contentDetails"]
-                
-                # Determine type
-                v_type = "normal"
-                if v.get("liveStreamingDetails"):
-                    v_type = "live"
-                else:
-                    # Simple duration check for shorts (PT#S or PT#M#S)
-                    duration = details.get("duration", "")
-                    if "M" not in duration and "H" not in duration:
-                        if "S" in duration:
-                            sec_str = duration.split("T")[-1].replace("S", "")
-                            if sec_str and sec_str.isdigit() and int(sec_str) < 60:
-                                v_type = "shorts"
-
-                videos.append(YouTubeVideo(
-                    video_id=v["id"],
-                    published_at=datetime.fromisoformat(snippet["publishedAt"].replace("Z", "+00:00")),
-                    video_type=v_type
-                ))
-                
-            return videos
+            return [parse_video_item(v) for v in details_res.get("items", [])]
         except Exception as e:
             logger.error(f"Error fetching videos for {channel_id}: {e}")
             return []
 
+    def _new_upload_ids(self, playlist_id: str, mark: datetime | None, priority: str) -> list[str]:
+        """Page the uploads playlist newest-first until the high-water mark or the limit."""
+        video_ids: list[str] = []
+        page_token = None
+        while True:
+            request = self.youtube.playlistItems().list(
+                playlistId=playlist_id,
+                part="contentDetails",
+                maxResults=min(self.recent_videos_limit, 50),
+                pageToken=page_token,
+            )
+            response = self._execute("playlistItems.list", request, priority)
+            self.video_store.count("playlist_pages")
+            ids, reached_mark = new_upload_ids(response.get("items", []), mark)
+            video_ids.extend(ids)
+            page_token = response.get("nextPageToken")
+            if reached_mark or not page_token or len(video_ids) >= self.recent_videos_limit:
+                return video_ids[:self.recent_videos_limit]
+
+    def get_videos(self, video_ids: list[str], priority: str = PRIORITY_EXPLORE) -> dict[str, YouTubeVideo]:
+        """Fetch video details across channels, 50 IDs per videos.list call."""
+        videos = {}
+        for i in range(0, len(video_ids), MAX_IDS_PER_REQUEST):
+            chunk = video_ids[i:i + MAX_IDS_PER_REQUEST]
+            try:
+                request = self.youtube.videos().list(id=",".join(chunk), part=VIDEO_PARTS)
+                response = self._execute("videos.list", request, priority)
+            except QuotaExceededError as e:
+                logger.warning("Deferred %d video detail lookups: %s", len(video_ids) - i, e)
+                break
+            except Exception:
+                logger.exception("Failed to get video details. chunk_size=%d", len(chunk))
+                continue
+
+            for item in response.get("items", []):
+                video = parse_video_item(item)
+                videos[video.video_id] = video
+        return videos
+
+    def collect_recent_videos(
+        self,
+        channels: list[YouTubeChannel],
+        entity_ids: dict[str, str],
+        tracked_ids: set[str] | None = None,
+    ) -> None:
+        """Video stage: set upload_freq_days / recent_videos on channels in place.
+
+        Each channel's uploads playlist is read only down to its high-water mark in
+        ``scout_videos``; details for the new uploads of all channels are then
+        fetched together in 50-ID videos.list batches and stored.
+        """
+        if not self.video_stage_enabled:
+            return
+
+        tracked_ids = tracked_ids or set()
+        candidates = [
+            c for c in video_stage_candidates(channels, self.min_subscribers)
+            if c.channel_id in entity_ids
+        ]
+        self.video_store.load([entity_ids[c.channel_id] for c in candidates])
+
+        video_ids_by_channel: dict[str, list[str]] = {}
+        for channel in candidates:
+            priority = PRIORITY_TRACKED if channel.channel_id in tracked_ids else PRIORITY_EXPLORE
+            mark = self.video_store.high_water_mark(entity_ids[channel.channel_id])
+            try:
+                video_ids_by_channel[channel.channel_id] = self._new_upload_ids(
+                    channel.uploads_playlist_id, mark, priority
+                )
+            except QuotaExceededError as e:
+                logger.warning("Deferred uploads lookup for %s: %s", channel.channel_id, e)
+            except Exception as e:
+                logger.error(f"Error fetching uploads for {channel.channel_id}: {e}")
+
+        tracked_video_ids, other_video_ids = split_video_ids(video_ids_by_channel, tracked_ids)
+        videos = self.get_videos(tracked_video_ids, PRIORITY_TRACKED)
+        videos.update(self.get_videos(other_video_ids))
+
+        for channel in candidates:
+            ids = video_ids_by_channel.get(channel.channel_id)
+            if ids is not None:
+                merged = self.video_store.merge(
+                    entity_ids[channel.channel_id], [videos[v] for v in ids if v in videos]
+                )
+                apply_video_stats(channel, merged, self.recent_videos_limit)
+        self.video_store.flush()
+
     def calculate_upload_frequency(self, videos: list[YouTubeVideo]) -> float:
         """Calculate average uploads per week based on recent videos."""
         if len(videos) < 2:
@@ -145,58 +526,29 @@ class YouTubeCollector:
         return round(freq, 2)
 
     def collect_and_save(self, run_id: str, keywords: list[str]) -> CollectorResult:
-        """Main entry point for collection and saving to DB."""
-        entity_count = 0
-        snapshot_count = 0
-        errors = []
-
-        all_channel_ids = set()
-        for kw in keywords:
-            ids = self.search_channels(kw)
-            all_channel_ids.update(ids)
-
-        channels = self.get_channel_details(list(all_channel_ids))
-
-        for channel in channels:
-            try:
-                # 1. Upsert Entity
-                entity_uuid = upsert_entity(
-                    platform="youtube",
-                    platform_id=channel.channel_id,
-                    channel_title=channel.title,
-                    channel_description=channel.description,
-                    country=channel.country,
-                    published_at=channel.published_at.isoformat() if channel.published_at else None
-                )
-                entity_count += 1
-
-                # 2. Insert Snapshot
-                insert_snapshot(
-                    run_id=run_id,
-                    entity_id=entity_uuid,
-                    subscriber_count=channel.subscriber_count,
-                    view_count=channel.view_count,
-                    video_count=channel.video_count
-                )
-                snapshot_count += 1
-
-                # NOTE: Upload frequency calculation (videos.list) will consume more quota.
-                # In Phase 2, we might skip it or limit it to avoid quota exhaustion.
-                # For now, it's not saved in snapshots table (schema doesn't have it).
-
-            except Exception as e:
-                errors.append(f"Failed to process channel {channel.channel_id}: {str(e)}")
+        """Keyword-only collection; same pipeline as ``collect_multiple_sources``."""
+        return self.collect_multiple_sources(run_id, keywords, [])
+
+    def save_with_videos(
+        self, run_id: str, channels: list[YouTubeChannel], tracked_ids: set[str] | None = None
+    ) -> CollectorResult:
+        """Save entities, run the video stage against their stored videos, then snapshots."""
+        errors: list[str] = []
+        entity_ids, upserts_skipped = save_entities(channels, errors, self.etag_cache)
+        self.collect_recent_videos(channels, entity_ids, tracked_ids)
+        snapshot_count = save_snapshots(run_id, channels, entity_ids, errors)
 
         return CollectorResult(
             run_id=run_id,
-            entity_count=entity_count,
+            entity_count=len(entity_ids),
             snapshot_count=snapshot_count,
-            errors=errors
+            errors=errors,
+            entity_upserts_skipped=upserts_skipped,
         )
 
     def get_channel_details_by_platform_ids(self, platform_ids: list[str]) -> list[YouTubeChannel]:
         """Fetch channel details for a list of platform (YouTube) IDs."""
-        return self.get_channel_details(platform_ids)
+        return self.get_channel_details(platform_ids, priority=PRIORITY_TRACKED)
 
     def collect_multiple_sources(self, run_id: str, keywords: list[str], tracked_ids: list[str]) -> CollectorResult:
         """
@@ -204,78 +556,102 @@ class YouTubeCollector:
         1. Fetch details for Tracked IDs (if any)
         2. Search and fetch details for Keywords
         3. Save everything
-        """
-        entity_count = 0
-        snapshot_count = 0
-        errors = []
 
-        # 1. Gather all platform IDs
-        all_platform_ids = set()
-
-        # Tracked IDs (these are entity IDs in our DB, need to get platform_ids if we don't have them)
-        # Actually, let's assume we pass platform_ids for tracked ones too or fetch them first.
-        # To keep it simple, let's just use platform_ids for now.
-        all_platform_ids.update(tracked_ids)
+        Tracked IDs are refreshed first at tracked priority so that exploratory
+        keyword searches can never starve them of quota.
+        """
+        # 1. Tracked IDs (platform IDs)
+        tracked = list(dict.fromkeys(tracked_ids))
+        channels = self.refresh_tracked_channels(tracked)
 
+        # 2. Keyword search
+        searched_ids = set()
         for kw in keywords:
             ids = self.search_channels(kw)
-            all_platform_ids.update(ids)
+            searched_ids.update(ids)
+        searched_ids.difference_update(tracked)
+
+        # 3. Fetch, save entities, collect recent videos and save snapshots
+        channels += self.get_channel_details(list(searched_ids))
+        return self.save_with_videos(run_id, channels, set(tracked))
+
+    def resolve_handle(self, handle: str) -> str | None:
+        """Resolve '@handle' to a channel ID with a 1-unit channels.list lookup."""
+        request = self.youtube.channels().list(forHandle=handle, part="id")
+        response = self._execute("channels.list", request)
+        items = response.get("items", [])
+        return items[0]["id"] if items else None
+
+    def _search_single_channel(self, query: str) -> str | None:
+        request = self.youtube.search().list(
+            q=query,
+            type="channel",
+            part="id",
+            maxResults=1
+        )
+        response = self._execute("search.list", request)
+        items = response.get("items", [])
+        return items[0]["id"]["channelId"] if items else None
 
-        # 2. Fetch and Save
-        channels = self.get_channel_details(list(all_platform_ids))
+    def _resolve_lookup(self, lookup: DiscoveryLookup, index: ChannelIndex, allow_search: bool) -> str | None:
+        channel_id = index.cached(lookup)
+        if channel_id:
+            return channel_id
 
-        for channel in channels:
+        if lookup.handle:
+            index.count("handle_lookups")
             try:
-                entity_uuid = upsert_entity(
-                    platform="youtube",
-                    platform_id=channel.channel_id,
-                    channel_title=channel.title,
-                    channel_description=channel.description,
-                    country=channel.country,
-                    published_at=channel.published_at.isoformat() if channel.published_at else None
-                )
-                entity_count += 1
-
-                insert_snapshot(
-                    run_id=run_id,
-                    entity_id=entity_uuid,
-                    subscriber_count=channel.subscriber_count,
-                    view_count=channel.view_count,
-                    video_count=channel.video_count
-                )
-                snapshot_count += 1
+                channel_id = self.resolve_handle(lookup.handle)
+            except QuotaExceededError:
+                raise
             except Exception as e:
-                errors.append(f"Failed to process channel {channel.channel_id}: {str(e)}")
-
-        return CollectorResult(
-            run_id=run_id,
-            entity_count=entity_count,
-            snapshot_count=snapshot_count,
-            errors=errors
-        )
+                logger.error(f"Failed to resolve handle '{lookup.handle}': {e}")
+            if channel_id:
+                index.count("handle_resolved")
+                index.record(lookup, channel_id, "handle")
+                return channel_id
+
+        query = lookup.name or lookup.handle
+        if not allow_search or not query:
+            return None
+
+        index.count("search_fallbacks")
+        channel_id = self._search_single_channel(query)
+        if channel_id:
+            index.record(lookup, channel_id, "search")
+        return channel_id
 
     def resolve_discovered_channels(self, discovery_items: list[dict[str, Any]]) -> list[str]:
-        """Convert discovered name/handle into YouTube channel IDs."""
+        """Convert discovered name/handle into YouTube channel IDs.
+
+        Order of preference: the persistent channel index (free), a 1-unit
+        ``channels.list?forHandle=`` lookup for handles, then a 100-unit search
+        for bare names (or handles that did not resolve).
+        """
+        lookups = plan_discovery_lookups(discovery_items)
+        index = self.channel_index or ChannelIndex()
+        index.load(lookups)
+
         resolved_ids = []
-        for item in discovery_items:
-            query = item.get("handle") or item.get("name")
-            if not query:
-                continue
-            
+        allow_search = True
+        for lookup in lookups:
             try:
-                # Search for the channel
-                request = self.youtube.search().list(
-                    q=query,
-                    type="channel",
-                    part="id",
-                    maxResults=1
-                )
-                response = request.execute()
-                items = response.get("items", [])
-                if items:
-                    resolved_ids.append(items[0]["id"]["channelId"])
-                    logger.info(f"Resolved '{query}' to channel_id: {resolved_ids[-1]}")
+                channel_id = self._resolve_lookup(lookup, index, allow_search)
+            except QuotaExceededError as e:
+                # Searches are deferred once the exploratory budget is gone; cheap
+                # handle lookups and index hits continue.
+                logger.warning("Deferred discovery search for '%s': %s", lookup.name or lookup.handle, e)
+                allow_search = False
+                channel_id = None
             except Exception as e:
-                logger.error(f"Failed to resolve channel for '{query}': {e}")
-        
-        return resolved_ids
+                logger.error(f"Failed to resolve channel for '{lookup.name or lookup.handle}': {e}")
+                channel_id = None
+
+            if channel_id:
+                resolved_ids.append(channel_id)
+                logger.info(f"Resolved '{lookup.handle or lookup.name}' to channel_id: {channel_id}")
+            else:
+                index.count("unresolved")
+
+        index.flush()
+        return list(dict.fromkeys(resolved_ids))
@@ -0,0 +1,78 @@
+"""Run-scoped memo of database state shared by the pipeline stages."""
+
+from __future__ import annotations
+
+import logging
+from typing import Any
+
+from db.queries import (
+    get_last_scores,
+    get_pinned_entity_ids,
+    get_scores_by_run,
+    get_snapshots_by_run,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class RunContext:
+    """Loads prior scores, snapshots, pins and run scores at most once per run.
+
+    ``should_analyze`` screening, ``Analyzer.calc_score_delta``, classification,
+    trend extraction and the notifier all read from the same instance, so the
+    number of queries per run is constant instead of growing with the entity
+    count and the number of stages.
+
+    ``scores`` is only valid once analysis has finished; call ``reload_scores``
+    if scores are written after it was first read.
+    """
+
+    def __init__(self, run_id: str) -> None:
+        self.run_id = run_id
+        self.queries = 0
+        self._snapshots: list[dict[str, Any]] | None = None
+        self._last_scores: dict[str, dict[str, Any]] | None = None
+        self._pinned_ids: list[str] | None = None
+        self._scores: list[dict[str, Any]] | None = None
+
+    def pinned_ids(self) -> list[str]:
+        if self._pinned_ids is None:
+            self.queries += 1
+            self._pinned_ids = get_pinned_entity_ids()
+        return self._pinned_ids
+
+    def snapshots(self) -> list[dict[str, Any]]:
+        if self._snapshots is None:
+            self.queries += 1
+            self._snapshots = get_snapshots_by_run(self.run_id)
+        return self._snapshots
+
+    def last_scores(self) -> dict[str, dict[str, Any]]:
+        """Latest score before this run for every snapshot entity.
+
+        Scores of this run itself (from an earlier attempt) are excluded, so a
+        resumed run compares against the previous run, not its own rows.
+        """
+
+        if self._last_scores is None:
+            entity_ids = list({snap["entity_id"] for snap in self.snapshots()})
+            self.queries += 1
+            self._last_scores = get_last_scores(entity_ids, exclude_run_id=self.run_id)
+        return self._last_scores
+
+    def last_score(self, entity_id: str) -> dict[str, Any] | None:
+        return self.last_scores().get(entity_id)
+
+    def scores(self) -> list[dict[str, Any]]:
+        """Scores written by this run (with display names)."""
+
+        if self._scores is None:
+            self.queries += 1
+            self._scores = get_scores_by_run(self.run_id)
+        return self._scores
+
+    def reload_scores(self) -> None:
+        self._scores = None
+
+    def summary(self) -> dict[str, int]:
+        return {"queries": self.queries}
@@ -2,9 +2,15 @@
 
 import json
 import logging
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime, timezone
 from typing import Any
 from openai import OpenAI
 from config import get_settings
+from db.queries import get_discovery_cache, upsert_discovery_cache
+from worker.channel_index import handle_key, name_key, normalize_handle
+from worker.llm_usage import LlmUsage
 
 logger = logging.getLogger(__name__)
 
@@ -24,48 +30,146 @@ DISCOVERY_SYSTEM_PROMPT = """
 }
 """.strip()
 
+def keyword_groups(keywords: list[str], group_size: int) -> list[list[str]]:
+    """Split keywords into request groups of at most ``group_size``."""
+    unique = list(dict.fromkeys(k.strip() for k in keywords if k and k.strip()))
+    size = max(1, group_size)
+    return [unique[i:i + size] for i in range(0, len(unique), size)]
+
+
+def group_key(group: list[str]) -> str:
+    """Cache key for a keyword group (order/case-insensitive)."""
+    return "|".join(sorted(" ".join(k.split()).lower() for k in group))
+
+
+def dedup_key(item: dict[str, Any]) -> str | None:
+    """Identity of a discovered channel: its handle if valid, else its name."""
+    handle = normalize_handle(item.get("handle"))
+    if handle:
+        return handle_key(handle)
+    name = (item.get("name") or "").strip()
+    return name_key(name) if name else None
+
+
 class DiscoveryWorker:
-    """Worker to discover new YouTube channels using OpenAI's native Web Search."""
+    """Worker to discover new YouTube channels using OpenAI's native Web Search.
+
+    Keywords are split into groups of ``DISCOVERY_KEYWORDS_PER_REQUEST`` and each
+    group is a separate search request, run concurrently with at most
+    ``DISCOVERY_CONCURRENCY`` in flight. Results are cached per group and day in
+    ``scout_discovery_cache`` so repeated runs on the same day reuse them.
+    """
 
-    def __init__(self):
+    def __init__(self, usage: LlmUsage | None = None):
         settings = get_settings()
-        self.client = OpenAI(api_key=settings.openai_api_key)
+        self.usage = usage or LlmUsage()
+        # LlmUsage.complete retries (and counts) failed requests itself.
+        self.client = OpenAI(
+            api_key=settings.openai_api_key, base_url=settings.openai_base_url
+        ).with_options(max_retries=0)
         self.model = settings.openai_search_model
+        self.concurrency = max(1, settings.discovery_concurrency)
+        self.group_size = settings.discovery_keywords_per_request
+        self.cache_enabled = settings.discovery_cache_enabled
+        self.stats: dict[str, dict[str, Any]] = {}
 
-    def discover(self, keywords: list[str]) -> list[dict[str, Any]]:
-        """Main discovery flow using OpenAI's search-enabled model."""
+    def _discover_group(self, group: list[str]) -> tuple[list[dict[str, Any]], int]:
+        """Run one search request for a keyword group; return (items, latency_ms)."""
         prompt = (
-            f"以下のキーワードに関連する、最近話題の海外YouTubeチャンネルをWEB検索で見つけてください: {', '.join(keywords)}\n"
+            f"以下のキーワードに関連する、最近話題の海外YouTubeチャンネルをWEB検索で見つけてください: {', '.join(group)}\n"
             "抽出したチャンネル名やハンドル名（@handle）をリストアップし、なぜ有望かの理由を日本語で添えてください。"
         )
 
+        started = time.perf_counter()
+        # Note: We use the specialized search model which has web search built-in.
+        # Depending on the specific OpenAI API version, this might also be implemented 
+        # as a tool: tools=[{"type": "web_search"}]
+        response = self.usage.complete(
+            "discovery",
+            self.client,
+            model=self.model,
+            response_format={"type": "json_object"},
+            messages=[
+                {"role": "system", "content": DISCOVERY_SYSTEM_PROMPT},
+                {"role": "user", "content": prompt}
+            ]
+            # tools=[{"type": "web_search"}] # For standard models with tool support
+        )
+        latency_ms = int((time.perf_counter() - started) * 1000)
+        content = response.choices[0].message.content or "{}"
+        data = json.loads(content)
+        return data.get("discovered_channels", []), latency_ms
+
+    def _load_cache(self, keys: list[str], day: str) -> dict[str, list[dict[str, Any]]]:
+        if not self.cache_enabled:
+            return {}
         try:
-            # Note: We use the specialized search model which has web search built-in.
-            # Depending on the specific OpenAI API version, this might also be implemented 
-            # as a tool: tools=[{"type": "web_search"}]
-            response = self.client.chat.completions.create(
-                model=self.model,
-                response_format={"type": "json_object"},
-                messages=[
-                    {"role": "system", "content": DISCOVERY_SYSTEM_PROMPT},
-                    {"role": "user", "content": prompt}
-                ]
-                # tools=[{"type": "web_search"}] # For standard models with tool support
-            )
-            content = response.choices[0].message.content or "{}"
-            data = json.loads(content)
-            all_discovered = data.get("discovered_channels", [])
-            
-            # Deduplication
-            unique_results = []
-            seen = set()
-            for item in all_discovered:
-                key = item.get("handle") or item.get("name")
-                if key and key not in seen:
-                    unique_results.append(item)
-                    seen.add(key)
-            return unique_results
+            return get_discovery_cache(keys, day)
+        except Exception:
+            logger.warning("Discovery cache lookup failed; searching all %d groups.", len(keys))
+            return {}
+
+    def _store_cache(self, rows: list[dict[str, Any]]) -> None:
+        if not self.cache_enabled:
+            return
+        try:
+            upsert_discovery_cache(rows)
+        except Exception:
+            logger.warning("Failed to store %d discovery cache rows.", len(rows))
 
-        except Exception as e:
-            logger.error(f"Discovery via OpenAI search failed: {e}")
+    def discover(self, keywords: list[str]) -> list[dict[str, Any]]:
+        """Main discovery flow: parallel, cached search requests merged with dedup."""
+        groups = keyword_groups(keywords, self.group_size)
+        if not groups:
             return []
+
+        day = datetime.now(timezone.utc).date().isoformat()
+        keys = [group_key(g) for g in groups]
+        results = self._load_cache(keys, day)
+        latencies: dict[str, int] = {}
+
+        misses = [(key, group) for key, group in zip(keys, groups) if key not in results]
+        if misses:
+            with ThreadPoolExecutor(max_workers=min(self.concurrency, len(misses))) as pool:
+                futures = {pool.submit(self._discover_group, group): key for key, group in misses}
+                for future in as_completed(futures):
+                    key = futures[future]
+                    try:
+                        results[key], latencies[key] = future.result()
+                    except Exception as e:
+                        logger.error(f"Discovery via OpenAI search failed for '{key}': {e}")
+
+            self._store_cache([
+                {"query_key": key, "discovered_on": day, "items": results[key], "latency_ms": latencies[key]}
+                for key, _ in misses
+                if key in latencies
+            ])
+
+        # Deduplication in keyword order; yield credits the first group to find a channel.
+        unique_results = []
+        seen = set()
+        for key in keys:
+            found = results.get(key, [])
+            new = 0
+            for item in found:
+                item_key = dedup_key(item)
+                if item_key and item_key not in seen:
+                    unique_results.append(item)
+                    seen.add(item_key)
+                    new += 1
+            self.stats[key] = {
+                "cached": key not in latencies and key in results,
+                "latency_ms": latencies.get(key),
+                "items": len(found),
+                "yield": new,
+                "failed": key not in results,
+            }
+        return unique_results
+
+    def summary(self) -> dict[str, Any]:
+        """Return per-keyword-group latency and yield for scout_runs.summary."""
+        return {
+            "requests": sum(1 for s in self.stats.values() if s["latency_ms"] is not None),
+            "cache_hits": sum(1 for s in self.stats.values() if s["cached"]),
+            "keywords": self.stats,
+        }
@@ -0,0 +1,116 @@
+"""ETag bookkeeping for conditional YouTube channel detail refreshes."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import threading
+from collections import Counter
+from typing import Any
+
+from db.queries import get_entity_etags, get_request_etags, upsert_request_etag
+from models.schemas import YouTubeChannel
+
+logger = logging.getLogger(__name__)
+
+MAX_IDS_PER_REQUEST = 50
+
+
+def chunk_cache_key(channel_ids: list[str]) -> str:
+    """Stable cache key for a channels.list request over a set of IDs."""
+
+    digest = hashlib.sha1(",".join(sorted(channel_ids)).encode()).hexdigest()
+    return f"channels.list:{digest}"
+
+
+class EtagCache:
+    """Tracks channels.list etags for the tracked set of a run.
+
+    ``channels.list`` accepts one ``If-None-Match`` per request, so etags are kept
+    at two levels:
+
+    - response etag per sorted 50-ID chunk: sent as ``If-None-Match``; on 304 the
+      stored items are replayed, so the snapshot reuses the cached values.
+    - item etag per entity (``scout_entities.etag``): channels whose item etag is
+      unchanged skip the entity upsert and only get a snapshot.
+    """
+
+    def __init__(self) -> None:
+        self.stats: Counter[str] = Counter()
+        self._entities: dict[str, dict[str, str | None]] = {}
+        self._chunks: dict[str, dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    def prepare(self, channel_ids: list[str]) -> list[list[str]]:
+        """Load stored etags and return deterministic chunks for the given IDs."""
+
+        ordered = sorted(set(channel_ids))
+        chunks = [
+            ordered[i:i + MAX_IDS_PER_REQUEST]
+            for i in range(0, len(ordered), MAX_IDS_PER_REQUEST)
+        ]
+        self._entities.update(get_entity_etags("youtube", ordered))
+        self._chunks.update(get_request_etags([chunk_cache_key(c) for c in chunks]))
+        return chunks
+
+    def etag_for(self, chunk: list[str]) -> str | None:
+        """Return the etag to send as If-None-Match for a chunk, if any."""
+
+        cached = self._chunks.get(chunk_cache_key(chunk))
+        with self._lock:
+            self.stats["conditional_requests" if cached else "unconditional_requests"] += 1
+        return cached["etag"] if cached else None
+
+    def not_modified(self, chunk: list[str]) -> list[dict[str, Any]]:
+        """Record a 304 and return the cached items for the chunk."""
+
+        items = self._chunks[chunk_cache_key(chunk)].get("items") or []
+        with self._lock:
+            self.stats["not_modified"] += 1
+            self.stats["bytes_saved"] += len(json.dumps(items))
+        return items
+
+    def modified(self, chunk: list[str], etag: str | None, items: list[dict[str, Any]]) -> None:
+        """Store a fresh response so the next refresh can be conditional."""
+
+        if not etag:
+            return
+        key = chunk_cache_key(chunk)
+        self._chunks[key] = {"cache_key": key, "etag": etag, "items": items}
+        try:
+            upsert_request_etag(key, etag, items)
+        except Exception:
+            logger.warning("Failed to store request etag for %d channels.", len(chunk))
+
+    def unchanged_entity_id(self, channel: YouTubeChannel) -> str | None:
+        """Return the stored entity id if the channel's item etag is unchanged."""
+
+        stored = self._entities.get(channel.channel_id)
+        if stored is None:
+            return None
+
+        with self._lock:
+            self.stats["items_checked"] += 1
+            if channel.etag and stored.get("etag") == channel.etag:
+                self.stats["entity_upserts_skipped"] += 1
+                return stored["id"]
+        return None
+
+    def summary(self) -> dict[str, Any]:
+        """Return per-run hit rates for scout_runs.summary."""
+
+        conditional = self.stats["conditional_requests"]
+        checked = self.stats["items_checked"]
+        return {
+            **{key: self.stats[key] for key in (
+                "conditional_requests",
+                "unconditional_requests",
+                "not_modified",
+                "bytes_saved",
+                "items_checked",
+                "entity_upserts_skipped",
+            )},
+            "not_modified_rate": round(self.stats["not_modified"] / conditional, 3) if conditional else 0.0,
+            "upsert_skip_rate": round(self.stats["entity_upserts_skipped"] / checked, 3) if checked else 0.0,
+        }
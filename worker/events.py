@@ -0,0 +1,117 @@
+"""In-process run progress events and their persisted snapshot."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import threading
+import time
+from collections import defaultdict
+from typing import Any
+
+from db.queries import update_run_progress
+
+logger = logging.getLogger(__name__)
+
+# Minimum seconds between progress writes to scout_runs; stage transitions
+# and the final event are always written.
+PROGRESS_FLUSH_SECONDS = 1.0
+
+
+class EventBus:
+    """Fans run events out to asyncio subscribers from any thread.
+
+    ``publish`` is called from the pipeline threads; each subscriber receives
+    events on its own event loop through ``call_soon_threadsafe``.
+    """
+
+    def __init__(self) -> None:
+        self._subscribers: dict[str, list[tuple[asyncio.AbstractEventLoop, asyncio.Queue]]] = defaultdict(list)
+        self._lock = threading.Lock()
+
+    def subscribe(self, run_id: str) -> asyncio.Queue:
+        queue: asyncio.Queue = asyncio.Queue()
+        with self._lock:
+            self._subscribers[run_id].append((asyncio.get_running_loop(), queue))
+        return queue
+
+    def unsubscribe(self, run_id: str, queue: asyncio.Queue) -> None:
+        with self._lock:
+            self._subscribers[run_id] = [s for s in self._subscribers[run_id] if s[1] is not queue]
+            if not self._subscribers[run_id]:
+                del self._subscribers[run_id]
+
+    def publish(self, run_id: str, event: str, data: dict[str, Any]) -> None:
+        with self._lock:
+            subscribers = list(self._subscribers.get(run_id, []))
+        for loop, queue in subscribers:
+            try:
+                loop.call_soon_threadsafe(queue.put_nowait, (event, data))
+            except RuntimeError:
+                # The subscriber's loop has closed.
+                self.unsubscribe(run_id, queue)
+
+
+BUS = EventBus()
+
+
+class RunProgress:
+    """Publishes a run's stage transitions, counters and final summary.
+
+    Every event goes to the in-process ``EventBus``. The latest snapshot is
+    also written to ``scout_runs.progress`` (throttled to
+    ``PROGRESS_FLUSH_SECONDS``) for SSE clients served by another process.
+    """
+
+    def __init__(self, run_id: str, bus: EventBus | None = None) -> None:
+        self.run_id = run_id
+        self.bus = bus or BUS
+        self.snapshot: dict[str, Any] = {
+            "stage": None,
+            "stages": {},
+            "counters": {"collected": 0, "analyzed": 0, "skipped": 0},
+        }
+        self._flushed_at = 0.0
+        self._lock = threading.Lock()
+
+    def stage(self, name: str, status: str, stats: dict[str, Any] | None = None) -> None:
+        """Record a stage transition (started, completed or failed)."""
+        with self._lock:
+            self.snapshot["stage"] = name
+            self.snapshot["stages"][name] = status
+        self.bus.publish(self.run_id, "stage", {"stage": name, "status": status, **(stats or {})})
+        self._flush(force=True)
+
+    def count(self, **counters: int) -> None:
+        """Set progress counters (collected, analyzed, skipped)."""
+        with self._lock:
+            self.snapshot["counters"].update(counters)
+            data = dict(self.snapshot["counters"])
+        self.bus.publish(self.run_id, "progress", data)
+        self._flush()
+
+    def advance(self, counter: str, amount: int = 1) -> None:
+        """Increment one progress counter."""
+        with self._lock:
+            self.snapshot["counters"][counter] = self.snapshot["counters"].get(counter, 0) + amount
+            data = dict(self.snapshot["counters"])
+        self.bus.publish(self.run_id, "progress", data)
+        self._flush()
+
+    def finish(self, status: str, summary: dict[str, Any]) -> None:
+        """Publish the final status and summary."""
+        self._flush(force=True)
+        self.bus.publish(self.run_id, "summary", {"status": status, "summary": summary})
+
+    def _flush(self, force: bool = False) -> None:
+        now = time.monotonic()
+        with self._lock:
+            if not force and now - self._flushed_at < PROGRESS_FLUSH_SECONDS:
+                return
+            self._flushed_at = now
+            snapshot = {**self.snapshot, "stages": dict(self.snapshot["stages"]),
+                        "counters": dict(self.snapshot["counters"])}
+        try:
+            update_run_progress(self.run_id, snapshot)
+        except Exception:
+            logger.warning("Failed to store progress for run_id=%s.", self.run_id)
@@ -0,0 +1,143 @@
+"""Persistent content-addressed cache of validated GPT score outputs."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import threading
+from datetime import datetime, timedelta, timezone
+from typing import Any
+
+from config import get_settings
+from db.queries import evict_llm_cache, get_llm_cache, upsert_llm_cache
+from models.schemas import ScoreInput, ScoreOutput
+
+logger = logging.getLogger(__name__)
+
+
+def bucket_count(value: int | None) -> int | None:
+    """Round a count to 2 significant digits (123456 -> 120000)."""
+
+    if not value:
+        return value
+    digits = len(str(abs(value)))
+    return round(value, -max(digits - 2, 0))
+
+
+def bucket_input(score_input: ScoreInput) -> ScoreInput:
+    """Copy of the input with stats bucketed, so small metric drift still hits."""
+
+    return score_input.model_copy(update={
+        "subscribers": bucket_count(score_input.subscribers),
+        "total_views": bucket_count(score_input.total_views),
+        "upload_freq_days": round(score_input.upload_freq_days) if score_input.upload_freq_days else None,
+    })
+
+
+def cache_key(system_prompt: str, user_prompt: str, model: str) -> str:
+    """SHA-256 over (system prompt, user prompt, model)."""
+
+    payload = json.dumps([system_prompt, user_prompt, model], ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class LlmCache:
+    """Score cache backed by ``scout_llm_cache``.
+
+    ``load`` fetches every key of a run in one query; entries older than ``ttl``
+    are ignored. New outputs are buffered by ``put`` and written in one upsert by
+    ``flush``, which also applies TTL and ``max_entries`` eviction. Cache
+    failures are logged and treated as misses.
+    """
+
+    def __init__(self, ttl: timedelta, max_entries: int) -> None:
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.saved_prompt_tokens = 0
+        self.saved_completion_tokens = 0
+        self.evicted = 0
+        self._known: dict[str, dict[str, Any]] = {}
+        self._pending: dict[str, dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_settings(cls) -> LlmCache | None:
+        """Build a cache from LLM_CACHE_* settings, or None when disabled."""
+
+        settings = get_settings()
+        if not settings.llm_cache_enabled:
+            return None
+        return cls(timedelta(hours=settings.llm_cache_ttl_hours), settings.llm_cache_max_entries)
+
+    def load(self, keys: list[str]) -> None:
+        try:
+            rows = get_llm_cache(list(dict.fromkeys(keys)))
+        except Exception:
+            logger.warning("LLM cache lookup failed; scoring %d prompts via OpenAI.", len(keys))
+            return
+
+        now = datetime.now(timezone.utc)
+        for key, row in rows.items():
+            created_at = datetime.fromisoformat(str(row["created_at"]).replace("Z", "+00:00"))
+            if now - created_at <= self.ttl:
+                self._known[key] = row
+
+    def get(self, key: str) -> ScoreOutput | None:
+        """Return the cached output for a key, counting hits and saved tokens."""
+
+        row = self._known.get(key)
+        output = None
+        if row is not None:
+            try:
+                output = ScoreOutput.model_validate(row["output"])
+            except Exception:
+                output = None
+
+        with self._lock:
+            if output is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self.saved_prompt_tokens += int(row.get("prompt_tokens") or 0)
+            self.saved_completion_tokens += int(row.get("completion_tokens") or 0)
+        return output
+
+    def put(self, key: str, model: str, output: ScoreOutput, usage: dict[str, int] | None = None) -> None:
+        usage = usage or {}
+        row = {
+            "cache_key": key,
+            "model": model,
+            "output": output.model_dump(),
+            "prompt_tokens": usage.get("prompt_tokens", 0),
+            "completion_tokens": usage.get("completion_tokens", 0),
+            "created_at": datetime.now(timezone.utc).isoformat(),
+        }
+        with self._lock:
+            self._known[key] = row
+            self._pending[key] = row
+
+    def flush(self) -> None:
+        with self._lock:
+            rows = list(self._pending.values())
+            self._pending.clear()
+        try:
+            upsert_llm_cache(rows)
+            self.evicted += evict_llm_cache(int(self.ttl.total_seconds() // 3600), self.max_entries)
+        except Exception:
+            logger.warning("Failed to store %d LLM cache rows.", len(rows))
+
+    def summary(self) -> dict[str, Any]:
+        """Return hit rate and saved tokens for scout_runs.summary."""
+
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+            "saved_prompt_tokens": self.saved_prompt_tokens,
+            "saved_completion_tokens": self.saved_completion_tokens,
+            "evicted": self.evicted,
+        }
@@ -0,0 +1,158 @@
+"""Per-call OpenAI usage and latency, summed per run stage."""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from typing import Any
+
+from openai import APIConnectionError, APIStatusError, InternalServerError, RateLimitError
+
+from worker.metrics import (
+    LLM_CALLS,
+    LLM_COMPLETION_TOKENS,
+    LLM_PROMPT_TOKENS,
+    LLM_REQUEST_SECONDS,
+    LLM_RETRIES,
+    LLM_TOKENS,
+)
+from worker.rate_limit import MAX_RATE_LIMIT_RETRIES, MAX_TRANSIENT_RETRIES, RateLimitGate, retry_delay
+
+logger = logging.getLogger(__name__)
+
+
+def _count(value: Any) -> int:
+    return value if isinstance(value, int) else 0
+
+
+def usage_counts(usage: Any) -> dict[str, int]:
+    """Prompt, completion and cached tokens from a ``usage`` object or dict."""
+
+    if usage is None:
+        return {"prompt_tokens": 0, "completion_tokens": 0, "cached_tokens": 0}
+    if isinstance(usage, dict):
+        details = usage.get("prompt_tokens_details") or {}
+        return {
+            "prompt_tokens": _count(usage.get("prompt_tokens")),
+            "completion_tokens": _count(usage.get("completion_tokens")),
+            "cached_tokens": _count(details.get("cached_tokens")),
+        }
+    details = getattr(usage, "prompt_tokens_details", None)
+    return {
+        "prompt_tokens": _count(getattr(usage, "prompt_tokens", 0)),
+        "completion_tokens": _count(getattr(usage, "completion_tokens", 0)),
+        "cached_tokens": _count(getattr(details, "cached_tokens", 0)),
+    }
+
+
+class LlmUsage:
+    """Records every OpenAI completion call of a run by stage.
+
+    Stages are ``analysis``, ``aggregation``, ``trends``, ``discovery`` and
+    ``batch``. Each call also feeds the process-wide histograms in
+    ``worker.metrics``.
+    """
+
+    def __init__(self) -> None:
+        self.stages: dict[str, dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    def complete(
+        self,
+        stage: str,
+        client: Any,
+        retry: bool = False,
+        gate: RateLimitGate | None = None,
+        **params: Any,
+    ) -> Any:
+        """``client.chat.completions.create(**params)``, timed and recorded under ``stage``.
+
+        Clients are built with ``max_retries=0`` so every retry happens (and is
+        counted) here. 429s back off using the rate-limit headers, up to
+        ``MAX_RATE_LIMIT_RETRIES`` times, pausing everyone sharing ``gate``.
+        5xx responses and connection errors or timeouts back off for this
+        request only, up to ``MAX_TRANSIENT_RETRIES`` times.
+        """
+
+        rate_limit_attempt = 0
+        transient_attempt = 0
+        while True:
+            if gate is not None:
+                gate.wait()
+            started = time.perf_counter()
+            try:
+                response = client.chat.completions.create(**params)
+            except Exception as exc:
+                self.record(stage, params.get("model"), None, time.perf_counter() - started, retry, failed=True)
+                if isinstance(exc, RateLimitError) and rate_limit_attempt < MAX_RATE_LIMIT_RETRIES:
+                    delay = retry_delay(exc.response.headers, rate_limit_attempt)
+                    rate_limit_attempt += 1
+                    logger.warning("OpenAI rate limited (%s); backing off %.2fs. attempt=%s",
+                                   stage, delay, rate_limit_attempt)
+                    if gate is not None:
+                        gate.pause(delay)
+                    else:
+                        time.sleep(delay)
+                elif (isinstance(exc, (APIConnectionError, InternalServerError))
+                        and transient_attempt < MAX_TRANSIENT_RETRIES):
+                    headers = exc.response.headers if isinstance(exc, APIStatusError) else {}
+                    delay = retry_delay(headers, transient_attempt)
+                    transient_attempt += 1
+                    logger.warning("OpenAI request failed (%s, %s); retrying in %.2fs. attempt=%s",
+                                   stage, type(exc).__name__, delay, transient_attempt)
+                    time.sleep(delay)
+                else:
+                    raise
+                retry = True
+                continue
+            self.record(stage, params.get("model"), getattr(response, "usage", None), time.perf_counter() - started, retry)
+            return response
+
+    def record(
+        self,
+        stage: str,
+        model: str | None,
+        usage: Any,
+        seconds: float,
+        retry: bool = False,
+        failed: bool = False,
+    ) -> dict[str, int]:
+        """Add one call to the stage totals and histograms; return its token counts."""
+
+        model = model or "unknown"
+        counts = usage_counts(usage)
+        with self._lock:
+            stats = self.stages.setdefault(stage, {
+                "calls": 0, "failed": 0, "retries": 0,
+                "prompt_tokens": 0, "completion_tokens": 0, "cached_tokens": 0,
+                "latency_ms": 0, "max_latency_ms": 0, "models": [],
+            })
+            latency_ms = int(seconds * 1000)
+            stats["calls"] += 1
+            stats["failed"] += int(failed)
+            stats["retries"] += int(retry)
+            for kind, value in counts.items():
+                stats[kind] += value
+            stats["latency_ms"] += latency_ms
+            stats["max_latency_ms"] = max(stats["max_latency_ms"], latency_ms)
+            if model not in stats["models"]:
+                stats["models"].append(model)
+
+        LLM_CALLS.inc(stage=stage, model=model, outcome="failed" if failed else "ok")
+        if retry:
+            LLM_RETRIES.inc(stage=stage, model=model)
+        if seconds:
+            LLM_REQUEST_SECONDS.observe(seconds, stage=stage, model=model)
+        if not failed:
+            LLM_PROMPT_TOKENS.observe(counts["prompt_tokens"], stage=stage, model=model)
+            LLM_COMPLETION_TOKENS.observe(counts["completion_tokens"], stage=stage, model=model)
+        for kind, value in counts.items():
+            LLM_TOKENS.inc(value, stage=stage, model=model, kind=kind.removesuffix("_tokens"))
+        return counts
+
+    def summary(self) -> dict[str, Any]:
+        """Return per-stage call, token and latency totals for scout_runs.summary."""
+
+        with self._lock:
+            return {stage: dict(stats, models=list(stats["models"])) for stage, stats in self.stages.items()}
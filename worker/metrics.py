@@ -0,0 +1,174 @@
+"""Process-wide counters and histograms for pipeline instrumentation."""
+
+from __future__ import annotations
+
+import bisect
+import threading
+from collections import defaultdict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+LabelValues = tuple[str, ...]
+
+
+class Counter:
+    """Monotonic counter keyed by label values."""
+
+    def __init__(self, name: str, help: str, labelnames: tuple[str, ...] = ()) -> None:
+        self.name = name
+        self.help = help
+        self.labelnames = labelnames
+        self.values: dict[LabelValues, float] = defaultdict(float)
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1, **labels: str) -> None:
+        key = tuple(str(labels[n]) for n in self.labelnames)
+        with self._lock:
+            self.values[key] += amount
+
+
+class Histogram:
+    """Cumulative-bucket histogram keyed by label values."""
+
+    def __init__(
+        self, name: str, help: str, buckets: tuple[float, ...], labelnames: tuple[str, ...] = ()
+    ) -> None:
+        self.name = name
+        self.help = help
+        self.labelnames = labelnames
+        self.buckets = tuple(sorted(buckets))
+        # label values -> (per-bucket counts incl. +Inf, sum)
+        self.values: dict[LabelValues, tuple[list[int], float]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = tuple(str(labels[n]) for n in self.labelnames)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            counts, total = self.values.get(key, ([0] * (len(self.buckets) + 1), 0.0))
+            counts[index] += 1
+            self.values[key] = (counts, total + value)
+
+
+REGISTRY: list[Counter | Histogram] = []
+
+
+def counter(name: str, help: str, labelnames: tuple[str, ...] = ()) -> Counter:
+    metric = Counter(name, help, labelnames)
+    REGISTRY.append(metric)
+    return metric
+
+
+def histogram(name: str, help: str, buckets: tuple[float, ...], labelnames: tuple[str, ...] = ()) -> Histogram:
+    metric = Histogram(name, help, buckets, labelnames)
+    REGISTRY.append(metric)
+    return metric
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(labelnames: tuple[str, ...], values: LabelValues, extra: str = "") -> str:
+    parts = [f'{n}="{_escape(v)}"' for n, v in zip(labelnames, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _format_value(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+def render() -> str:
+    """Render every registered metric in the Prometheus text exposition format."""
+
+    lines = []
+    for metric in REGISTRY:
+        kind = "counter" if isinstance(metric, Counter) else "histogram"
+        lines.append(f"# HELP {metric.name} {metric.help}")
+        lines.append(f"# TYPE {metric.name} {kind}")
+        with metric._lock:
+            items = sorted(metric.values.items())
+            if isinstance(metric, Counter):
+                for values, value in items:
+                    lines.append(f"{metric.name}{_format_labels(metric.labelnames, values)} {_format_value(value)}")
+                continue
+            for values, (counts, total) in items:
+                cumulative = 0
+                for bound, count in zip(metric.buckets + (float("inf"),), counts):
+                    cumulative += count
+                    le = "+Inf" if bound == float("inf") else _format_value(bound)
+                    labels = _format_labels(metric.labelnames, values, f'le="{le}"')
+                    lines.append(f"{metric.name}_bucket{labels} {cumulative}")
+                labels = _format_labels(metric.labelnames, values)
+                lines.append(f"{metric.name}_sum{labels} {_format_value(total)}")
+                lines.append(f"{metric.name}_count{labels} {cumulative}")
+    return "\n".join(lines) + "\n"
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self) -> None:
+        if self.path.split("?", 1)[0] != "/metrics":
+            self.send_error(404)
+            return
+        if self.headers.get("X-API-KEY") != self.server.api_key:
+            self.send_error(403, "Could not validate API key")
+            return
+        body = render().encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args: object) -> None:
+        pass
+
+
+def start_http_server(port: int, api_key: str, host: str = "0.0.0.0") -> ThreadingHTTPServer:
+    """Serve ``GET /metrics`` (``X-API-KEY`` required) from a daemon thread.
+
+    Each queue worker process runs its pipelines and therefore owns its
+    metrics, so every process serves its own endpoint.
+    """
+
+    server = ThreadingHTTPServer((host, port), _MetricsHandler)
+    server.api_key = api_key
+    threading.Thread(target=server.serve_forever, name="metrics-http", daemon=True).start()
+    return server
+
+
+LATENCY_BUCKETS = (0.25, 0.5, 1, 2, 5, 10, 20, 30, 60, 120)
+TOKEN_BUCKETS = (100, 250, 500, 1000, 2000, 4000, 8000, 16000)
+STAGE_BUCKETS = (0.1, 0.5, 1, 5, 10, 30, 60, 120, 300, 600, 1800)
+
+STAGE_SECONDS = histogram(
+    "signalforge_stage_seconds", "Wall time of a run_scout pipeline stage.", STAGE_BUCKETS, ("stage",)
+)
+STAGE_ITEMS = counter("signalforge_stage_items_total", "Items processed by a pipeline stage.", ("stage",))
+STAGE_CALLS = counter(
+    "signalforge_stage_external_calls_total", "External API calls made by a pipeline stage.", ("stage",)
+)
+STAGE_ERRORS = counter("signalforge_stage_errors_total", "Errors recorded by a pipeline stage.", ("stage",))
+RUNS = counter("signalforge_runs_total", "Finished scout runs by status.", ("status",))
+
+LLM_REQUEST_SECONDS = histogram(
+    "signalforge_llm_request_seconds", "OpenAI completion call wall time.", LATENCY_BUCKETS, ("stage", "model")
+)
+LLM_PROMPT_TOKENS = histogram(
+    "signalforge_llm_prompt_tokens", "Prompt tokens per OpenAI completion call.", TOKEN_BUCKETS, ("stage", "model")
+)
+LLM_COMPLETION_TOKENS = histogram(
+    "signalforge_llm_completion_tokens", "Completion tokens per OpenAI completion call.", TOKEN_BUCKETS,
+    ("stage", "model"),
+)
+LLM_TOKENS = counter(
+    "signalforge_llm_tokens_total", "OpenAI tokens by kind (prompt, completion, cached).", ("stage", "model", "kind")
+)
+LLM_CALLS = counter(
+    "signalforge_llm_calls_total", "OpenAI completion calls by outcome (ok, failed).",
+    ("stage", "model", "outcome"),
+)
+LLM_RETRIES = counter(
+    "signalforge_llm_retries_total", "OpenAI completion calls that retried an earlier call.", ("stage", "model")
+)
@@ -16,8 +16,15 @@ def format_report(
     hot10: list[dict[str, Any]],
     watchlist: list[dict[str, Any]],
     trends: dict[str, Any],
+    pinned_ids: set[str] | None = None,
 ) -> str:
-    """Format the scout report for Discord."""
+    """Format the scout report for Discord. Pinned entities are marked with 📌."""
+    pinned_ids = pinned_ids or set()
+
+    def name(item: dict[str, Any]) -> str:
+        pin = "📌" if item["entity_id"] in pinned_ids else ""
+        return f"{pin}@{item['display_name']}"
+
     lines = []
     lines.append("━━━━━━━━━━━━━━━━━━━━━━━━━━")
     lines.append(f"🔍 SCOUT REPORT | {run_summary.get('timestamp_jst', 'N/A')}")
@@ -33,7 +40,7 @@ def format_report(
         lines.append("(None)")
     for i, item in enumerate(top10, 1):
         lines.append(
-            f"{i}. @{item['display_name']}  ⭐{item['total_score']}  ({item['score_delta']:+d})"
+            f"{i}. {name(item)}  ⭐{item['total_score']}  ({item['score_delta']:+d})"
         )
 
     lines.append("\n🔥 HOT 10  (85+・急上昇)")
@@ -42,10 +49,10 @@ def format_report(
     top_ids = {t["entity_id"] for t in top10}
     for i, item in enumerate(hot10[:10], 1): # Limit to 10 as per spec
         if item["entity_id"] in top_ids:
-            lines.append(f"{i}. @{item['display_name']}  ↑ Top参照")
+            lines.append(f"{i}. {name(item)}  ↑ Top参照")
         else:
             lines.append(
-                f"{i}. @{item['display_name']}  ⭐{item['total_score']}  ({item['score_delta']:+d})"
+                f"{i}. {name(item)}  ⭐{item['total_score']}  ({item['score_delta']:+d})"
             )
 
     lines.append("\n👀 WATCHLIST")
@@ -53,7 +60,7 @@ def format_report(
         lines.append("(None)")
     for i, item in enumerate(watchlist, 1):
         lines.append(
-            f"{i}. @{item['display_name']}  ⭐{item['total_score']}  ({item['score_delta']:+d})"
+            f"{i}. {name(item)}  ⭐{item['total_score']}  ({item['score_delta']:+d})"
         )
 
     lines.append("\n📈 TREND KEYWORDS")
@@ -1,25 +1,36 @@
 """Orchestrator worker to manage the Scout System flow."""
 
 import logging
+import threading
+import time
 from datetime import datetime
 from typing import Any
 
 from config import get_settings
 from db.queries import (
-    get_snapshots_by_run,
-    get_scores_by_run,
+    delete_run_snapshots,
     update_run_status,
-    get_last_success_run_id,
-    get_entities_by_classification,
-    get_pinned_entity_ids,
-    update_score_classification,
-    get_last_score,
+    get_tracked_set,
+    refresh_tracked_set,
+    update_score_classifications,
 )
 from worker.collector import YouTubeCollector
+from worker.async_collector import AsyncYouTubeCollector
+from worker.quota import QuotaLedger
+from worker.search_cache import SearchCache
+from worker.etag_cache import EtagCache
+from worker.channel_index import ChannelIndex
+from worker.video_store import VideoStore
+from worker.context import RunContext
+from worker.checkpoints import RunCancelledError, RunCheckpoints
 from worker.analyzer import Analyzer
+from worker.llm_cache import LlmCache
+from worker.llm_usage import LlmUsage
+from worker.events import RunProgress
+from worker.metrics import RUNS
+from worker.timings import StageTimings
 from worker.scorer import classify_scores
-from worker.notifier import format_report, send_discord
-from db.client import get_supabase_client
+from worker.notifier import format_report, send_discord, split_report
 
 logger = logging.getLogger(__name__)
 
@@ -28,40 +39,135 @@ def get_tracked_platform_ids() -> list[str]:
     """
     Select 30 entities based on past performance and manual pins.
     Tracked 30: Top10 + Hot8 + Watch7 + Pin5
+
+    Selection runs server-side (get_tracked_set) in one call; the score-based
+    part is materialized at the end of each successful run.
     """
-    prev_run_id = get_last_success_run_id()
-    tracked_entities = set()
-
-    if prev_run_id:
-        # 1. Top 10
-        tracked_entities.update(get_entities_by_classification(prev_run_id, "top", 10))
-        # 2. Hot 8
-        tracked_entities.update(get_entities_by_classification(prev_run_id, "hot", 8))
-        # 3. Watch 7
-        tracked_entities.update(get_entities_by_classification(prev_run_id, "watch", 7))
-
-    # 4. Manual Pin 5 (Take first 5)
-    pins = get_pinned_entity_ids()
-    tracked_entities.update(pins[:5])
-
-    # Convert Entity UUIDs to Platform IDs (YouTube Channel IDs)
-    sb = get_supabase_client()
-    if not tracked_entities:
-        return []
-
-    response = (
-        sb.table("scout_entities")
-        .select("platform_id")
-        .in_("id", list(tracked_entities))
-        .execute()
+    return get_tracked_set()
+
+
+def _refresh_tracked_set(summary: dict[str, Any], run_id: str) -> None:
+    """Materialize the next run's tracked set; a failure only costs the next run a live selection."""
+    try:
+        summary["tracked_set"] = refresh_tracked_set(run_id)
+    except Exception:
+        logger.exception("Failed to materialize tracked set for run_id=%s", run_id)
+
+
+def create_collector(
+    settings: Any,
+    quota: QuotaLedger | None = None,
+    search_cache: SearchCache | None = None,
+    etag_cache: EtagCache | None = None,
+    channel_index: ChannelIndex | None = None,
+    video_store: VideoStore | None = None,
+) -> YouTubeCollector | AsyncYouTubeCollector:
+    """Return the collector implementation selected by COLLECTOR_MODE."""
+    collector_cls = AsyncYouTubeCollector if settings.collector_mode == "async" else YouTubeCollector
+    return collector_cls(
+        quota=quota,
+        search_cache=search_cache,
+        etag_cache=etag_cache,
+        channel_index=channel_index,
+        video_store=video_store,
     )
-    return [row["platform_id"] for row in response.data or []]
 
 
-def run_scout(run_id: str, config: dict[str, Any], notify_discord: bool = True, analysis_mode: str = "aggregated") -> None:
+def filter_snapshots(
+    context: RunContext, analysis_mode: str, settings: Any
+) -> tuple[list[dict[str, Any]], int]:
+    """Return (snapshots to analyze, skipped count) for the analysis mode.
+
+    Prior scores for every entity come from the run context (one query).
+    """
+    snapshots = context.snapshots()
+    if analysis_mode not in ["smart", "aggregated"]:
+        return list(snapshots), 0
+
+    from worker.scorer import should_analyze
+
+    to_analyze = []
+    skipped_count = 0
+    for snap in snapshots:
+        entity_id = snap["entity_id"]
+        should_ana, reason = should_analyze(snap, context.last_score(entity_id), settings)
+        if should_ana:
+            to_analyze.append(snap)
+        else:
+            logger.info("Skipping analysis for entity_id=%s: %s", entity_id, reason)
+            skipped_count += 1
+    return to_analyze, skipped_count
+
+
+def save_classifications(classification_result: dict[str, list[dict[str, Any]]]) -> dict[str, Any]:
+    """Write every category of a run back in one call and return timing stats.
+
+    Categories can overlap (a top entity may also be hot); as with the former
+    per-row updates, the later category in ``classification_result`` wins.
+    """
+    categories: dict[str, str] = {}
+    for category, items in classification_result.items():
+        for item in items:
+            categories[item["score_id"]] = category
+
+    started = time.perf_counter()
+    updated = update_score_classifications(categories)
+    return {
+        "updated": updated,
+        "duration_ms": int((time.perf_counter() - started) * 1000),
+    }
+
+
+def _pick(summary: dict[str, Any], *keys: str) -> dict[str, Any]:
+    """The given summary keys that are set, for a stage checkpoint."""
+    return {key: summary[key] for key in keys if key in summary}
+
+
+def _skip_scored(
+    context: RunContext, snapshots: list[dict[str, Any]], summary: dict[str, Any]
+) -> list[dict[str, Any]]:
+    """Drop entities an earlier attempt of the run already scored."""
+    scored = {score["entity_id"] for score in context.scores()}
+    if not scored:
+        return snapshots
+    remaining = [snap for snap in snapshots if snap["entity_id"] not in scored]
+    summary["resumed_scores"] = len(snapshots) - len(remaining)
+    logger.info(
+        "Skipping %d entities already scored by an earlier attempt of run_id=%s",
+        summary["resumed_scores"], context.run_id,
+    )
+    return remaining
+
+
+def _youtube_calls(quota: QuotaLedger) -> int:
+    """YouTube Data API calls made so far in the run."""
+    return sum(quota.calls_by_endpoint.values())
+
+
+def _record_quota(summary: dict[str, Any], quota: QuotaLedger) -> None:
+    """Persist the run's quota usage and add it to the run summary."""
+    try:
+        quota.flush()
+    except Exception:
+        logger.exception("Failed to persist YouTube quota usage.")
+    summary["quota"] = quota.summary()
+
+
+def run_scout(
+    run_id: str,
+    config: dict[str, Any],
+    notify_discord: bool = True,
+    analysis_mode: str = "aggregated",
+    worker_id: str | None = None,
+    cancel: threading.Event | None = None,
+) -> None:
     """
     Execute the full Scout System pipeline:
     Collector -> Analyzer -> Scorer -> Notifier
+
+    A queue worker passes its ``worker_id`` and a ``cancel`` event it sets
+    when the run is reclaimed: the run then stops at the next stage boundary,
+    and the final status is only written while the worker still holds the run.
     """
     settings = get_settings()
     summary = {
@@ -69,120 +175,265 @@ def run_scout(run_id: str, config: dict[str, Any], notify_discord: bool = True,
         "scanned": 0,
         "errors": []
     }
+    # One ledger per run, shared by every collector so usage is reported per run.
+    quota = QuotaLedger.from_settings()
+    # config["refresh_keywords"] forces a fresh search.list for those keywords.
+    search_cache = SearchCache.from_settings(config.get("refresh_keywords", []))
+    etag_cache = EtagCache() if settings.etag_refresh_enabled else None
+    channel_index = ChannelIndex()
+    video_store = VideoStore(settings.recent_videos_per_channel)
+    context = RunContext(run_id)
+    # Every OpenAI completion call of the run, by stage.
+    llm_usage = LlmUsage()
+    # Stage transitions and counters for GET /v1/scout/runs/{run_id}/events.
+    progress = RunProgress(run_id)
+    timings = StageTimings(progress)
+    # Stages finished by an earlier attempt of this run are restored, not redone.
+    checkpoints = RunCheckpoints(run_id, cancel)
+    checkpoints.load()
 
     try:
+        collector = create_collector(
+            settings, quota, search_cache, etag_cache, channel_index, video_store
+        )
+
         # 1. Discovery (Phase 10: Web Search)
         discovery_ids = []
         if settings.discovery_enabled:
-            logger.info("Starting web discovery for run_id=%s", run_id)
-            from worker.discovery import DiscoveryWorker
-            dw = DiscoveryWorker()
-            keywords = config.get("keywords", ["VTuber", "Cover", "Singer"])
-            discovered = dw.discover(keywords)
-            
-            if discovered:
-                collector = YouTubeCollector()
-                discovery_ids = collector.resolve_discovered_channels(discovered)
-                logger.info("Discovered %d new potential channels via web search.", len(discovery_ids))
+            checkpoints.check_cancelled()
+            with timings.stage("discovery") as stage:
+                restored = checkpoints.get("discovery")
+                if restored is not None:
+                    discovery_ids = restored["discovery_ids"]
+                    summary.update(restored["summary"])
+                else:
+                    logger.info("Starting web discovery for run_id=%s", run_id)
+                    from worker.discovery import DiscoveryWorker
+                    dw = DiscoveryWorker(llm_usage)
+                    keywords = config.get("keywords", ["VTuber", "Cover", "Singer"])
+                    youtube_calls = _youtube_calls(quota)
+                    discovered = dw.discover(keywords)
+                    summary["discovery"] = dw.summary()
+
+                    if discovered:
+                        discovery_ids = collector.resolve_discovered_channels(discovered)
+                        summary["discovery_resolution"] = channel_index.summary()
+                        logger.info("Discovered %d new potential channels via web search.", len(discovery_ids))
+                    discovery_usage = llm_usage.summary().get("discovery", {})
+                    stage["calls"] = discovery_usage.get("calls", 0) + _youtube_calls(quota) - youtube_calls
+                    stage["errors"] = discovery_usage.get("failed", 0)
+                    checkpoints.save("discovery", {
+                        "discovery_ids": discovery_ids,
+                        "summary": _pick(summary, "discovery", "discovery_resolution"),
+                    })
+                stage["items"] = len(discovery_ids)
 
         # 2. Collection (Hybrid 60)
-        logger.info("Starting hybrid collection for run_id=%s", run_id)
-        collector = YouTubeCollector()
-        
-        tracked_pids = get_tracked_platform_ids()
-        # Merge discovered IDs into collection
-        all_ids_to_collect = list(set(tracked_pids) | set(discovery_ids))
-        
-        keywords = config.get("keywords", ["VTuber", "Cover", "Singer"])
-        
-        col_result = collector.collect_multiple_sources(run_id, keywords, all_ids_to_collect)
-        
-        summary["scanned"] = col_result.entity_count
-        if col_result.errors:
-            summary["errors"].extend(col_result.errors)
+        checkpoints.check_cancelled()
+        with timings.stage("tracked_set") as stage:
+            restored = checkpoints.get("tracked_set")
+            if restored is not None:
+                tracked_pids = restored["platform_ids"]
+            else:
+                tracked_pids = get_tracked_platform_ids()
+                stage["calls"] = 1
+                checkpoints.save("tracked_set", {"platform_ids": tracked_pids})
+            stage["items"] = len(tracked_pids)
+
+        checkpoints.check_cancelled()
+        with timings.stage("collection") as stage:
+            restored = checkpoints.get("collection")
+            if restored is not None:
+                scanned = restored["scanned"]
+                summary["errors"].extend(restored["errors"])
+                summary.update(restored["summary"])
+            else:
+                logger.info(
+                    "Starting hybrid collection for run_id=%s (collector=%s)", run_id, settings.collector_mode
+                )
+                if checkpoints.resuming:
+                    # Snapshots of the interrupted attempt would be collected twice.
+                    delete_run_snapshots(run_id)
+                # Merge discovered IDs into collection
+                all_ids_to_collect = list(set(tracked_pids) | set(discovery_ids))
+
+                keywords = config.get("keywords", ["VTuber", "Cover", "Singer"])
+
+                youtube_calls = _youtube_calls(quota)
+                col_result = collector.collect_multiple_sources(run_id, keywords, all_ids_to_collect)
+
+                scanned = col_result.entity_count
+                if col_result.errors:
+                    summary["errors"].extend(col_result.errors)
+                _record_quota(summary, quota)
+                if search_cache:
+                    summary["search_cache"] = search_cache.summary()
+                if etag_cache:
+                    summary["etag"] = etag_cache.summary()
+                if settings.video_stage_enabled:
+                    summary["videos"] = video_store.summary()
+                stage["calls"] = _youtube_calls(quota) - youtube_calls
+                stage["errors"] = len(col_result.errors)
+                checkpoints.save("collection", {
+                    "scanned": scanned,
+                    "errors": col_result.errors,
+                    "summary": _pick(summary, "search_cache", "etag", "videos"),
+                })
+            summary["scanned"] = scanned
+            stage["items"] = scanned
+        progress.count(collected=scanned)
 
         # 2. GPT Analysis
         logger.info("Starting analyzer for run_id=%s (mode=%s)", run_id, analysis_mode)
-        analyzer = Analyzer()
-        all_snapshots = get_snapshots_by_run(run_id)
-        
+        llm_cache = LlmCache.from_settings() if analysis_mode in ["smart", "full"] else None
+        analyzer = Analyzer(context, llm_cache, llm_usage, progress)
+
         # Filtering logic (Smart Mode / Aggregated Mode)
-        to_analyze = []
-        skipped_count = 0
-        
-        for snap in all_snapshots:
-            entity_id = snap["entity_id"]
-            last_score = get_last_score(entity_id)
-            
-            should_ana, reason = True, None
-            if analysis_mode in ["smart", "aggregated"]:
-                from worker.scorer import should_analyze
-                should_ana, reason = should_analyze(snap, last_score, settings)
-                
-            if should_ana:
-                to_analyze.append(snap)
-            else:
-                logger.info("Skipping analysis for entity_id=%s: %s", entity_id, reason)
-                skipped_count += 1
+        checkpoints.check_cancelled()
+        with timings.stage("filtering") as stage:
+            queries = context.queries
+            to_analyze, skipped_count = filter_snapshots(context, analysis_mode, settings)
+            stage["items"] = len(to_analyze)
+            stage["calls"] = context.queries - queries
+        progress.count(skipped=skipped_count)
 
-        logger.info("Analysis candidates: %d/%d (Skipped: %d)", len(to_analyze), len(all_snapshots), skipped_count)
+        logger.info(
+            "Analysis candidates: %d/%d (Skipped: %d)", len(to_analyze), len(context.snapshots()), skipped_count
+        )
 
-        if analysis_mode == "aggregated":
-            agg_result = analyzer.analyze_aggregated(run_id, to_analyze)
-            summary["aggregated_analysis"] = agg_result
-            # In aggregated mode, we might not have individual scores for everyone,
-            # but we can still extract trends from those analyzed or the list.
-        else:
-            ana_errors = analyzer.analyze_batch(run_id, to_analyze)
-            if ana_errors:
-                summary["errors"].extend(ana_errors)
+        checkpoints.check_cancelled()
+        with timings.stage("analysis") as stage:
+            restored = checkpoints.get("analysis")
+            if restored is not None:
+                summary["errors"].extend(restored["errors"])
+                summary.update(restored["summary"])
+            else:
+                ana_errors = []
+                if analysis_mode == "aggregated":
+                    agg_result = analyzer.analyze_aggregated(run_id, to_analyze)
+                    summary["aggregated_analysis"] = agg_result
+                    # In aggregated mode, we might not have individual scores for everyone,
+                    # but we can still extract trends from those analyzed or the list.
+                elif analysis_mode == "batch":
+                    # Offline Batch API scoring; resumes the run's batch if one was already submitted.
+                    from worker.batch_analyzer import BatchAnalyzer
+                    batch_analyzer = BatchAnalyzer(analyzer)
+                    ana_errors = batch_analyzer.run(run_id, to_analyze)
+                    summary["openai_batch"] = batch_analyzer.summary()
+                else:
+                    if checkpoints.resuming:
+                        to_analyze = _skip_scored(context, to_analyze, summary)
+                    ana_errors = analyzer.analyze_batch(run_id, to_analyze)
+                    context.reload_scores()
+                    summary["rate_limits"] = analyzer.rate_limits.summary()
+                    if llm_cache:
+                        summary["llm_cache"] = llm_cache.summary()
+                if ana_errors:
+                    summary["errors"].extend(ana_errors)
+                analysis_usage = llm_usage.summary()
+                stage["calls"] = sum(
+                    analysis_usage.get(name, {}).get("calls", 0) for name in ("analysis", "aggregation", "batch")
+                )
+                stage["errors"] = len(ana_errors)
+                checkpoints.save("analysis", {
+                    "errors": ana_errors,
+                    "summary": _pick(
+                        summary, "aggregated_analysis", "openai_batch", "rate_limits", "llm_cache", "resumed_scores"
+                    ),
+                })
+            stage["items"] = len(to_analyze)
+        progress.count(analyzed=len(to_analyze))
 
         # 3. Classification
-        logger.info("Starting scoring and classification for run_id=%s", run_id)
-        scores = get_scores_by_run(run_id)
-        if not scores and analysis_mode == "aggregated":
-            # For aggregated mode, classification might need a different approach or skip
-            classification_result = {"top": [], "hot": [], "watch": [], "normal": []}
-        else:
-            classification_result = classify_scores(scores)
-            
-            # Save classifications to DB
-            for category, items in classification_result.items():
-                for item in items:
-                    update_score_classification(item["score_id"], category)
+        checkpoints.check_cancelled()
+        with timings.stage("classification") as stage:
+            logger.info("Starting scoring and classification for run_id=%s", run_id)
+            queries = context.queries
+            scores = context.scores()
+            if not scores and analysis_mode == "aggregated":
+                # For aggregated mode, classification might need a different approach or skip
+                classification_result = {"top": [], "hot": [], "watch": [], "normal": []}
+            else:
+                classification_result = classify_scores(scores)
+
+                # Save classifications to DB
+                summary["classification"] = save_classifications(classification_result)
+                stage["calls"] += 1
+            stage["items"] = len(scores)
+            stage["calls"] += context.queries - queries
 
         # 4. Trend Extraction
-        logger.info("Starting trend extraction for run_id=%s", run_id)
-        trend_result = analyzer.extract_trends(run_id)
-        summary["trends"] = trend_result
+        checkpoints.check_cancelled()
+        with timings.stage("trends") as stage:
+            restored = checkpoints.get("trends")
+            if restored is not None:
+                trend_result = restored
+            else:
+                logger.info("Starting trend extraction for run_id=%s", run_id)
+                trend_result = analyzer.extract_trends(run_id)
+                stage["calls"] = llm_usage.summary().get("trends", {}).get("calls", 0)
+                stage["errors"] = len(trend_result.get("errors", []))
+                if not trend_result.get("errors"):
+                    checkpoints.save("trends", trend_result)
+            summary["trends"] = trend_result
+            stage["items"] = len(trend_result.get("keywords", []))
         summary["skipped_analysis"] = skipped_count
+        summary["context"] = context.summary()
+        summary["llm_usage"] = llm_usage.summary()
 
         # 5. Notification
-        if notify_discord:
-            logger.info("Preparing Discord notification for run_id=%s", run_id)
-            run_summary_for_notif = {
-                "timestamp_jst": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-                "run_type": config.get("run_type", "manual"),
-                "scanned": col_result.entity_count,
-                "hot_threshold": settings.hot_threshold,
-            }
-            
-            report = format_report(
-                run_summary_for_notif,
-                classification_result["top"],
-                classification_result["hot"],
-                classification_result["watch"],
-                trend_result
-            )
-            send_discord(settings.discord_webhook_url, report)
+        checkpoints.check_cancelled()
+        if notify_discord and checkpoints.get("notification") is None:
+            with timings.stage("notification") as stage:
+                logger.info("Preparing Discord notification for run_id=%s", run_id)
+                run_summary_for_notif = {
+                    "timestamp_jst": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+                    "run_type": config.get("run_type", "manual"),
+                    "scanned": scanned,
+                    "hot_threshold": settings.hot_threshold,
+                }
+
+                report = format_report(
+                    run_summary_for_notif,
+                    classification_result["top"],
+                    classification_result["hot"],
+                    classification_result["watch"],
+                    trend_result,
+                    pinned_ids=set(context.pinned_ids()),
+                )
+                send_discord(settings.discord_webhook_url, report)
+                stage["items"] = len(classification_result["top"]) + len(classification_result["hot"])
+                stage["calls"] = len(split_report(report)) if settings.discord_webhook_url else 0
+                checkpoints.save("notification", {"sent": True})
 
         # 6. Finalize
+        checkpoints.check_cancelled()
+        _refresh_tracked_set(summary, run_id)
         summary["end_time"] = datetime.now().isoformat()
-        update_run_status(run_id, "success", summary)
+        summary["timings"] = timings.summary()
+        summary["checkpoints"] = checkpoints.summary()
+        if not update_run_status(run_id, "success", summary, worker_id=worker_id):
+            raise RunCancelledError(f"run_id={run_id} was reclaimed before it finished")
+        progress.finish("success", summary)
+        RUNS.inc(status="success")
         logger.info("Scout run completed successfully for run_id=%s", run_id)
 
+    except RunCancelledError:
+        # Another worker owns the run now; its status and progress are not ours to write.
+        logger.warning("Stopped run_id=%s: it was reclaimed by another worker.", run_id)
+        _record_quota(summary, quota)
+        RUNS.inc(status="cancelled")
+
     except Exception as e:
         logger.exception("Scout run failed for run_id=%s", run_id)
         summary["end_time"] = datetime.now().isoformat()
         summary["fatal_error"] = str(e)
-        update_run_status(run_id, "failed", summary)
+        _record_quota(summary, quota)
+        summary["llm_usage"] = llm_usage.summary()
+        summary["timings"] = timings.summary()
+        summary["checkpoints"] = checkpoints.summary()
+        RUNS.inc(status="failed")
+        if update_run_status(run_id, "failed", summary, worker_id=worker_id):
+            progress.finish("failed", summary)
+        else:
+            logger.warning("Failed run_id=%s was reclaimed; status not written.", run_id)
@@ -0,0 +1,59 @@
+"""Local token estimates and token-budget packing of per-entity prompt lines."""
+
+from __future__ import annotations
+
+import math
+import re
+
+# CJK ideographs, kana, hangul and full-width forms tokenize at roughly one
+# token per character; everything else at roughly four characters per token.
+_WIDE_CHARS = re.compile("[\u3000-\u30ff\u3400-\u4dbf\u4e00-\u9fff\uac00-\ud7af\uf900-\ufaff\uff00-\uffef]")
+# Chat formatting overhead per message, plus priming of the reply.
+MESSAGE_OVERHEAD_TOKENS = 4
+REPLY_OVERHEAD_TOKENS = 3
+
+
+def estimate_tokens(text: str) -> int:
+    """Estimate the token count of a text without calling a tokenizer."""
+
+    if not text:
+        return 0
+    wide = len(_WIDE_CHARS.findall(text))
+    return wide + math.ceil((len(text) - wide) / 4)
+
+
+def estimate_message_tokens(*contents: str) -> int:
+    """Estimate the prompt tokens of a chat request made of these messages."""
+
+    return REPLY_OVERHEAD_TOKENS + sum(estimate_tokens(c) + MESSAGE_OVERHEAD_TOKENS for c in contents)
+
+
+def pack_lines(
+    lines: list[str], budget: int, base_tokens: int = 0, min_lines: int = 1
+) -> tuple[list[str], list[str]]:
+    """Fill one request with lines up to ``budget`` input tokens.
+
+    ``base_tokens`` is the fixed cost of the request (system prompt, header).
+    At least ``min_lines`` lines are always packed so callers make progress
+    even when single lines exceed the budget. Returns (packed, overflow).
+    """
+    used = base_tokens
+    packed: list[str] = []
+    for line in lines:
+        cost = estimate_tokens(line) + 1  # joining newline
+        if len(packed) >= min_lines and used + cost > budget:
+            break
+        packed.append(line)
+        used += cost
+    return packed, lines[len(packed):]
+
+
+def pack_all(lines: list[str], budget: int, base_tokens: int = 0, min_lines: int = 1) -> list[list[str]]:
+    """Split lines into as few budget-sized requests as possible, in order."""
+
+    requests: list[list[str]] = []
+    remaining = lines
+    while remaining:
+        packed, remaining = pack_lines(remaining, budget, base_tokens, min_lines)
+        requests.append(packed)
+    return requests
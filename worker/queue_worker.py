@@ -0,0 +1,159 @@
+"""Queue worker: claims queued scout runs and executes them.
+
+Run one or more processes next to the API::
+
+    python -m worker.queue_worker --processes 4
+
+Process ``i`` serves its pipeline metrics on ``QUEUE_METRICS_PORT + i``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import multiprocessing
+import os
+import socket
+import threading
+import time
+from typing import Any
+
+from config import get_settings
+from db.queries import claim_run, heartbeat_run
+from worker.metrics import start_http_server
+from worker.orchestrator import run_scout
+
+logger = logging.getLogger(__name__)
+
+
+class Heartbeat:
+    """Background thread refreshing a claimed run's heartbeat until stopped.
+
+    ``lost`` is set once the run is held by another worker; ``run_scout``
+    takes it as its cancel event.
+    """
+
+    def __init__(self, run_id: str, worker_id: str, interval: float) -> None:
+        self.run_id = run_id
+        self.worker_id = worker_id
+        self.interval = interval
+        self.lost = threading.Event()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._loop, name=f"heartbeat-{run_id}", daemon=True)
+
+    def _loop(self) -> None:
+        while not self._stop.wait(self.interval):
+            try:
+                if not heartbeat_run(self.run_id, self.worker_id):
+                    self.lost.set()
+                    logger.warning("Run %s was reclaimed by another worker.", self.run_id)
+                    return
+            except Exception:
+                logger.warning("Heartbeat failed for run_id=%s; retrying.", self.run_id)
+
+    def __enter__(self) -> Heartbeat:
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self._stop.set()
+        self._thread.join()
+
+
+class QueueWorker:
+    """Claims runs from ``scout_runs`` one at a time and executes ``run_scout``.
+
+    Claims go through ``claim_scout_run`` (``FOR UPDATE SKIP LOCKED``), so any
+    number of workers can poll the same table. While a run executes, a
+    heartbeat is sent every ``QUEUE_HEARTBEAT_SECONDS``; a run whose heartbeat
+    is older than ``QUEUE_STALE_SECONDS`` is claimed again by the next worker,
+    and the worker that lost it stops the run at its next stage boundary.
+    """
+
+    def __init__(self, worker_id: str | None = None) -> None:
+        settings = get_settings()
+        self.worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}"
+        self.poll_interval = settings.queue_poll_interval_seconds
+        self.heartbeat_interval = settings.queue_heartbeat_seconds
+        self.stale_seconds = settings.queue_stale_seconds
+        self.max_attempts = settings.queue_max_attempts
+        self._stop = threading.Event()
+
+    def run_once(self) -> bool:
+        """Claim and execute one run; return False when the queue is empty."""
+        run = claim_run(self.worker_id, self.stale_seconds, self.max_attempts)
+        if run is None:
+            return False
+
+        run_id = str(run["id"])
+        logger.info(
+            "Worker %s claimed run_id=%s (attempt %s)", self.worker_id, run_id, run.get("attempts", 1)
+        )
+        with Heartbeat(run_id, self.worker_id, self.heartbeat_interval) as heartbeat:
+            run_scout(
+                run_id=run_id,
+                config=run.get("config") or {},
+                notify_discord=run.get("notify_discord", True),
+                analysis_mode=run.get("analysis_mode") or "aggregated",
+                worker_id=self.worker_id,
+                cancel=heartbeat.lost,
+            )
+        return True
+
+    def serve(self) -> None:
+        """Poll the queue until ``stop`` is called."""
+        logger.info("Queue worker %s started.", self.worker_id)
+        while not self._stop.is_set():
+            try:
+                if self.run_once():
+                    continue
+            except Exception:
+                logger.exception("Queue worker %s failed to process a run.", self.worker_id)
+            self._stop.wait(self.poll_interval)
+
+    def stop(self) -> None:
+        self._stop.set()
+
+
+def _serve_process(index: int = 0) -> None:
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+    )
+    settings = get_settings()
+    if settings.queue_metrics_port:
+        port = settings.queue_metrics_port + index
+        start_http_server(port, settings.scout_api_key)
+        logger.info("Serving metrics on :%d/metrics", port)
+    worker = QueueWorker()
+    try:
+        worker.serve()
+    except KeyboardInterrupt:
+        worker.stop()
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Execute queued SignalForge scout runs.")
+    parser.add_argument("--processes", type=int, default=1, help="Worker processes to start.")
+    args = parser.parse_args(argv)
+
+    if args.processes <= 1:
+        _serve_process()
+        return
+
+    processes = [
+        multiprocessing.Process(target=_serve_process, args=(i,), name=f"queue-worker-{i}")
+        for i in range(args.processes)
+    ]
+    for process in processes:
+        process.start()
+    try:
+        for process in processes:
+            process.join()
+    except KeyboardInterrupt:
+        for process in processes:
+            process.join()
+
+
+if __name__ == "__main__":
+    main()
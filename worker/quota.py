@@ -0,0 +1,179 @@
+"""YouTube Data API quota accounting for SCOUT SYSTEM."""
+
+from __future__ import annotations
+
+import logging
+import threading
+from collections import Counter
+from datetime import datetime
+from typing import Any
+from zoneinfo import ZoneInfo
+
+from config import get_settings
+from db.queries import add_quota_usage, reserve_quota_usage
+
+logger = logging.getLogger(__name__)
+
+# Unit cost per call, from the Data API v3 quota calculator.
+ENDPOINT_COSTS = {
+    "search.list": 100,
+    "channels.list": 1,
+    "videos.list": 1,
+    "activities.list": 1,
+    "playlistItems.list": 1,
+}
+
+# Tracked-ID refreshes may spend the whole budget; exploratory calls (keyword
+# searches, discovery resolution) must leave the tracked reserve untouched.
+PRIORITY_TRACKED = "tracked"
+PRIORITY_EXPLORE = "explore"
+
+# The daily quota resets at midnight Pacific time.
+QUOTA_TIMEZONE = ZoneInfo("America/Los_Angeles")
+
+# Units reserved from the shared daily total at a time, per priority.
+RESERVE_BLOCK_UNITS = 100
+
+
+class QuotaExceededError(RuntimeError):
+    """Raised when a call would push daily usage past the allowed budget."""
+
+
+def quota_day(now: datetime | None = None) -> str:
+    """Return the quota day (Pacific time) as an ISO date string."""
+
+    now = now or datetime.now(QUOTA_TIMEZONE)
+    return now.astimezone(QUOTA_TIMEZONE).date().isoformat()
+
+
+class QuotaLedger:
+    """Per-run ledger that charges Data API calls against the daily budget.
+
+    Units are reserved in ``scout_quota_usage`` through ``reserve_quota_usage``,
+    which only adds them while the day's total stays within the limit, so
+    concurrent queue workers cannot overspend the budget together. To keep a
+    database round trip off most calls, units are reserved in blocks of
+    ``RESERVE_BLOCK_UNITS`` per priority and ``flush()`` gives back the unused
+    rest. One ledger is shared by every collector of a run so ``summary()``
+    reflects the run's usage.
+    """
+
+    def __init__(self, daily_budget: int, tracked_reserve: int = 0, persist: bool = True) -> None:
+        self.daily_budget = daily_budget
+        self.tracked_reserve = tracked_reserve
+        self.persist = persist
+
+        self.units_by_endpoint: Counter[str] = Counter()
+        self.calls_by_endpoint: Counter[str] = Counter()
+        self.deferred_by_endpoint: Counter[str] = Counter()
+
+        self._lock = threading.Lock()
+        self._usage_date: str | None = None
+        # Day total as last returned by the database (or counted locally).
+        self._daily_units = 0
+        # Reserved but not yet charged units, per priority.
+        self._allowance: Counter[str] = Counter()
+
+    @classmethod
+    def from_settings(cls) -> QuotaLedger:
+        """Build a persistent ledger from YOUTUBE_DAILY_QUOTA settings."""
+
+        settings = get_settings()
+        return cls(
+            daily_budget=settings.youtube_daily_quota,
+            tracked_reserve=settings.youtube_quota_tracked_reserve,
+        )
+
+    @property
+    def run_units(self) -> int:
+        """Units charged through this ledger."""
+
+        return sum(self.units_by_endpoint.values())
+
+    @property
+    def daily_units(self) -> int:
+        """Units reserved today by every worker, including unused blocks."""
+
+        return self._daily_units
+
+    def _ensure_day(self) -> None:
+        today = quota_day()
+        if self._usage_date == today:
+            return
+
+        if self._usage_date is not None:
+            # Day rolled over mid-run: give back the previous day's blocks first.
+            self._flush_locked()
+
+        self._usage_date = today
+        self._daily_units = 0
+
+    def _reserve(self, pool: str, cost: int, limit: int) -> bool:
+        if not self.persist:
+            if self._daily_units + cost > limit:
+                return False
+            self._daily_units += cost
+            self._allowance[pool] += cost
+            return True
+
+        # A full block first; near the limit, only what this call needs.
+        for units in dict.fromkeys((max(cost, RESERVE_BLOCK_UNITS), cost)):
+            total = reserve_quota_usage(self._usage_date, units, limit)
+            if total is not None:
+                self._daily_units = total
+                self._allowance[pool] += units
+                return True
+        return False
+
+    def charge(self, endpoint: str, priority: str = PRIORITY_EXPLORE) -> int:
+        """Record a call, or raise QuotaExceededError if it would exceed the budget."""
+
+        cost = ENDPOINT_COSTS[endpoint]
+        limit = self.daily_budget
+        pool = PRIORITY_TRACKED if priority == PRIORITY_TRACKED else PRIORITY_EXPLORE
+        if pool != PRIORITY_TRACKED:
+            limit -= self.tracked_reserve
+
+        with self._lock:
+            self._ensure_day()
+            if self._allowance[pool] < cost and not self._reserve(pool, cost, limit):
+                self.deferred_by_endpoint[endpoint] += 1
+                raise QuotaExceededError(
+                    f"{endpoint} ({cost} units, priority={priority}) would exceed "
+                    f"quota limit {limit} (used {self._daily_units})"
+                )
+            self._allowance[pool] -= cost
+            self.units_by_endpoint[endpoint] += cost
+            self.calls_by_endpoint[endpoint] += 1
+
+        return cost
+
+    def _flush_locked(self) -> None:
+        unused = sum(self._allowance.values())
+        self._allowance.clear()
+        if not unused or self._usage_date is None:
+            return
+
+        if self.persist:
+            self._daily_units = add_quota_usage(self._usage_date, -unused)
+        else:
+            self._daily_units -= unused
+
+    def flush(self) -> None:
+        """Give reserved but unused units back to the daily budget."""
+
+        with self._lock:
+            self._flush_locked()
+
+    def summary(self) -> dict[str, Any]:
+        """Return per-run usage for scout_runs.summary."""
+
+        return {
+            "units_used": self.run_units,
+            "units_by_endpoint": dict(self.units_by_endpoint),
+            "calls_by_endpoint": dict(self.calls_by_endpoint),
+            "deferred_by_endpoint": dict(self.deferred_by_endpoint),
+            "daily_units_used": self.daily_units,
+            "daily_budget": self.daily_budget,
+            "usage_date": self._usage_date,
+        }
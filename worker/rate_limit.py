@@ -0,0 +1,91 @@
+"""Shared backoff for OpenAI 429 responses, driven by the rate-limit headers."""
+
+from __future__ import annotations
+
+import random
+import re
+import threading
+import time
+from typing import Mapping
+
+MAX_RATE_LIMIT_RETRIES = 5
+# 5xx responses, connection errors and timeouts (the SDK's own default).
+MAX_TRANSIENT_RETRIES = 2
+MAX_BACKOFF_SECONDS = 60.0
+
+_DURATION_PART = re.compile(r"(\d+(?:\.\d+)?)(ms|h|m|s)")
+_UNIT_SECONDS = {"ms": 0.001, "s": 1.0, "m": 60.0, "h": 3600.0}
+
+
+def parse_reset_seconds(value: str | None) -> float | None:
+    """Parse an ``x-ratelimit-reset-*`` value such as '20ms', '1.5s' or '6m0s'."""
+
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        return float(value)
+    except ValueError:
+        pass
+    parts = _DURATION_PART.findall(value)
+    if not parts:
+        return None
+    return sum(float(amount) * _UNIT_SECONDS[unit] for amount, unit in parts)
+
+
+def retry_delay(headers: Mapping[str, str], attempt: int) -> float:
+    """Seconds to wait before retrying a 429 (or a transient error).
+
+    Preference: ``retry-after-ms`` / ``retry-after``, then the reset time of
+    whichever request/token limit is exhausted, then exponential backoff with
+    jitter. The result is capped at ``MAX_BACKOFF_SECONDS``.
+    """
+    delay = None
+    if headers.get("retry-after-ms"):
+        delay = parse_reset_seconds(headers["retry-after-ms"])
+        delay = delay / 1000 if delay is not None else None
+    if delay is None:
+        delay = parse_reset_seconds(headers.get("retry-after"))
+
+    if delay is None:
+        resets = [
+            parse_reset_seconds(headers.get(f"x-ratelimit-reset-{kind}"))
+            for kind in ("requests", "tokens")
+            if headers.get(f"x-ratelimit-remaining-{kind}") == "0"
+        ]
+        resets = [r for r in resets if r is not None]
+        if resets:
+            delay = max(resets)
+
+    if delay is None:
+        delay = 2 ** attempt + random.uniform(0, 1)
+    return min(max(delay, 0.0), MAX_BACKOFF_SECONDS)
+
+
+class RateLimitGate:
+    """Pauses every worker sharing the gate until a 429 backoff has elapsed.
+
+    One worker hitting the limit means the others would too, so the pause is
+    global rather than per request.
+    """
+
+    def __init__(self) -> None:
+        self.rate_limited = 0
+        self.backoff_seconds = 0.0
+        self._resume_at = 0.0
+        self._lock = threading.Lock()
+
+    def wait(self) -> None:
+        with self._lock:
+            delay = self._resume_at - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+
+    def pause(self, seconds: float) -> None:
+        with self._lock:
+            self.rate_limited += 1
+            self.backoff_seconds += seconds
+            self._resume_at = max(self._resume_at, time.monotonic() + seconds)
+
+    def summary(self) -> dict[str, float]:
+        return {"rate_limited": self.rate_limited, "backoff_seconds": round(self.backoff_seconds, 2)}
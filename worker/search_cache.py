@@ -0,0 +1,100 @@
+"""Persistent TTL cache for YouTube keyword search results."""
+
+from __future__ import annotations
+
+import logging
+import threading
+from datetime import datetime, timedelta, timezone
+from typing import Any, Iterable
+
+from config import get_settings
+from db.queries import get_search_cache, upsert_search_cache
+
+logger = logging.getLogger(__name__)
+
+
+def normalize_query(query: str) -> str:
+    """Normalize a search query into its cache key."""
+
+    return " ".join(query.split()).lower()
+
+
+class SearchCache:
+    """Keyword -> channel ID cache backed by ``scout_search_cache``.
+
+    Entries older than ``ttl`` are treated as misses. Keywords listed in
+    ``refresh_keywords`` always bypass the cache for this run (and re-populate it).
+    Cache read/write failures are logged and treated as misses so that a cache
+    outage only costs quota, never a run.
+    """
+
+    def __init__(self, ttl: timedelta, refresh_keywords: Iterable[str] = ()) -> None:
+        self.ttl = ttl
+        self.refresh_keywords = {normalize_query(k) for k in refresh_keywords}
+        self.hits = 0
+        self.misses = 0
+        self.refreshed = 0
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_settings(cls, refresh_keywords: Iterable[str] = ()) -> SearchCache | None:
+        """Build a cache from SEARCH_CACHE_* settings, or None when disabled."""
+
+        settings = get_settings()
+        if not settings.search_cache_enabled:
+            return None
+        return cls(timedelta(hours=settings.search_cache_ttl_hours), refresh_keywords)
+
+    def _count(self, field: str) -> None:
+        with self._lock:
+            setattr(self, field, getattr(self, field) + 1)
+
+    def get(self, query: str, max_results: int, force_refresh: bool = False) -> list[str] | None:
+        """Return cached channel IDs, or None on a miss/expired/forced refresh."""
+
+        key = normalize_query(query)
+        if force_refresh or key in self.refresh_keywords:
+            self._count("refreshed")
+            return None
+
+        try:
+            row = get_search_cache(key, max_results)
+        except Exception:
+            logger.warning("Search cache read failed for query '%s'.", query)
+            row = None
+
+        if row is None:
+            self._count("misses")
+            return None
+
+        fetched_at = datetime.fromisoformat(str(row["fetched_at"]).replace("Z", "+00:00"))
+        if datetime.now(timezone.utc) - fetched_at > self.ttl:
+            self._count("misses")
+            return None
+
+        self._count("hits")
+        return [str(channel_id) for channel_id in row.get("channel_ids") or []]
+
+    def put(self, query: str, max_results: int, channel_ids: list[str]) -> None:
+        """Store fresh search results."""
+
+        try:
+            upsert_search_cache(
+                normalize_query(query),
+                max_results,
+                channel_ids,
+                datetime.now(timezone.utc).isoformat(),
+            )
+        except Exception:
+            logger.warning("Search cache write failed for query '%s'.", query)
+
+    def summary(self) -> dict[str, Any]:
+        """Return hit/miss counters for scout_runs.summary."""
+
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "refreshed": self.refreshed,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+        }
@@ -0,0 +1,52 @@
+"""Per-stage wall time, item, external call and error counts of a run."""
+
+from __future__ import annotations
+
+import time
+from contextlib import contextmanager
+from typing import Any, Iterator
+
+from worker.events import RunProgress
+from worker.metrics import STAGE_CALLS, STAGE_ERRORS, STAGE_ITEMS, STAGE_SECONDS
+
+
+class StageTimings:
+    """Times the stages of one ``run_scout`` call.
+
+    ``stage`` yields a dict the caller fills with ``items``, ``calls`` and
+    ``errors``; an exception escaping the block counts as one more error and
+    is re-raised. Finished stages feed the process-wide ``worker.metrics`` and,
+    when given, are published as stage transitions on ``progress``.
+    """
+
+    def __init__(self, progress: RunProgress | None = None) -> None:
+        self.stages: dict[str, dict[str, Any]] = {}
+        self.progress = progress
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[dict[str, Any]]:
+        stats = {"items": 0, "calls": 0, "errors": 0}
+        if self.progress:
+            self.progress.stage(name, "started")
+        started = time.perf_counter()
+        status = "completed"
+        try:
+            yield stats
+        except Exception:
+            stats["errors"] += 1
+            status = "failed"
+            raise
+        finally:
+            seconds = time.perf_counter() - started
+            self.stages[name] = {"seconds": round(seconds, 3), **stats}
+            if self.progress:
+                self.progress.stage(name, status, self.stages[name])
+            STAGE_SECONDS.observe(seconds, stage=name)
+            STAGE_ITEMS.inc(stats["items"], stage=name)
+            STAGE_CALLS.inc(stats["calls"], stage=name)
+            STAGE_ERRORS.inc(stats["errors"], stage=name)
+
+    def summary(self) -> dict[str, dict[str, Any]]:
+        """Return the ``timings`` block for scout_runs.summary."""
+
+        return {name: dict(stats) for name, stats in self.stages.items()}
@@ -0,0 +1,132 @@
+"""Incremental per-channel video store backed by ``scout_videos``."""
+
+from __future__ import annotations
+
+import logging
+import threading
+from collections import Counter
+from datetime import datetime
+from typing import Any
+
+from db.queries import get_recent_entity_videos, upsert_videos_bulk
+from models.schemas import YouTubeVideo
+
+logger = logging.getLogger(__name__)
+
+
+def _parse_timestamp(value: Any) -> datetime | None:
+    if not value:
+        return None
+    if isinstance(value, datetime):
+        return value
+    return datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+
+
+def new_upload_ids(items: list[dict[str, Any]], mark: datetime | None) -> tuple[list[str], bool]:
+    """Return (video IDs newer than ``mark``, whether the mark was reached).
+
+    Uploads playlists are ordered newest first, so the first item published at or
+    before the mark ends the scan: everything after it is already stored.
+    """
+    ids = []
+    for item in items:
+        details = item.get("contentDetails", {})
+        published_at = _parse_timestamp(details.get("videoPublishedAt"))
+        if mark and published_at and published_at <= mark:
+            return ids, True
+        ids.append(details["videoId"])
+    return ids, False
+
+
+class VideoStore:
+    """Run-scoped view of ``scout_videos`` for the video stage.
+
+    ``load`` fetches the latest stored videos of every candidate entity in one
+    RPC; the newest ``published_at`` per entity is its high-water mark. Only
+    uploads newer than the mark are fetched from the API, merged with the stored
+    window by ``merge`` and written back in bulk by ``flush``.
+    """
+
+    def __init__(self, limit: int) -> None:
+        self.limit = limit
+        self.stats: Counter[str] = Counter()
+        self._stored: dict[str, list[YouTubeVideo]] = {}
+        self._pending: dict[str, dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    def load(self, entity_ids: list[str]) -> None:
+        try:
+            rows_by_entity = get_recent_entity_videos(entity_ids, self.limit)
+        except Exception:
+            logger.warning("Video store lookup failed; fetching full windows for %d channels.", len(entity_ids))
+            return
+
+        for entity_id, rows in rows_by_entity.items():
+            self._stored[entity_id] = [
+                YouTubeVideo(
+                    video_id=row["video_id"],
+                    published_at=_parse_timestamp(row["published_at"]),
+                    video_type=row.get("video_type") or "normal",
+                    title=row.get("title"),
+                    duration=row.get("duration"),
+                )
+                for row in rows
+            ]
+
+    def high_water_mark(self, entity_id: str) -> datetime | None:
+        """Newest stored published_at for the entity, or None if nothing is stored."""
+
+        stored = self._stored.get(entity_id)
+        return max(v.published_at for v in stored) if stored else None
+
+    def merge(self, entity_id: str, new_videos: list[YouTubeVideo]) -> list[YouTubeVideo]:
+        """Combine fresh uploads with the stored window and queue them for writing."""
+
+        stored = self._stored.get(entity_id, [])
+        merged = {v.video_id: v for v in stored}
+        merged.update((v.video_id, v) for v in new_videos)
+
+        with self._lock:
+            self.stats["channels_checked"] += 1
+            if stored and not new_videos:
+                self.stats["channels_unchanged"] += 1
+            self.stats["new_videos"] += len(new_videos)
+            self.stats["stored_videos_reused"] += len(merged) - len(new_videos)
+            for video in new_videos:
+                self._pending[video.video_id] = {
+                    "video_id": video.video_id,
+                    "entity_id": entity_id,
+                    "published_at": video.published_at.isoformat(),
+                    "video_type": video.video_type,
+                    "title": video.title,
+                    "duration": video.duration,
+                }
+
+        return sorted(merged.values(), key=lambda v: v.published_at, reverse=True)[:self.limit]
+
+    def count(self, stat: str, value: int = 1) -> None:
+        with self._lock:
+            self.stats[stat] += value
+
+    def flush(self) -> None:
+        with self._lock:
+            rows = list(self._pending.values())
+            self._pending.clear()
+        try:
+            upsert_videos_bulk(rows)
+        except Exception:
+            logger.warning("Failed to store %d videos.", len(rows))
+
+    def summary(self) -> dict[str, int]:
+        """Return incremental-fetch counters for scout_runs.summary."""
+
+        return {
+            key: self.stats[key]
+            for key in (
+                "channels_checked",
+                "channels_unchanged",
+                "new_videos",
+                "stored_videos_reused",
+                "playlist_pages",
+            )
+        }